@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Arquivo local de vagas e busca offline.
+#
+# Toda vaga recebida da API (painel, vagas.py, busca em vários países, lote e monitor) é
+# acrescentada a um SQLite local; a busca offline responde sobre ele em milissegundos, sem gastar
+# a cota da API. Antes, o resultado de uma busca sumia ao trocar de modo no painel e a única
+# cópia eram os relatórios .txt copiados à mão (que podem ser importados com --importar).
+#
+# O arquivo só cresce: cada vaga (identificada pelo id ou, sem ele, pelo link) é gravada na primeira
+# vez em que aparece; depois só muda quando foi vista pela última vez e, se tinha só a prévia do
+# painel (projecao.py), a descrição completa. O texto (título, descrição e habilidades) fica num
+# índice FTS5 que não diferencia acentos ('analise' encontra 'Análise'); país, localidade, data de
+# publicação, plataforma e remoto têm índices próprios. O resto da vaga fica em JSON comprimido.
+# As gravações são feitas por uma única thread em segundo plano, fora do caminho da busca.
+#
+# Uso: python arquivo_vagas.py "analista de dados" --pais portugal --remoto Remoto --horas 72
+#      python arquivo_vagas.py --importar "Vagas encontradas.txt" Freelance.txt
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import cache_buscas
+import metricas
+
+ATIVO = os.environ.get("VAGAS_ARQUIVO", "1") != "0" # VAGAS_ARQUIVO=0 desliga a gravação (a busca offline continua)
+LIMITE_PADRAO = 500                # Vagas devolvidas por busca offline
+PESOS_BM25 = (10.0, 1.0, 4.0)      # Título, descrição e habilidades: o termo no título vale mais
+TODOS = ("todos", "all", "*")      # Mesmos valores de busca_paises.TODOS: sem filtro de país
+
+_RE_PALAVRA = re.compile(r"\w+", re.UNICODE)
+
+
+# --- Vaga -> linha da tabela ---
+def chave_da_vaga(job: dict) -> str:
+    """
+    Identidade da vaga no arquivo: o id da API, o link normalizado ou, sem os dois, um hash do
+    título, empresa, localidade e data.
+    """
+    if job.get("id"):
+        return f"id:{job['id']}"
+    url = job.get("job_url")
+    if isinstance(url, str) and url.strip():
+        return f"url:{url.strip().rstrip('/').lower()}"
+    base = "|".join(str(job.get(campo) or "") for campo in ("title", "company", "location", "date_posted"))
+    return "hash:" + hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _texto(valor) -> Optional[str]:
+    if valor is None:
+        return None
+    if isinstance(valor, (list, tuple)): # Habilidades podem vir como lista
+        return ", ".join(str(item) for item in valor)
+    return str(valor)
+
+
+def _linha(job: dict, pais: Optional[str], agora: float) -> tuple:
+    dados = {campo: valor for campo, valor in job.items() if campo != "description"} # A descrição fica na coluna do FTS
+    data = job.get("date_posted")
+    return (
+        chave_da_vaga(job),
+        " ".join(pais.split()).lower() if pais else None,
+        job.get("location"),
+        str(data)[:10] if data else None,
+        job.get("site"),
+        int(bool(job.get("is_remote")) or job.get("work_from_home_type") == "Remoto"), # Mesma regra de transformacao.vaga_remota
+        _texto(job.get("title")),
+        _texto(job.get("description")),
+        _texto(job.get("skills")),
+        int(bool(job.get("description_truncated"))),
+        zlib.compress(json.dumps(dados, ensure_ascii=False, default=str).encode("utf-8")),
+        agora,
+        agora,
+    )
+
+
+# --- Consulta ---
+def consulta_fts(termo: str) -> Optional[str]:
+    """
+    Converte o texto digitado numa consulta FTS5: todas as palavras, cada uma também como prefixo
+    ('analist' encontra 'analista'). Aspas e operadores do usuário não são interpretados.
+    """
+    palavras = _RE_PALAVRA.findall(termo or "")
+    return " ".join(f'"{palavra}"*' for palavra in palavras) or None
+
+
+def resolver_paises(pais: Union[None, str, Iterable[str]]) -> List[str]:
+    """
+    'portugal, spain' ou uma lista de nomes -> nomes em minúsculas; vazio ou 'todos' -> [] (sem filtro).
+    """
+    if not pais:
+        return []
+    nomes = [" ".join(str(nome).split()).lower() for nome in (pais.split(",") if isinstance(pais, str) else pais)]
+    if any(nome in TODOS for nome in nomes):
+        return []
+    return list(dict.fromkeys(nome for nome in nomes if nome))
+
+
+def _filtro_remoto(remoto) -> Optional[int]:
+    # Aceita o valor do /search_jobs ('Remoto', 'Presencial', 'Ambos') ou um booleano
+    if isinstance(remoto, bool):
+        return int(remoto)
+    if isinstance(remoto, str) and remoto.strip().lower() in ("remoto", "presencial"):
+        return int(remoto.strip().lower() == "remoto")
+    return None
+
+
+class ArquivoVagas:
+    """
+    Arquivo de vagas num SQLite local, com busca de texto (FTS5) e filtros indexados.
+    Seguro para várias threads e processos: cada operação abre a própria conexão.
+    """
+
+    def __init__(self, caminho: Optional[str] = None):
+        if caminho is None:
+            os.makedirs(cache_buscas.DIRETORIO_CACHE, exist_ok=True)
+            caminho = os.path.join(cache_buscas.DIRETORIO_CACHE, "arquivo_vagas.sqlite3")
+        self.caminho = caminho
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS vagas (
+                    id INTEGER PRIMARY KEY,
+                    chave TEXT NOT NULL UNIQUE,
+                    country TEXT,
+                    location TEXT COLLATE NOCASE,
+                    date_posted TEXT,
+                    site TEXT,
+                    is_remote INTEGER NOT NULL,
+                    title TEXT,
+                    description TEXT,
+                    skills TEXT,
+                    description_truncated INTEGER NOT NULL,
+                    dados BLOB NOT NULL,
+                    primeira_vez REAL NOT NULL,
+                    ultima_vez REAL NOT NULL
+                )
+            """)
+            for coluna in ("country", "location", "date_posted", "site", "is_remote"):
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS idx_vagas_{coluna} ON vagas ({coluna})")
+            # Índice de texto sem cópia do conteúdo (lido da tabela vagas), mantido pelos gatilhos
+            conexao.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS vagas_texto USING fts5(
+                    title, description, skills, content='vagas', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            conexao.execute("""
+                CREATE TRIGGER IF NOT EXISTS vagas_texto_inserir AFTER INSERT ON vagas BEGIN
+                    INSERT INTO vagas_texto (rowid, title, description, skills) VALUES (new.id, new.title, new.description, new.skills);
+                END
+            """)
+            conexao.execute("""
+                CREATE TRIGGER IF NOT EXISTS vagas_texto_atualizar AFTER UPDATE OF title, description, skills ON vagas BEGIN
+                    INSERT INTO vagas_texto (vagas_texto, rowid, title, description, skills) VALUES ('delete', old.id, old.title, old.description, old.skills);
+                    INSERT INTO vagas_texto (rowid, title, description, skills) VALUES (new.id, new.title, new.description, new.skills);
+                END
+            """)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        try:
+            with conexao: # Confirma a transação (ou desfaz em caso de erro)
+                yield conexao
+        finally:
+            conexao.close()
+
+    def arquivar(self, jobs: Iterable[dict], pais: Optional[str] = None) -> int:
+        """
+        Acrescenta as vagas de uma busca (`pais` é o país buscado). Vagas já arquivadas só têm
+        `ultima_vez` atualizada e, se antes só havia a prévia, a descrição completa.
+        Retorna quantas vagas novas entraram no arquivo.
+        """
+        agora = time.time()
+        linhas = [_linha(job, pais, agora) for job in jobs]
+        if not linhas:
+            return 0
+        with self._conectar() as conexao:
+            novas = conexao.executemany(
+                "INSERT INTO vagas (chave, country, location, date_posted, site, is_remote, title, description, skills, "
+                "description_truncated, dados, primeira_vez, ultima_vez) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(chave) DO NOTHING",
+                linhas
+            ).rowcount # Só as inseridas (sem contar as linhas do índice, gravadas pelo gatilho)
+            conexao.executemany("UPDATE vagas SET ultima_vez = ? WHERE chave = ?", [(agora, linha[0]) for linha in linhas])
+            conexao.executemany(
+                "UPDATE vagas SET description = ?, description_truncated = 0, dados = ? WHERE chave = ? AND description_truncated = 1",
+                [(linha[7], linha[10], linha[0]) for linha in linhas if not linha[9] and linha[7] is not None]
+            )
+        return novas
+
+    def completar_descricao(self, job: dict, descricao: str):
+        """
+        Troca a prévia pela descrição completa (ex: depois do "Ver Mais..." do painel).
+        """
+        with self._conectar() as conexao:
+            conexao.execute("UPDATE vagas SET description = ?, description_truncated = 0 WHERE chave = ? AND description_truncated = 1",
+                            (descricao, chave_da_vaga(job)))
+
+    def pesquisar(self, termo: Optional[str] = None, pais=None, localidade: Optional[str] = None, remoto=None,
+                  horas: Optional[int] = None, plataforma: Optional[str] = None, limite: int = LIMITE_PADRAO) -> List[Tuple[Optional[str], dict]]:
+        """
+        Busca offline com os mesmos critérios do /search_jobs: `termo` no título, descrição ou
+        habilidades; `pais` ('portugal, spain', lista ou 'todos'); `localidade` pelo começo
+        ('lisboa' encontra 'Lisboa, Portugal'); `remoto` ('Remoto', 'Presencial', 'Ambos' ou bool);
+        `horas` (publicadas nas últimas N horas, 0 = hoje) e `plataforma` (site).
+        Devolve pares (país da busca que trouxe a vaga, vaga), das mais relevantes para o termo
+        (ou das mais recentes, sem termo) até `limite`.
+        """
+        condicoes, parametros = [], []
+        consulta = consulta_fts(termo)
+        if consulta:
+            condicoes.append("vagas_texto MATCH ?")
+            parametros.append(consulta)
+        paises = resolver_paises(pais)
+        if paises:
+            condicoes.append(f"v.country IN ({', '.join('?' * len(paises))})")
+            parametros.extend(paises)
+        if localidade and localidade.strip():
+            prefixo = re.sub(r"([\\%_])", r"\\\1", " ".join(localidade.split()))
+            condicoes.append("v.location LIKE ? ESCAPE '\\'")
+            parametros.append(prefixo + "%")
+        if _filtro_remoto(remoto) is not None:
+            condicoes.append("v.is_remote = ?")
+            parametros.append(_filtro_remoto(remoto))
+        if horas is not None:
+            condicoes.append("v.date_posted >= ?")
+            parametros.append((datetime.now() - timedelta(hours=int(horas))).date().isoformat())
+        if plataforma:
+            condicoes.append("v.site = ?")
+            parametros.append(plataforma.strip().lower())
+
+        sql = "SELECT v.country, v.description, v.description_truncated, v.dados FROM "
+        if consulta:
+            sql += "vagas_texto JOIN vagas AS v ON v.id = vagas_texto.rowid"
+            ordem = f"bm25(vagas_texto, {', '.join(map(str, PESOS_BM25))})"
+        else:
+            sql += "vagas AS v"
+            ordem = "v.date_posted DESC, v.id DESC"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += f" ORDER BY {ordem} LIMIT ?"
+        parametros.append(int(limite))
+
+        with self._conectar() as conexao:
+            linhas = conexao.execute(sql, parametros).fetchall()
+        resultado = []
+        for country, descricao, cortada, dados in linhas:
+            job = json.loads(zlib.decompress(dados))
+            job["description"] = descricao
+            job["description_truncated"] = bool(cortada)
+            resultado.append((country, job))
+        return resultado
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna o total de vagas, por país e o tamanho do arquivo em bytes.
+        """
+        with self._conectar() as conexao:
+            total = conexao.execute("SELECT COUNT(*) FROM vagas").fetchone()[0]
+            por_pais = dict(conexao.execute("SELECT COALESCE(country, '?'), COUNT(*) FROM vagas GROUP BY country ORDER BY COUNT(*) DESC").fetchall())
+        bytes_ = sum(os.path.getsize(caminho) for caminho in (self.caminho, self.caminho + "-wal") if os.path.exists(caminho))
+        return {"vagas": total, "por_pais": por_pais, "bytes": bytes_}
+
+
+_arquivo_padrao: Optional[ArquivoVagas] = None
+_trava_padrao = threading.Lock()
+_gravador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arquivo-vagas") # Um único escritor: sem disputa pelas travas do SQLite
+_ultima_gravacao: Optional[Future] = None
+
+
+def arquivo_padrao() -> ArquivoVagas:
+    """
+    Retorna o arquivo compartilhado por vagas.py, painel.py, lote.py e monitor.py (criado na primeira chamada).
+    """
+    global _arquivo_padrao
+    with _trava_padrao:
+        if _arquivo_padrao is None:
+            _arquivo_padrao = ArquivoVagas()
+        return _arquivo_padrao
+
+
+def _gravar(metodo: str, *args):
+    try:
+        getattr(arquivo_padrao(), metodo)(*args)
+    except (sqlite3.Error, OSError) as erro: # Um arquivo travado ou sem espaço nunca derruba a busca
+        print(f"DEBUG: Falha ao gravar no arquivo local de vagas: {erro}")
+
+
+def _agendar(metodo: str, *args):
+    global _ultima_gravacao
+    _ultima_gravacao = _gravador.submit(_gravar, metodo, *args)
+
+
+def arquivar(jobs: Iterable[dict], pais: Optional[str] = None):
+    """
+    Agenda a gravação das vagas de uma busca no arquivo padrão, em segundo plano (sem atrasar quem
+    buscou). As gravações pendentes terminam antes do programa fechar.
+    """
+    if not ATIVO:
+        return
+    jobs = [job.para_dict() if hasattr(job, "para_dict") else job for job in jobs] # Registros compactos (registro.py) viram dicionários
+    if jobs:
+        _agendar("arquivar", jobs, pais)
+
+
+def completar_descricao(job: dict, descricao: str):
+    """
+    Agenda `ArquivoVagas.completar_descricao` no arquivo padrão (em segundo plano, como `arquivar`).
+    """
+    if ATIVO:
+        _agendar("completar_descricao", {"id": job.get("id"), "job_url": job.get("job_url")}, descricao)
+
+
+def aguardar_gravacoes():
+    """
+    Espera as gravações agendadas por `arquivar` (o escritor é único, então basta a última).
+    """
+    if _ultima_gravacao is not None:
+        _ultima_gravacao.result()
+
+
+def pesquisar(*args, **kwargs) -> List[Tuple[Optional[str], dict]]:
+    """
+    `ArquivoVagas.pesquisar` no arquivo padrão, já com as vagas das buscas que acabaram de terminar.
+    """
+    aguardar_gravacoes()
+    with metricas.cronometro("arquivo_busca_segundos"):
+        return arquivo_padrao().pesquisar(*args, **kwargs)
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca offline no arquivo local de vagas (sem usar a API).")
+    parser.add_argument("termo", nargs="?", default="", help="Palavras no título, descrição ou habilidades (vazio = todas).")
+    parser.add_argument("--pais", help="Países separados por vírgula (ex: portugal, spain).")
+    parser.add_argument("--localidade", help="Começo da localidade (ex: Lisboa).")
+    parser.add_argument("--remoto", help="'Remoto', 'Presencial' ou 'Ambos'.")
+    parser.add_argument("--horas", type=int, help="Só vagas publicadas nas últimas N horas (0 = hoje).")
+    parser.add_argument("--plataforma", help="Só vagas deste site (ex: linkedin, indeed).")
+    parser.add_argument("--limite", type=int, default=LIMITE_PADRAO, help="Máximo de vagas exibidas.")
+    parser.add_argument("--importar", nargs="+", metavar="RELATORIO", help="Acrescenta ao arquivo as vagas de relatórios .txt.")
+    args = parser.parse_args()
+
+    arquivo = arquivo_padrao()
+    if args.importar:
+        import importador # Import local: só a importação lê os relatórios
+        por_pais = {}
+        for vaga in importador.importar_arquivos(args.importar):
+            job = {campo: valor for campo, valor in vaga.items() if campo not in importador.CAMPOS_EXTRAS}
+            job["description_truncated"] = vaga["descricao_truncada"] # O relatório corta a descrição em 400 caracteres
+            por_pais.setdefault(vaga.get("busca_pais"), []).append(job)
+        novas = sum(arquivo.arquivar(jobs, pais) for pais, jobs in por_pais.items())
+        print(f"--- {novas} vaga(s) nova(s) importada(s) para '{arquivo.caminho}' ---")
+    else:
+        import vagas # Import local: a exibição usa o formato dos relatórios
+        vagas.buscar_e_exibir_vagas_offline(args.termo, args.localidade, args.pais, args.remoto, args.horas,
+                                            plataforma=args.plataforma, limite=args.limite)
+    resumo = arquivo.estatisticas()
+    print(f"\n(Arquivo local: {resumo['vagas']} vaga(s), {resumo['bytes'] / 2**20:.1f} MB em '{arquivo.caminho}'.)")
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# Benchmarks que rodam offline contra um servidor local que imita a API.
+# Execute a partir da raiz do repositório, ex: python -m benchmarks.bench_cliente
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede o arquivo local de vagas (arquivo_vagas.py) com as vagas dos relatórios ampliadas:
+# gravação em lotes de 200 (como chegam as respostas da API), tamanho em disco e tempo das buscas
+# offline (FTS5 + filtros indexados) contra a mesma busca numa varredura das vagas em Python.
+# Uso: python -m benchmarks.bench_arquivo [--vagas 100000] [--repeticoes 20]
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+import unicodedata
+from datetime import datetime, timedelta
+
+import arquivo_vagas
+from benchmarks.servidor_local import ampliar_vagas, vagas_dos_relatorios
+
+VAGAS_POR_RESPOSTA = 200
+PAISES = ("brazil", "portugal", "spain", "usa", "germany")
+_RE_PALAVRA = re.compile(r"[^\W_]+") # Como o tokenizador unicode61 do FTS5: letras e números
+
+
+def _p50_ms(chamar, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        chamar()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def _sem_acentos(texto: str) -> str:
+    return "".join(letra for letra in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(letra))
+
+
+def _palavras(texto: str) -> list:
+    return _RE_PALAVRA.findall(_sem_acentos(texto.lower()))
+
+
+def _varredura(pares: list, termo: str, pais=None, localidade=None, remoto=None, desde=None) -> list:
+    # A mesma busca sem índice, vaga a vaga: cada palavra do termo como começo de uma palavra do
+    # título, descrição ou habilidades (sem acentos), e os mesmos filtros
+    procuradas = _palavras(termo)
+    encontradas = []
+    for pais_vaga, job in pares:
+        if pais and pais_vaga != pais:
+            continue
+        if localidade and not (job.get("location") or "").lower().startswith(localidade.lower()):
+            continue
+        if remoto is not None and (bool(job.get("is_remote")) or job.get("work_from_home_type") == "Remoto") != remoto:
+            continue
+        if desde and (job.get("date_posted") or "") < desde:
+            continue
+        palavras = set(_palavras(" ".join(str(job.get(campo) or "") for campo in ("title", "description", "skills"))))
+        if all(any(palavra.startswith(procurada) for palavra in palavras) for procurada in procuradas):
+            encontradas.append(job)
+    return encontradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do arquivo local de vagas e da busca offline.")
+    parser.add_argument("--vagas", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    originais = [vaga for lista in vagas_dos_relatorios().values() for vaga in lista]
+    ampliadas = ampliar_vagas(originais, args.vagas)
+    pares = [(PAISES[posicao % len(PAISES)], job) for posicao, job in enumerate(ampliadas)]
+    print(f"{args.vagas} vagas ({len(originais)} vagas dos relatórios ampliadas), {len(PAISES)} países:")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = arquivo_vagas.ArquivoVagas(os.path.join(diretorio, "arquivo.sqlite3"))
+        inicio = time.perf_counter()
+        for comeco in range(0, len(pares), VAGAS_POR_RESPOSTA):
+            resposta = pares[comeco:comeco + VAGAS_POR_RESPOSTA]
+            for pais in PAISES:
+                arquivo.arquivar([job for pais_vaga, job in resposta if pais_vaga == pais], pais)
+        gravacao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        repetidas = arquivo.arquivar(ampliadas[:VAGAS_POR_RESPOSTA], PAISES[0])
+        regravacao = time.perf_counter() - inicio
+        resumo = arquivo.estatisticas()
+        print(f"  gravar                  : {gravacao:6.2f} s ({args.vagas / gravacao:7.0f} vagas/s) | "
+              f"{resumo['bytes'] / 2**20:6.1f} MB em disco | {resumo['vagas']} vagas")
+        print(f"  resposta já arquivada   : {regravacao * 1000:6.1f} ms para {VAGAS_POR_RESPOSTA} vagas, {repetidas} nova(s)")
+
+        # "Últimas N horas" relativo à vaga mais recente, para as datas fixas dos relatórios
+        mais_recente = max(job.get("date_posted") or "" for job in originais)
+        horas = int((datetime.now() - datetime.fromisoformat(mais_recente)).total_seconds() // 3600) + 24 * 7
+        desde = (datetime.now() - timedelta(hours=horas)).date().isoformat()
+        consultas = (
+            ("termo", dict(termo="suporte"), dict(termo="suporte")),
+            ("termo + país", dict(termo="análise dados", pais="brazil"), dict(termo="análise dados", pais="brazil")),
+            ("termo + localidade", dict(termo="estágio", localidade="Rio de Janeiro"),
+             dict(termo="estágio", localidade="Rio de Janeiro")),
+            ("termo + país + presencial + 7 dias", dict(termo="desenvolvedor", pais="portugal", remoto="Presencial", horas=horas),
+             dict(termo="desenvolvedor", pais="portugal", remoto=False, desde=desde)),
+        )
+        print(f"  {'busca offline':<34}  {'FTS5':>9} | {'varredura':>10} | vagas")
+        unicos = list({arquivo_vagas.chave_da_vaga(job): (pais, job) for pais, job in reversed(pares)}.values()) # Como no arquivo: a primeira de cada id
+        for nome, filtros_fts, filtros_varredura in consultas:
+            encontradas = arquivo.pesquisar(limite=args.vagas, **filtros_fts)
+            esperadas = _varredura(unicos, **filtros_varredura)
+            fts = _p50_ms(lambda: arquivo.pesquisar(**filtros_fts), args.repeticoes)
+            varredura = _p50_ms(lambda: _varredura(unicos, **filtros_varredura), max(1, args.repeticoes // 10))
+            aviso = "" if len(encontradas) == len(esperadas) else f" (varredura: {len(esperadas)})"
+            print(f"  {nome:<34}: {fts:7.1f} ms | {varredura:7.1f} ms | {len(encontradas)}{aviso}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara o tempo até o primeiro token do /chat: resposta JSON completa (response.json(),
+# como antes) contra a leitura em streaming do chat_incremental, com o servidor local
+# gerando uma palavra por vez. Também confere que as duas leituras devolvem o mesmo texto.
+# Uso: python -m benchmarks.bench_chat [--palavras 60] [--atraso-por-token 0.03] [--formato sse]
+
+import argparse
+import time
+
+import chat_incremental
+import cliente_api
+import limitador
+from benchmarks.servidor_local import ServidorLocal
+
+MENSAGEM = "Quais vagas de Analista de Dados existem em Lisboa?"
+
+
+def _medir_json_completo(url: str) -> tuple:
+    inicio = time.perf_counter()
+    response = cliente_api.post_json(url, {"message": MENSAGEM}, "chave-de-teste")
+    response.raise_for_status()
+    texto = response.json()["response"]
+    total = time.perf_counter() - inicio
+    return total, total, texto # O primeiro token só aparece quando a resposta inteira chegou
+
+
+def _medir_streaming(url: str) -> tuple:
+    inicio = time.perf_counter()
+    primeiro = None
+    trechos = []
+    for trecho in chat_incremental.transmitir_chat(url, MENSAGEM, "chave-de-teste"):
+        if primeiro is None:
+            primeiro = time.perf_counter() - inicio
+        trechos.append(trecho)
+    return primeiro, time.perf_counter() - inicio, "".join(trechos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo até o primeiro token do /chat.")
+    parser.add_argument("--palavras", type=int, default=60)
+    parser.add_argument("--atraso-por-token", type=float, default=0.03, help="Intervalo simulado entre tokens (s).")
+    parser.add_argument("--formato", choices=("sse", "ndjson", "texto"), default="sse")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos só a leitura da resposta, não a cota da API
+    resposta = " ".join(f"palavra{i}" for i in range(args.palavras))
+
+    with ServidorLocal(resposta_chat=resposta, atraso_por_token=args.atraso_por_token, formato_chat=args.formato) as servidor:
+        url = f"{servidor.url}/chat"
+        cliente_api.pre_conectar(url)
+        print(f"Servidor local em {servidor.url}: {args.palavras} palavras, uma a cada {args.atraso_por_token * 1000:.0f} ms ({args.formato})")
+
+        # Para a medição "antes", o servidor devolve o JSON completo (como a API sem streaming)
+        atraso_por_token = servidor.atraso_por_token
+        servidor.atraso_por_token = None
+        servidor.atraso_resposta = atraso_por_token * (args.palavras - 1) # Mesmo tempo de geração, entregue no fim
+        primeiro, total, texto_json = _medir_json_completo(url)
+        print(f"  resposta JSON completa: primeiro token em {primeiro * 1000:8.1f} ms | resposta completa em {total * 1000:8.1f} ms")
+
+        servidor.atraso_por_token, servidor.atraso_resposta = atraso_por_token, 0.0
+        primeiro, total, texto_streaming = _medir_streaming(url)
+        print(f"  chat_incremental      : primeiro token em {primeiro * 1000:8.1f} ms | resposta completa em {total * 1000:8.1f} ms")
+
+    if texto_json != texto_streaming:
+        raise SystemExit("ERRO: a leitura em streaming devolveu um texto diferente da resposta JSON.")
+    print("As duas leituras devolveram o mesmo texto.")
+
+
+if __name__ == "__main__":
+    main()
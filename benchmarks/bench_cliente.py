@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara requisições com conexão nova (requests.post puro, como antes) contra o
+# pool compartilhado de cliente_api em buscas e turnos de chat repetidos.
+# Uso: python -m benchmarks.bench_cliente [--repeticoes 30] [--atraso-conexao 0.05]
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import time
+
+import requests
+
+import chat_AI
+import cliente_api
+import conversa
+import limitador
+import vagas
+from benchmarks.servidor_local import ServidorLocal
+
+
+def _medir(funcao, repeticoes: int) -> list:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def _conexao_nova(url: str, payload: dict):
+    # Comportamento antigo: cada chamada abre (e fecha) sua própria conexão.
+    resposta = requests.post(url, headers=cliente_api.montar_headers("chave-de-teste"), data=json.dumps(payload), timeout=10)
+    resposta.raise_for_status()
+    return resposta.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pool de conexões do cliente_api.")
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--atraso-conexao", type=float, default=0.05, help="Custo simulado de DNS + TLS por conexão (s).")
+    args = parser.parse_args()
+
+    payload_busca = {"search_term": "Analista de Dados", "location": "Lisboa", "country": "portugal", "is_remote": "Ambos", "hours_old": 72}
+
+    limitador.ATIVO = False # Aqui medimos só a conexão, não a cota da API
+
+    with ServidorLocal(atraso_conexao=args.atraso_conexao) as servidor:
+        vagas.BASE_URL = servidor.url
+        chat_AI.BASE_URL = servidor.url
+        url_busca = f"{servidor.url}/search_jobs"
+        url_chat = f"{servidor.url}/chat"
+
+        cenarios = [
+            ("busca  | conexão nova", lambda: _conexao_nova(url_busca, payload_busca)),
+            ("busca  | pool       ", lambda: vagas.fazer_requisicao("search_jobs", payload_busca, "chave-de-teste")),
+            ("chat   | conexão nova", lambda: _conexao_nova(url_chat, {"message": "Olá"})),
+            ("chat   | pool       ", lambda: chat_AI.fazer_requisicao_chat( # Sem o cache de respostas: mede a rede
+                "Olá", "chave-de-teste", sessao=conversa.SessaoChat(url_chat, "chave-de-teste", usar_cache=False))),
+        ]
+
+        print(f"Servidor local em {servidor.url} (atraso de conexão simulado: {args.atraso_conexao * 1000:.0f} ms)")
+        medianas = {}
+        for nome, funcao in cenarios:
+            cliente_api.fechar_sessao()
+            conexoes_antes = servidor.conexoes_abertas
+            with contextlib.redirect_stdout(io.StringIO()): # Esconde os prints de chat_AI/vagas
+                tempos = _medir(funcao, args.repeticoes)
+            medianas[nome] = statistics.median(tempos)
+            print(f"  {nome}: mediana {medianas[nome] * 1000:7.2f} ms | p95 {sorted(tempos)[int(len(tempos) * 0.95) - 1] * 1000:7.2f} ms"
+                  f" | conexões abertas: {servidor.conexoes_abertas - conexoes_antes}")
+
+        for tipo in ("busca ", "chat  "):
+            economia = medianas[f"{tipo} | conexão nova"] - medianas[f"{tipo} | pool       "]
+            print(f"Economia por requisição ({tipo.strip()}): {economia * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede a camada de conversa do conversa.py contra o servidor local:
+#   - cache de respostas: muitas conversas curtas que começam com as mesmas perguntas de FAQ
+#     (escritas de jeitos diferentes) — quantas requisições chegam de fato ao /chat;
+#   - contexto: uma sessão longa mandando o histórico inteiro a cada turno contra o contexto
+#     compactado (resumos + orçamento de bytes) — tamanho do payload e latência por turno.
+# Também confere que uma resposta cortada antes do evento final não vai para o cache nem para o contexto
+# e aparece como incompleta no chat do terminal (chat_AI.py) e no do painel.py.
+# Uso: python -m benchmarks.bench_conversa [--conversas 200] [--turnos 300]
+
+import argparse
+import asyncio
+import builtins
+import contextlib
+import io
+import json
+import random
+import time
+from unittest import mock
+
+import chat_AI
+import chat_incremental
+import conversa
+import limitador
+from benchmarks.servidor_local import ServidorLocal
+
+PERGUNTAS_FAQ = (
+    "Qual é o limite de requisições do plano gratuito?",
+    "Como eu renovo minha chave de API?",
+    "A API tem vagas remotas?",
+    "Quais países são suportados?",
+    "Como falo com o suporte?",
+)
+
+
+def _variar_escrita(pergunta: str, gerador: random.Random) -> str:
+    # A mesma pergunta como chega das integrações: caixa, espaços e pontuação diferentes
+    variantes = (pergunta, pergunta.lower(), pergunta.upper(), "  " + pergunta.rstrip("?") + " ", pergunta.replace(" ", "  "))
+    return gerador.choice(variantes)
+
+
+def _medir_cache(url: str, servidor: ServidorLocal, conversas: int) -> None:
+    gerador = random.Random(3)
+    cache = conversa.CacheRespostasChat()
+    antes = servidor.requisicoes
+    turnos = 0
+    for numero in range(conversas):
+        sessao = conversa.SessaoChat(url, "chave-de-teste", cache=cache)
+        sessao.enviar(_variar_escrita(gerador.choice(PERGUNTAS_FAQ), gerador))
+        sessao.enviar(f"E no caso {numero}?") # Pergunta de acompanhamento: depende do contexto
+        turnos += 2
+    estatisticas = cache.estatisticas()
+    print(f"  {conversas} conversas ({turnos} mensagens): {servidor.requisicoes - antes} requisições ao /chat, "
+          f"{estatisticas['acertos']} do cache (taxa de acerto {estatisticas['taxa_acerto']:.0%})")
+
+
+def _conferir_resposta_cortada(resposta: str) -> None:
+    for formato in ("sse", "ndjson"):
+        with ServidorLocal(resposta_chat=resposta, atraso_por_token=0.0, formato_chat=formato, cortar_chat=True) as servidor:
+            url = f"{servidor.url}/chat"
+            sessao = conversa.SessaoChat(url, "chave-de-teste", cache=conversa.CacheRespostasChat())
+            sessao.enviar(PERGUNTAS_FAQ[0])
+            if not sessao.ultima_incompleta or sessao.contexto.montar():
+                raise SystemExit(f"ERRO ({formato}): a resposta cortada foi registrada no contexto.")
+            servidor.cortar_chat = False
+            sessao.enviar(PERGUNTAS_FAQ[0])
+            if sessao.ultima_do_cache or sessao.ultima_incompleta:
+                raise SystemExit(f"ERRO ({formato}): a resposta cortada foi servida do cache.")
+            servidor.cortar_chat = True
+            _conferir_aviso_terminal(url, formato)
+            _conferir_aviso_painel(servidor.url, formato)
+    print("Respostas cortadas antes do evento final (SSE e NDJSON) ficaram fora do cache e do contexto "
+          "e foram marcadas como incompletas no terminal e no painel.")
+
+
+def _conferir_aviso_terminal(url: str, formato: str) -> None:
+    sessao = conversa.SessaoChat(url, "chave-de-teste", cache=conversa.CacheRespostasChat())
+    with contextlib.redirect_stdout(io.StringIO()):
+        resposta = chat_AI.fazer_requisicao_chat(PERGUNTAS_FAQ[1], "chave-de-teste", sessao=sessao)
+    if not resposta or not resposta["response"] or not resposta["incompleta"]:
+        raise SystemExit(f"ERRO ({formato}): fazer_requisicao_chat não marcou a resposta cortada como incompleta.")
+    # O chat interativo, com uma pergunta e 'sair', contra o mesmo servidor
+    saida = io.StringIO()
+    with mock.patch.object(chat_AI, "criar_sessao", lambda api_key: conversa.SessaoChat(url, api_key, cache=conversa.CacheRespostasChat())), \
+            mock.patch.object(builtins, "input", side_effect=[PERGUNTAS_FAQ[1], "sair"]), contextlib.redirect_stdout(saida):
+        chat_AI.interagir_com_ai("chave-de-teste")
+    if "(A resposta acima ficou incompleta.)" not in saida.getvalue():
+        raise SystemExit(f"ERRO ({formato}): o chat do terminal não avisou que a resposta ficou incompleta.")
+
+
+def _conferir_aviso_painel(url_servidor: str, formato: str) -> None:
+    # O painel numa página simulada (como no bench_ponta_a_ponta), enviando uma pergunta pelo chat
+    import flet as ft
+    import painel
+    from benchmarks.bench_ponta_a_ponta import _controles
+
+    pagina = mock.MagicMock()
+    pagina.window_width, pagina.window_height = 800, 900
+    pagina.add.side_effect = lambda *controles: list(_controles(pagina))
+    laco = asyncio.new_event_loop()
+    base_original, painel.chat_session = chat_AI.BASE_URL, None
+    chat_AI.BASE_URL = url_servidor # O painel usa a URL do chat_AI.py enquanto o formulário de busca está vazio
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            laco.run_until_complete(painel.main(pagina))
+            campo = next(c for c in _controles(pagina) if isinstance(c, ft.TextField) and c.hint_text == "Digite sua mensagem ou comando...")
+            enviar = next(c for c in _controles(pagina) if isinstance(c, ft.FloatingActionButton) and c.icon == ft.Icons.SEND)
+            campo.value = PERGUNTAS_FAQ[2]
+            laco.run_until_complete(enviar.on_click(None))
+    finally:
+        laco.close()
+        chat_AI.BASE_URL = base_original
+    textos = [c.value for c in _controles(pagina) if isinstance(c, ft.Text) and isinstance(c.value, str)]
+    if not any(texto.endswith(" (resposta interrompida)") for texto in textos):
+        raise SystemExit(f"ERRO ({formato}): o painel mostrou a resposta cortada como completa.")
+
+
+def _sessao_longa(url: str, turnos: int, compactar: bool) -> tuple:
+    sessao = conversa.SessaoChat(url, "chave-de-teste", cache=conversa.CacheRespostasChat(), usar_cache=False)
+    historico = [] # Contexto sem compactação: todas as mensagens da sessão
+    tamanhos, tempos = [], []
+    for turno in range(turnos):
+        pergunta = f"Pergunta {turno}: quais vagas de dados existem em Lisboa para quem tem {turno % 10} anos de experiência?"
+        inicio = time.perf_counter()
+        if compactar:
+            sessao.enviar(pergunta)
+            tamanhos.append(sessao.ultimo_payload_bytes)
+        else:
+            contexto = {"history": list(historico)} if historico else {}
+            tamanhos.append(len(json.dumps(contexto, ensure_ascii=False).encode("utf-8")) if contexto else 0)
+            resposta = "".join(chat_incremental.transmitir_chat(url, pergunta, "chave-de-teste", contexto))
+            historico += [{"role": "user", "content": pergunta}, {"role": "assistant", "content": resposta}]
+        tempos.append(time.perf_counter() - inicio)
+    return tamanhos, tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do cache de respostas e do contexto compactado do /chat.")
+    parser.add_argument("--conversas", type=int, default=200)
+    parser.add_argument("--turnos", type=int, default=300)
+    parser.add_argument("--atraso-por-kb", type=float, default=0.002, help="Custo simulado por KB enviado (s).")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos o cliente, não a cota da API
+    resposta = ("Encontrei algumas vagas que combinam com o que você pediu. " * 6).strip()
+    with ServidorLocal(resposta_chat=resposta, atraso_por_kb=args.atraso_por_kb) as servidor:
+        url = f"{servidor.url}/chat"
+        print("Cache de respostas:")
+        _medir_cache(url, servidor, args.conversas)
+
+        print(f"Sessão longa de {args.turnos} turnos (custo simulado de {args.atraso_por_kb * 1000:.1f} ms por KB enviado):")
+        for nome, compactar in (("histórico inteiro", False), ("contexto compactado", True)):
+            tamanhos, tempos = _sessao_longa(url, args.turnos, compactar)
+            ultimos = tempos[-20:]
+            print(f"  {nome:<20}: contexto no turno 10 = {tamanhos[min(10, len(tamanhos) - 1)] / 1024:7.1f} KB | "
+                  f"no último = {tamanhos[-1] / 1024:7.1f} KB | últimos 20 turnos: {sum(ultimos) * 1000 / len(ultimos):7.1f} ms/turno")
+            if compactar and max(tamanhos) > conversa.ORCAMENTO_BYTES:
+                raise SystemExit(f"ERRO: o contexto compactado passou do orçamento ({max(tamanhos)} bytes).")
+    print(f"O contexto compactado ficou sempre dentro de {conversa.ORCAMENTO_BYTES} bytes.")
+    _conferir_resposta_cortada(resposta)
+
+
+if __name__ == "__main__":
+    main()
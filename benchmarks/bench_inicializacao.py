@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede a inicialização do painel.py num interpretador novo a cada rodada:
+#   - tempo de importação do painel (descontado o import do próprio flet);
+#   - tempo até o primeiro quadro: main() montar a página e enviar o primeiro page.add/update
+#     (com uma página simulada, sem abrir janela);
+#   - quais módulos pesados foram carregados só para abrir o app no modo chat.
+# Termina com erro se um módulo pesado voltar a ser carregado na inicialização ou se
+# os tempos passarem dos limites, para pegar regressões.
+# Uso: python -m benchmarks.bench_inicializacao [--rodadas 5] [--limite-import-ms 150] [--limite-quadro-ms 300]
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Módulos que não devem ser carregados para abrir o painel no modo chat
+MODULOS_PESADOS = ("pandas", "numpy", "requests", "pyarrow", "cliente_api", "cache_buscas", "deduplicacao", "json_incremental", "transformacao", "salarios", "chat_AI", "chat_incremental", "conversa", "resiliencia", "busca_paises", "relevancia", "projecao", "registro")
+
+
+def _medir_no_filho():
+    # Executado no interpretador novo: imprime as medidas em JSON
+    import asyncio
+    import time
+    from unittest import mock
+
+    inicio = time.perf_counter()
+    import flet as ft # noqa: F401
+    depois_flet = time.perf_counter()
+    import painel
+    depois_painel = time.perf_counter()
+
+    pagina = mock.MagicMock()
+    pagina.window_width, pagina.window_height = 800, 900
+    primeiro_quadro = {}
+
+    def marcar_quadro(*args, **kwargs):
+        primeiro_quadro.setdefault("t", time.perf_counter())
+
+    pagina.add.side_effect = marcar_quadro
+    pagina.update.side_effect = marcar_quadro
+
+    async def abrir():
+        comeco = time.perf_counter()
+        await painel.main(pagina)
+        await asyncio.sleep(0) # Deixa o UpdateScheduler enviar a primeira atualização
+        return comeco, time.perf_counter()
+
+    comeco_main, fim_main = asyncio.run(abrir())
+    print(json.dumps({
+        "import_flet_ms": (depois_flet - inicio) * 1000,
+        "import_painel_ms": (depois_painel - depois_flet) * 1000,
+        "primeiro_quadro_ms": (primeiro_quadro.get("t", fim_main) - comeco_main) * 1000,
+        "main_ms": (fim_main - comeco_main) * 1000,
+        "modulos_pesados": [nome for nome in MODULOS_PESADOS if nome in sys.modules],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do painel.py.")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--limite-import-ms", type=float, default=150.0, help="Máximo para importar o painel (sem contar o flet).")
+    parser.add_argument("--limite-quadro-ms", type=float, default=300.0, help="Máximo de main() até o primeiro quadro.")
+    parser.add_argument("--filho", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        _medir_no_filho()
+        return
+
+    medidas = []
+    for _ in range(args.rodadas):
+        saida = subprocess.run([sys.executable, "-m", "benchmarks.bench_inicializacao", "--filho"],
+                               capture_output=True, text=True, check=True)
+        medidas.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    def mediana(chave):
+        return statistics.median(medida[chave] for medida in medidas)
+
+    print(f"Inicialização do painel ({args.rodadas} rodadas, interpretador novo em cada uma):")
+    print(f"  import flet          : {mediana('import_flet_ms'):8.1f} ms")
+    print(f"  import painel        : {mediana('import_painel_ms'):8.1f} ms (limite {args.limite_import_ms:.0f} ms)")
+    print(f"  main() até 1º quadro : {mediana('primeiro_quadro_ms'):8.1f} ms (limite {args.limite_quadro_ms:.0f} ms)")
+    print(f"  main() completo      : {mediana('main_ms'):8.1f} ms")
+
+    problemas = []
+    pesados = sorted({nome for medida in medidas for nome in medida["modulos_pesados"]})
+    if pesados:
+        problemas.append(f"módulos pesados carregados na inicialização: {', '.join(pesados)}")
+    if mediana("import_painel_ms") > args.limite_import_ms:
+        problemas.append("import do painel acima do limite")
+    if mediana("primeiro_quadro_ms") > args.limite_quadro_ms:
+        problemas.append("primeiro quadro acima do limite")
+    if problemas:
+        raise SystemExit("REGRESSÃO: " + "; ".join(problemas))
+    print("Nenhum módulo pesado carregado na inicialização.")
+
+
+if __name__ == "__main__":
+    main()
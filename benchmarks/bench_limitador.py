@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Vários processos disparando buscas com a mesma chave contra um servidor local que
+# aplica a cota da API (janela deslizante). Com o limitador compartilhado, a vazão
+# deve ficar no teto permitido e o servidor não deve devolver nenhum 429.
+# Para caber em segundos, a janela de 60 s é encolhida (--janela).
+# Uso: python -m benchmarks.bench_limitador [--processos 4] [--por-processo 10]
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+CHAVE = "chave-benchmark"
+
+
+def _configurar_limitador(limite: int, janela: float, diretorio: str):
+    import limitador
+    limitador.ATIVO = True
+    limitador.LIMITES_POR_PLANO["free"] = limite
+    limitador.PERIODO_LIMITE = janela
+    limitador.FOLGA_SEGUNDOS = janela * 0.01
+    limitador.DIRETORIO_ESTADO = diretorio
+
+
+def _trabalhador(url: str, quantidade: int, limite: int, janela: float, diretorio: str, fila):
+    _configurar_limitador(limite, janela, diretorio)
+    import cliente_api
+    codigos = []
+    for _ in range(quantidade):
+        response = cliente_api.post_json(f"{url}/search_jobs", {"search_term": "dev", "country": "brazil"}, CHAVE,
+                                         ao_aguardar=lambda segundos: None)
+        codigos.append(response.status_code)
+    fila.put(codigos)
+
+
+def main():
+    from benchmarks.servidor_local import ServidorLocal, gerar_vagas
+
+    parser = argparse.ArgumentParser(description="Benchmark do limitador de requisições entre processos.")
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--por-processo", type=int, default=10)
+    parser.add_argument("--limite", type=int, default=15, help="Requisições permitidas por janela (15 = plano Pro).")
+    parser.add_argument("--janela", type=float, default=3.0, help="Tamanho da janela em segundos (a API usa 60).")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="vagas_limites_")
+    with ServidorLocal(vagas=gerar_vagas(5, 200), limite=args.limite, janela=args.janela) as servidor:
+        fila = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(target=_trabalhador, args=(servidor.url, args.por_processo, args.limite, args.janela, diretorio, fila))
+            for _ in range(args.processos)
+        ]
+        inicio = time.perf_counter()
+        for processo in processos:
+            processo.start()
+        codigos = [codigo for _ in processos for codigo in fila.get()]
+        for processo in processos:
+            processo.join()
+        duracao = time.perf_counter() - inicio
+
+    total = len(codigos)
+    teto = args.limite / args.janela
+    print(f"{args.processos} processos x {args.por_processo} requisições, cota de {args.limite} a cada {args.janela:.1f}s")
+    print(f"  Duração: {duracao:.2f}s | vazão: {total / duracao:.2f} req/s ({total / duracao / teto:.0%} do teto de {teto:.2f} req/s)")
+    print(f"  Respostas 429 no servidor: {servidor.respostas_429} | status finais != 200: {sum(1 for c in codigos if c != 200)}")
+
+
+if __name__ == "__main__":
+    main()
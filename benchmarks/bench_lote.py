@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede o modo lote (lote.py) contra o servidor local com latência: tempo total do mesmo
+# arquivo de buscas com 1, 4 e 8 buscas simultâneas. Também confere que respostas malformadas
+# (JSON inválido, uma lista, null) viram linhas com 'error' e que o resto do lote é executado.
+# Uso: python -m benchmarks.bench_lote [--buscas 40] [--latencia 0.05]
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import arquivo_vagas
+import limitador
+import lote
+from benchmarks.servidor_local import ServidorLocal, gerar_vagas
+
+CHAVE = "chave-de-teste"
+CORPOS_MALFORMADOS = { # search_term -> (corpo cru do /search_jobs, erro esperado na linha do resultado)
+    "resposta invalida": (b"<html>Gateway</html>", "Resposta da API não é um JSON válido."),
+    "resposta lista": (b"[]", "Resposta da API em formato inesperado."),
+    "resposta nula": (b"null", "Resposta da API em formato inesperado."),
+}
+
+
+def _gravar_buscas(caminho: str, termos: list) -> None:
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for termo in termos:
+            arquivo.write(json.dumps({"search_term": termo, "country": "brazil"}, ensure_ascii=False) + "\n")
+
+
+def _ler_resultados(caminho: str) -> dict:
+    with open(caminho, encoding="utf-8") as arquivo:
+        return {registro["payload"]["search_term"]: registro for registro in map(json.loads, arquivo)}
+
+
+def _conferir_malformadas(url: str, diretorio: str) -> None:
+    termos = ["Dados 1", *CORPOS_MALFORMADOS, "Dados 2"]
+    entrada, saida = os.path.join(diretorio, "malformadas.jsonl"), os.path.join(diretorio, "malformadas-saida.jsonl")
+    _gravar_buscas(entrada, termos)
+    resumo = lote.executar_lote(entrada, saida, CHAVE, concorrencia=1, url=url)
+    resultados = _ler_resultados(saida)
+    for termo, (_, esperado) in CORPOS_MALFORMADOS.items():
+        if resultados.get(termo, {}).get("error") != esperado:
+            raise SystemExit(f"ERRO: a busca '{termo}' gravou {resultados.get(termo)!r} em vez do erro '{esperado}'.")
+    if resumo["buscas"] != len(termos) or resumo["erros"] != len(CORPOS_MALFORMADOS):
+        raise SystemExit(f"ERRO: o lote parou nas respostas malformadas ({resumo}).")
+    print(f"Respostas malformadas ({len(CORPOS_MALFORMADOS)}) viraram erros no resultado e o lote seguiu até o fim.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo lote com buscas simultâneas.")
+    parser.add_argument("--buscas", type=int, default=40)
+    parser.add_argument("--latencia", type=float, default=0.05, help="Latência do servidor por requisição (s).")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos a concorrência do lote, não a cota da API
+    arquivo_vagas.ATIVO = False
+    corpos = {termo: corpo for termo, (corpo, _) in CORPOS_MALFORMADOS.items()}
+    with ServidorLocal(vagas=gerar_vagas(20, 500), atraso_resposta=args.latencia, corpos_por_termo=corpos) as servidor, \
+            tempfile.TemporaryDirectory() as diretorio:
+        url = f"{servidor.url}/search_jobs"
+        entrada = os.path.join(diretorio, "buscas.jsonl")
+        _gravar_buscas(entrada, [f"Dados {numero}" for numero in range(args.buscas)])
+        print(f"{args.buscas} buscas, latência de {args.latencia * 1000:.0f} ms:")
+        for concorrencia in (1, 4, 8):
+            inicio = time.perf_counter()
+            resumo = lote.executar_lote(entrada, os.path.join(diretorio, f"saida-{concorrencia}.jsonl"), CHAVE,
+                                        concorrencia=concorrencia, url=url)
+            duracao = time.perf_counter() - inicio
+            if resumo["erros"]:
+                raise SystemExit(f"ERRO: {resumo['erros']} busca(s) falharam com concorrência {concorrencia}.")
+            print(f"  concorrência {concorrencia}: {duracao:6.2f} s ({resumo['buscas'] / duracao:6.1f} buscas/s)")
+        _conferir_malformadas(url, diretorio)
+
+
+if __name__ == "__main__":
+    main()
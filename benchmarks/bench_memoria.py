@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede a memória para guardar muitas vagas (ex: buscas em lote e em vários países) como
+# dicionários da API e como registros compactos (registro.py), e o mesmo para as vagas do painel
+# (dicionário com as COLUNAS_UI x transformacao.VagaPainel). As vagas vêm dos relatórios do
+# repositório, ampliadas, e são lidas com json.loads em respostas de 200 vagas, como chegam da API.
+# Mede também o tempo de montar os registros e de ler todas as descrições (que os registros guardam
+# comprimidas no armazém em disco, descricoes.py, e decodificam sob demanda).
+# Uso: python -m benchmarks.bench_memoria [--vagas 100000]
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import descricoes
+import registro
+import transformacao
+from benchmarks.servidor_local import ampliar_vagas, vagas_dos_relatorios
+
+VAGAS_POR_RESPOSTA = 200
+
+
+def _medir(montar) -> tuple:
+    # Tempo para montar (sem o tracemalloc, que deixa tudo mais lento) e memória ocupada pelo resultado
+    gc.collect()
+    inicio = time.perf_counter()
+    montar()
+    duracao = time.perf_counter() - inicio
+    gc.collect()
+    tracemalloc.start()
+    resultado = montar()
+    gc.collect()
+    ocupada = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, ocupada, duracao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória: dicionários x registros compactos.")
+    parser.add_argument("--vagas", type=int, default=100000)
+    args = parser.parse_args()
+
+    originais = [vaga for lista in vagas_dos_relatorios().values() for vaga in lista]
+    ampliadas = ampliar_vagas(originais, args.vagas)
+    respostas = [json.dumps({"count": VAGAS_POR_RESPOSTA, "jobs": ampliadas[inicio:inicio + VAGAS_POR_RESPOSTA]}, ensure_ascii=False)
+                 for inicio in range(0, len(ampliadas), VAGAS_POR_RESPOSTA)]
+    del ampliadas
+    print(f"{args.vagas} vagas ({len(originais)} vagas dos relatórios ampliadas), em {len(respostas)} respostas:")
+
+    def dicionarios():
+        return [job for resposta in respostas for job in json.loads(resposta)["jobs"]]
+
+    def compactas():
+        return [registro.Vaga(job) for resposta in respostas for job in json.loads(resposta)["jobs"]]
+
+    def painel_dicionarios():
+        # Como o painel guardava: um dicionário novo por vaga transformada
+        return [{coluna: vaga[coluna] for coluna in transformacao.COLUNAS_UI}
+                for resposta in respostas for vaga in map(transformacao.transformar_vaga, json.loads(resposta)["jobs"])]
+
+    def painel_compactas():
+        return [transformacao.transformar_vaga(job) for resposta in respostas for job in json.loads(resposta)["jobs"]]
+
+    for nome_antes, montar_antes, nome_depois, montar_depois in (
+            ("dicionários da API", dicionarios, "registro.Vaga", compactas),
+            ("painel: dicionários", painel_dicionarios, "painel: VagaPainel", painel_compactas)):
+        vagas, memoria_antes, tempo_antes = _medir(montar_antes)
+        inicio = time.perf_counter()
+        caracteres_antes = sum(len(vaga.get("description") or "") for vaga in vagas)
+        leitura_antes = time.perf_counter() - inicio
+        del vagas
+        vagas, memoria_depois, tempo_depois = _medir(montar_depois)
+        inicio = time.perf_counter()
+        caracteres_depois = sum(len(vaga.get("description") or "") for vaga in vagas)
+        leitura_depois = time.perf_counter() - inicio
+        del vagas
+        if caracteres_antes != caracteres_depois:
+            raise SystemExit(f"ERRO: as descrições de '{nome_depois}' diferem das de '{nome_antes}'.")
+        for nome, memoria, tempo, leitura in ((nome_antes, memoria_antes, tempo_antes, leitura_antes),
+                                              (nome_depois, memoria_depois, tempo_depois, leitura_depois)):
+            print(f"  {nome:<22}: {memoria / 2**20:8.1f} MB ({memoria / args.vagas:6.0f} bytes/vaga) | "
+                  f"montar {tempo:5.2f} s | ler as descrições {leitura * 1000:6.1f} ms")
+        print(f"  {'':<22}  {memoria_depois / memoria_antes:.0%} da memória com os registros compactos")
+    armazem = descricoes.armazem_padrao()
+    print(f"  armazém de descrições : {armazem.bytes_em_disco / 2**20:8.1f} MB em disco ({len(armazem)} descrições comprimidas)")
+
+
+if __name__ == "__main__":
+    main()
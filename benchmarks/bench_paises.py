@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara a busca de um termo em vários países feita país a país (um buscar_e_exibir_vagas
+# depois do outro) com o fan-out do busca_paises.py, contra o servidor local com uma latência
+# diferente por país: tempo até a primeira vaga, tempo total e vagas únicas depois da deduplicação.
+# Uso: python -m benchmarks.bench_paises [--paises 12] [--atraso-maximo 1.5]
+
+import argparse
+import random
+import time
+
+import arquivo_vagas
+import busca_paises
+import deduplicacao
+import json_incremental
+import limitador
+from benchmarks.servidor_local import ServidorLocal, gerar_vagas
+
+
+def _pais_a_pais(url: str, paises: list) -> tuple:
+    inicio = time.perf_counter()
+    primeira = None
+    deduplicador = deduplicacao.Deduplicador()
+    unicas = 0
+    for pais in paises:
+        payload = {"search_term": "Dados", "country": pais}
+        for job in json_incremental.transmitir_busca(url, payload, "chave-de-teste"):
+            if primeira is None:
+                primeira = time.perf_counter() - inicio
+            unicas += deduplicador.e_nova(job)
+    return primeira, time.perf_counter() - inicio, unicas
+
+
+def _fan_out(url: str, paises: list, concorrencia: int) -> tuple:
+    inicio = time.perf_counter()
+    primeira = None
+    unicas = 0
+    for evento in busca_paises.buscar_em_paises(url, "chave-de-teste", "Dados", paises,
+                                                concorrencia=concorrencia, usar_cache=False):
+        if evento.tipo == "vaga":
+            if primeira is None:
+                primeira = time.perf_counter() - inicio
+            unicas += 1
+    return primeira, time.perf_counter() - inicio, unicas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca em vários países (fan-out).")
+    parser.add_argument("--paises", type=int, default=12)
+    parser.add_argument("--atraso-maximo", type=float, default=1.5, help="Latência do país mais lento (s).")
+    parser.add_argument("--concorrencia", type=int, default=busca_paises.CONCORRENCIA_PADRAO)
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos o fan-out; o ritmo da cota é o mesmo nas duas formas
+    arquivo_vagas.ATIVO = False # As vagas sintéticas não vão para o arquivo local
+    gerador = random.Random(5)
+    paises = list(busca_paises.PAISES_SUPORTADOS[:args.paises])
+    atrasos = {pais: gerador.uniform(0.1, args.atraso_maximo) for pais in paises}
+    print(f"{len(paises)} países, latência de {min(atrasos.values()) * 1000:.0f} a {max(atrasos.values()) * 1000:.0f} ms por país "
+          f"(concorrência {args.concorrencia}):")
+
+    with ServidorLocal(vagas=gerar_vagas(20, 300), atraso_por_vaga=0.002, atraso_por_pais=atrasos) as servidor:
+        url = f"{servidor.url}/search_jobs"
+        for nome, medir in (("país a país", lambda: _pais_a_pais(url, paises)),
+                            ("fan-out (busca_paises)", lambda: _fan_out(url, paises, args.concorrencia))):
+            primeira, total, unicas = medir()
+            print(f"  {nome:<24}: primeira vaga em {primeira * 1000:7.1f} ms | todas em {total * 1000:7.1f} ms | {unicas} vagas únicas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Suíte de ponta a ponta contra o servidor local, com linha de base para pegar regressões.
+# Mede a latência (p50/p95) e a vazão de:
+#   - vagas.buscar_e_exibir_vagas (busca pelo terminal), com e sem respostas 429 do servidor;
+#   - chat_AI.fazer_requisicao_chat (resposta em streaming, com as respostas fixas do /chat);
+#   - a busca do painel.py (fetch_and_transform_jobs + fila da UI), com uma página simulada.
+# As buscas recebem as vagas dos relatórios "Vagas *.txt" do repositório, ampliadas até --vagas.
+# O resultado é comparado com benchmarks/linha_de_base.json: a suíte termina com erro se algum
+# cenário falhar, ficar mais lento ou com menos vazão que a linha de base além da --tolerancia.
+# Numa máquina nova, grave a linha de base dela com --gravar.
+# Uso: python -m benchmarks.bench_ponta_a_ponta [--repeticoes 20] [--vagas 200] [--latencia 0.02] [--gravar]
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import arquivo_vagas
+import cache_buscas
+import chat_AI
+import conversa
+import limitador
+import vagas
+from benchmarks.servidor_local import ServidorLocal, ampliar_vagas, carregar_respostas_chat, vagas_dos_relatorios
+
+ARQUIVO_LINHA_DE_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linha_de_base.json")
+FOLGA_MS = 5.0 # Diferença absoluta tolerada no p50, para os cenários de poucos milissegundos
+CHAVE = "chave-de-teste"
+
+
+def _medir(chamar, repeticoes: int) -> dict:
+    # `chamar(i)` devolve quantos itens (vagas ou trechos) recebeu; 0 conta como falha
+    tempos, itens, falhas = [], 0, 0
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        quantidade = chamar(i)
+        tempos.append(time.perf_counter() - inicio)
+        itens += quantidade
+        falhas += not quantidade
+    ordenados = sorted(tempos)
+    return {
+        "p50_ms": round(statistics.median(ordenados) * 1000, 2),
+        "p95_ms": round(ordenados[min(len(ordenados) - 1, int(0.95 * len(ordenados)))] * 1000, 2),
+        "vazao": round(itens / sum(tempos), 1),
+        "falhas": falhas,
+    }
+
+
+# --- Cenários ---
+def _busca_terminal(url: str, termos: list, repeticoes: int) -> dict:
+    vagas.BASE_URL = url
+
+    def chamar(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return len(vagas.buscar_e_exibir_vagas(CHAVE, termos[i % len(termos)], "", "brazil", usar_cache=False))
+    return _medir(chamar, repeticoes)
+
+
+def _busca_terminal_com_429(vagas_por_termo: dict, termos: list, repeticoes: int, latencia: float) -> dict:
+    # O limitador deixa sair 15 buscas/s, mas o servidor só aceita 8 por segundo: parte delas
+    # recebe 429 com Retry-After e volta para a fila do limitador
+    originais = limitador.ATIVO, limitador.PERIODO_LIMITE, limitador.FOLGA_SEGUNDOS, limitador.DIRETORIO_ESTADO
+    with tempfile.TemporaryDirectory() as diretorio:
+        limitador.ATIVO, limitador.PERIODO_LIMITE, limitador.FOLGA_SEGUNDOS, limitador.DIRETORIO_ESTADO = True, 1.0, 0.0, diretorio
+        limitador.definir_plano(CHAVE, "pro")
+        try:
+            with ServidorLocal(vagas_por_termo=vagas_por_termo, atraso_resposta=latencia,
+                               limite=8, janela=1.0, retry_after=0.6) as servidor:
+                medida = _busca_terminal(servidor.url, termos, repeticoes)
+                medida["respostas_429"] = servidor.respostas_429
+        finally:
+            limitador.ATIVO, limitador.PERIODO_LIMITE, limitador.FOLGA_SEGUNDOS, limitador.DIRETORIO_ESTADO = originais
+    return medida
+
+
+def _chat(url: str, perguntas: list, repeticoes: int) -> dict:
+    def chamar(i):
+        trechos = []
+        sessao = conversa.SessaoChat(f"{url}/chat", CHAVE, usar_cache=False) # Sem cache: toda pergunta vai à rede
+        with contextlib.redirect_stdout(io.StringIO()):
+            resposta = chat_AI.fazer_requisicao_chat(perguntas[i % len(perguntas)], CHAVE, ao_receber=trechos.append, sessao=sessao)
+        return len(trechos) if resposta and resposta.get("response") else 0
+    return _medir(chamar, repeticoes)
+
+
+def _controles(pagina):
+    import flet as ft
+    vistos = set()
+    pendentes = [controle for chamada in pagina.add.call_args_list for controle in chamada.args] + [pagina.appbar]
+    while pendentes:
+        controle = pendentes.pop()
+        if not isinstance(controle, ft.Control) or id(controle) in vistos:
+            continue
+        vistos.add(id(controle))
+        yield controle
+        for atributo in ("controls", "content", "actions"):
+            filhos = getattr(controle, atributo, None)
+            for filho in (filhos if isinstance(filhos, list) else [filhos]):
+                if isinstance(filho, ft.Control):
+                    filho.parent = controle # O flet define o parent ao enviar a árvore para a tela
+                    pendentes.append(filho)
+
+
+def _sem_erros(chamar):
+    # Roda `chamar` sem imprimir nada; o painel só imprime os erros que trata (ex: "Erro ao trocar de modo")
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        resultado = chamar()
+    erros = [linha for linha in saida.getvalue().splitlines() if "Erro" in linha]
+    if erros:
+        raise SystemExit("ERRO no painel: " + "; ".join(erros))
+    return resultado
+
+
+def _busca_painel(url: str, termos: list, repeticoes: int) -> dict:
+    # Abre o painel numa página simulada (sem janela) e clica em "Buscar Vagas" a cada repetição.
+    # Qualquer erro impresso pelo painel encerra a suíte, em vez de medir uma tela quebrada
+    from unittest import mock
+    import flet as ft
+    import painel
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache_original = cache_buscas._cache_padrao
+        cache_buscas._cache_padrao = cache_buscas.CacheBuscas(os.path.join(diretorio, "cache.sqlite3"))
+        pagina = mock.MagicMock()
+        pagina.window_width, pagina.window_height = 800, 900
+        pagina.add.side_effect = lambda *controles: list(_controles(pagina)) # Liga os parents já no page.add, como o flet
+        laco = asyncio.new_event_loop()
+        try:
+            _sem_erros(lambda: laco.run_until_complete(painel.main(pagina)))
+            modo_busca = next(c for c in _controles(pagina) if isinstance(c, ft.IconButton) and c.tooltip == "Modo Busca de Vagas")
+            _sem_erros(lambda: modo_busca.on_click(None))
+            campos = {c.label: c for c in _controles(pagina) if isinstance(c, ft.TextField)}
+            campos["URL da API (Endpoint de busca)"].value = f"{url}/search_jobs"
+            campos["Sua Chave de API (X-API-Key)"].value = CHAVE
+            campos["País (em inglês, ex: brazil, usa)"].value = "brazil"
+            botao = next(c for c in _controles(pagina) if isinstance(c, ft.ElevatedButton) and c.text == "🚀 Buscar Vagas")
+
+            def chamar(i):
+                cache_buscas.cache_padrao().limpar() # Toda busca vai à rede
+                campos["Título da Vaga (ex: Analista de Dados)"].value = termos[i % len(termos)]
+                _sem_erros(lambda: laco.run_until_complete(botao.on_click(None)))
+                return len(painel.received_jobs)
+            return _medir(chamar, repeticoes)
+        finally:
+            laco.close()
+            cache_buscas._cache_padrao = cache_original
+
+
+# --- Linha de base ---
+def _comparar(resultados: dict, linha_de_base: dict, tolerancia: float) -> list:
+    problemas = []
+    for nome, medida in resultados.items():
+        if medida["falhas"]:
+            problemas.append(f"{nome}: {medida['falhas']} chamada(s) falharam")
+        base = linha_de_base.get(nome)
+        if base is None:
+            continue
+        if medida["p50_ms"] > base["p50_ms"] * (1 + tolerancia) + FOLGA_MS:
+            problemas.append(f"{nome}: p50 de {medida['p50_ms']:.1f} ms (linha de base {base['p50_ms']:.1f} ms)")
+        if medida["vazao"] < base["vazao"] / (1 + tolerancia):
+            problemas.append(f"{nome}: vazão de {medida['vazao']:.0f}/s (linha de base {base['vazao']:.0f}/s)")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de ponta a ponta com linha de base.")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--vagas", type=int, default=200, help="Vagas por resposta do /search_jobs.")
+    parser.add_argument("--latencia", type=float, default=0.02, help="Latência do servidor por requisição (s).")
+    parser.add_argument("--atraso-por-token", type=float, default=0.002, help="Intervalo entre os trechos do /chat (s).")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="Piora aceita em relação à linha de base (0.5 = 50%%).")
+    parser.add_argument("--linha-de-base", default=ARQUIVO_LINHA_DE_BASE)
+    parser.add_argument("--gravar", action="store_true", help="Grava os resultados como a nova linha de base.")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Só o cenário com 429 usa o limitador (com uma cota de teste)
+    por_termo = {termo: ampliar_vagas(lista, args.vagas) for termo, lista in vagas_dos_relatorios().items()}
+    termos = sorted(por_termo)
+    respostas_chat = carregar_respostas_chat()
+    print(f"{args.repeticoes} repetições por cenário, {args.vagas} vagas por busca ({len(termos)} termos dos relatórios), "
+          f"latência de {args.latencia * 1000:.0f} ms:")
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio_arquivo:
+        # As buscas gravam no arquivo local como de costume (arquivo_vagas.py), mas num arquivo temporário
+        arquivo_original = arquivo_vagas._arquivo_padrao
+        arquivo_vagas._arquivo_padrao = arquivo_vagas.ArquivoVagas(os.path.join(diretorio_arquivo, "arquivo.sqlite3"))
+        try:
+            with ServidorLocal(vagas_por_termo=por_termo, atraso_resposta=args.latencia, respostas_chat=respostas_chat,
+                               atraso_por_token=args.atraso_por_token) as servidor:
+                resultados["busca_terminal"] = _busca_terminal(servidor.url, termos, args.repeticoes)
+                resultados["chat"] = _chat(servidor.url, list(respostas_chat), args.repeticoes)
+                resultados["busca_painel"] = _busca_painel(servidor.url, termos, args.repeticoes)
+            resultados["busca_terminal_429"] = _busca_terminal_com_429(por_termo, termos, args.repeticoes, args.latencia)
+            arquivo_vagas.aguardar_gravacoes()
+        finally:
+            arquivo_vagas._arquivo_padrao = arquivo_original
+
+    linha_de_base = {}
+    if os.path.exists(args.linha_de_base):
+        with open(args.linha_de_base, encoding="utf-8") as arquivo:
+            linha_de_base = json.load(arquivo)
+    for nome, medida in resultados.items():
+        base = linha_de_base.get(nome)
+        referencia = f" | base: p50 {base['p50_ms']:7.1f} ms, {base['vazao']:7.0f}/s" if base else ""
+        extra = f" | {medida['respostas_429']} respostas 429" if "respostas_429" in medida else ""
+        print(f"  {nome:<20}: p50 {medida['p50_ms']:7.1f} ms | p95 {medida['p95_ms']:7.1f} ms | "
+              f"{medida['vazao']:7.0f} itens/s{referencia}{extra}")
+
+    if args.gravar:
+        with open(args.linha_de_base, "w", encoding="utf-8") as arquivo:
+            json.dump({nome: {"p50_ms": medida["p50_ms"], "vazao": medida["vazao"]} for nome, medida in resultados.items()},
+                      arquivo, indent=2)
+            arquivo.write("\n")
+        print(f"Linha de base gravada em '{args.linha_de_base}'.")
+        return
+    problemas = _comparar(resultados, linha_de_base, args.tolerancia)
+    if problemas:
+        raise SystemExit("REGRESSÃO: " + "; ".join(problemas))
+    print("Nenhuma regressão em relação à linha de base." if linha_de_base else "Sem linha de base (use --gravar).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara a busca do painel com e sem projeção de campos (projecao.py) e com e sem compressão,
+# contra o servidor local com as vagas reais dos relatórios (sem cópias, que comprimiriam bem demais)
+# e a banda limitada de uma conexão móvel: bytes na rede, tempo até a primeira vaga e até a última.
+# Confere também que o "Ver Mais..." (/job_description) devolve a descrição completa de uma vaga
+# recebida só com a prévia, e que uma busca projetada guardada no cache não responde a uma completa.
+# Uso: python -m benchmarks.bench_projecao [--banda-kbps 2000] [--latencia 0.05]
+
+import argparse
+import os
+import tempfile
+import time
+
+import arquivo_vagas
+import busca_paises
+import cache_buscas
+import limitador
+import projecao
+from benchmarks.servidor_local import ServidorLocal, vagas_dos_relatorios
+
+CHAVE = "chave-de-teste"
+
+
+def _buscar(url: str, termo: str, projetar: bool) -> tuple:
+    inicio = time.perf_counter()
+    primeira = None
+    recebidas = []
+    for evento in busca_paises.buscar_em_paises(url, CHAVE, termo, ["brazil"], usar_cache=False, projetar=projetar):
+        if evento.tipo == "erro":
+            raise SystemExit(f"Falha na busca: {evento.dados}")
+        if evento.tipo == "vaga":
+            if primeira is None:
+                primeira = time.perf_counter() - inicio
+            recebidas.append(evento.dados)
+    return primeira, time.perf_counter() - inicio, recebidas
+
+
+def _conferir_cache_projetado(url: str, termo: str, originais: list):
+    # A mesma busca com e sem projeção, com o cache ligado (num arquivo temporário): a completa tem de ir à rede
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache_original = cache_buscas._cache_padrao
+        cache_buscas._cache_padrao = cache_buscas.CacheBuscas(os.path.join(diretorio, "cache.sqlite3"))
+        try:
+            for projetar in (True, False):
+                eventos = list(busca_paises.buscar_em_paises(url, CHAVE, termo, ["brazil"], usar_cache=True, projetar=projetar))
+        finally:
+            cache_buscas._cache_padrao = cache_original
+    do_cache = any(evento.tipo == "concluido" and evento.dados["cache"] for evento in eventos)
+    descricoes = {job.get("id"): job.get("description") for job in originais}
+    completas = all(descricoes.get(evento.dados.get("id")) == evento.dados.get("description")
+                    for evento in eventos if evento.tipo == "vaga")
+    if do_cache or not completas:
+        raise SystemExit("ERRO: a busca completa foi respondida com a resposta projetada guardada no cache.")
+    print("  cache                      : a busca projetada guardada não responde à busca completa")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da projeção de campos e da compressão das buscas.")
+    parser.add_argument("--banda-kbps", type=float, default=2000.0, help="Banda simulada em kbit/s (2000 = 3G/4G fraco).")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Latência do servidor por requisição (s).")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos a transferência, não o ritmo da cota
+    arquivo_vagas.ATIVO = False # As vagas dos testes não vão para o arquivo local
+    termo = "dados"
+    originais = [vaga for lista in vagas_dos_relatorios().values() for vaga in lista] # Todas numa resposta só
+    print(f"{len(originais)} vagas dos relatórios, banda de {args.banda_kbps:.0f} kbit/s, latência de {args.latencia * 1000:.0f} ms:")
+
+    for comprimir in (False, True):
+        for projetar in (False, True):
+            with ServidorLocal(vagas_por_termo={termo: originais}, atraso_resposta=args.latencia, comprimir=comprimir,
+                               bytes_por_segundo=args.banda_kbps * 1000 / 8) as servidor:
+                primeira, total, recebidas = _buscar(f"{servidor.url}/search_jobs", termo, projetar)
+                nome = f"{'só campos do painel' if projetar else 'vagas completas'}{' + gzip' if comprimir else ''}"
+                print(f"  {nome:<28}: {servidor.bytes_enviados / 1024:8.1f} KB na rede | primeira vaga em {primeira * 1000:7.1f} ms | "
+                      f"todas em {total * 1000:7.1f} ms | {len(recebidas)} vagas")
+                if projetar and comprimir:
+                    cortada = next((job for job in recebidas if projecao.descricao_cortada(job)), None)
+                    if cortada is None:
+                        continue
+                    inicio = time.perf_counter()
+                    descricao = projecao.buscar_descricao(f"{servidor.url}/search_jobs", CHAVE, cortada)
+                    original = next(job for job in originais if job.get("id") == cortada.get("id"))
+                    print(f"  descrição sob demanda       : {(time.perf_counter() - inicio) * 1000:7.1f} ms | "
+                          f"{len(descricao)} caracteres | {'igual à original' if descricao == original['description'] else 'DIFERENTE da original'}")
+
+    with ServidorLocal(vagas_por_termo={termo: originais}) as servidor:
+        _conferir_cache_projetado(f"{servidor.url}/search_jobs", termo, originais)
+
+
+if __name__ == "__main__":
+    main()
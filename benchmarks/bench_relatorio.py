@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede quanto tempo o relatorio.py leva para renderizar muitas vagas direto para um arquivo.
+# Uso: python -m benchmarks.bench_relatorio [--vagas 100000]
+
+import argparse
+import os
+import tempfile
+import time
+
+import relatorio
+from benchmarks.servidor_local import gerar_vagas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do motor de relatórios.")
+    parser.add_argument("--vagas", type=int, default=100000)
+    args = parser.parse_args()
+
+    jobs = gerar_vagas(args.vagas, tamanho_descricao=1500)
+    # Variedade nas unidades e datas para exercitar todos os formatadores
+    unidades = ["monthly", "yearly", "hourly", "daily", "weekly", None]
+    for i, job in enumerate(jobs):
+        job["salary_unit"] = unidades[i % len(unidades)]
+        job["salary_yearly"] = 30000.0 + i if i % 3 == 0 else None
+        job["date_posted"] = f"2025-06-{1 + i % 28:02d}"
+
+    print(f"Renderizando {len(jobs)} vagas:")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for formato in relatorio.FORMATOS:
+            caminho = os.path.join(diretorio, f"relatorio.{formato}")
+            inicio = time.perf_counter()
+            relatorio.gerar_relatorio(jobs, caminho, formato)
+            duracao = time.perf_counter() - inicio
+            tamanho = os.path.getsize(caminho) / (1024 * 1024)
+            print(f"  {formato:>4}: {duracao:6.2f}s | {len(jobs) / duracao:9.0f} vagas/s | {tamanho:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
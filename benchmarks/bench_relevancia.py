@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede o índice de relevância (relevancia.py) com dezenas de milhares de vagas sintéticas:
+# tempo para montar o índice, tempo por consulta na matriz esparsa do NumPy e o mesmo BM25
+# calculado vaga a vaga em Python puro (conferindo que as pontuações são iguais).
+# Uso: python -m benchmarks.bench_relevancia [--vagas 30000] [--consultas 20]
+
+import argparse
+import math
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+import relevancia
+
+PALAVRAS = ("analista dados python sql engenheiro software desenvolvedor backend frontend motorista entregas "
+            "logística armazém freelance designer marketing vendas suporte cliente financeiro contador "
+            "enfermeiro professor pesquisador cientista nuvem segurança redes gerente projeto produto "
+            "júnior sênior estágio remoto híbrido inglês espanhol excel power bi java react node").split()
+CONSULTAS = ("Analista de Dados", "Freelance", "Python Developer", "Motorista de entregas", "Engenheiro de Software Sênior")
+
+
+def gerar_vagas(quantidade: int, semente: int = 7) -> list:
+    gerador = random.Random(semente)
+    return [{
+        "title": " ".join(gerador.choices(PALAVRAS, k=gerador.randint(2, 5))),
+        "skills": gerador.sample(PALAVRAS, k=gerador.randint(0, 6)),
+        "description": " ".join(gerador.choices(PALAVRAS, k=gerador.randint(40, 400))),
+    } for _ in range(quantidade)]
+
+
+def _bm25_python(documentos: list, consulta: str) -> list:
+    # O mesmo BM25 do relevancia.py, vaga a vaga, com os termos já contados em dicionários
+    total = len(documentos)
+    tamanhos = [sum(documento.values()) for documento in documentos]
+    media = (sum(tamanhos) / total) or 1.0
+    pontos = [0.0] * total
+    for termo in set(relevancia.tokenizar(consulta)):
+        com_termo = sum(1 for documento in documentos if termo in documento)
+        if not com_termo:
+            continue
+        idf = math.log(1 + (total - com_termo + 0.5) / (com_termo + 0.5))
+        for posicao, documento in enumerate(documentos):
+            frequencia = documento.get(termo)
+            if frequencia:
+                normalizacao = relevancia.K1 * (1 - relevancia.B + relevancia.B * tamanhos[posicao] / media)
+                pontos[posicao] += idf * frequencia * (relevancia.K1 + 1) / (frequencia + normalizacao)
+    return pontos
+
+
+def _contar_termos(job: dict) -> Counter:
+    contagem = Counter()
+    for campo, peso in relevancia.PESOS_CAMPOS.items():
+        for termo in relevancia.tokenizar(job.get(campo)):
+            contagem[termo] += peso
+    return contagem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de relevância (BM25).")
+    parser.add_argument("--vagas", type=int, default=30000)
+    parser.add_argument("--consultas", type=int, default=20)
+    args = parser.parse_args()
+
+    jobs = gerar_vagas(args.vagas)
+    consultas = [CONSULTAS[i % len(CONSULTAS)] for i in range(args.consultas)]
+    print(f"{args.vagas} vagas, {args.consultas} consultas:")
+
+    inicio = time.perf_counter()
+    indice = relevancia.IndiceRelevancia.das_vagas(jobs)
+    tokenizacao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    indice.pontuar("") # Consolida a matriz
+    consolidacao = time.perf_counter() - inicio
+    print(f"  montar o índice         : {tokenizacao * 1000:8.1f} ms de tokenização + {consolidacao * 1000:6.1f} ms da matriz")
+
+    inicio = time.perf_counter()
+    resultados = [indice.pontuar(consulta) for consulta in dict.fromkeys(consultas)]
+    for consulta in consultas: # Consultas repetidas também recalculam (a memória guarda só a última)
+        indice.pontuar(consulta + " ")
+    numpy_ms = (time.perf_counter() - inicio) * 1000 / (len(set(consultas)) + len(consultas))
+    print(f"  NumPy (matriz esparsa)  : {numpy_ms:8.2f} ms por consulta")
+
+    documentos = [_contar_termos(job) for job in jobs]
+    inicio = time.perf_counter()
+    referencias = [_bm25_python(documentos, consulta) for consulta in dict.fromkeys(consultas)]
+    python_ms = (time.perf_counter() - inicio) * 1000 / len(referencias)
+    print(f"  Python puro (vaga a vaga): {python_ms:8.2f} ms por consulta (termos já contados)")
+
+    iguais = all(np.allclose(resultado, referencia) for resultado, referencia in zip(resultados, referencias))
+    print(f"  pontuações iguais       : {'sim' if iguais else 'NÃO'} | {python_ms / numpy_ms:.0f}x mais rápido")
+    relevantes = indice.filtrar(CONSULTAS[0])
+    print(f"  '{CONSULTAS[0]}': {len(relevantes)} de {args.vagas} vagas com relevância >= {relevancia.LIMIAR_PADRAO}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede a camada de resiliência do cliente_api.py (resiliencia.py) contra o servidor local:
+#   - cauda de latência: uma fração das buscas demora muito mais; p50/p95/p99 sem e com a
+#     duplicação de chamadas lentas (e quantas duplicatas saíram);
+#   - erros 5xx: buscas que terminam bem sem e com a repetição com espera exponencial;
+#   - API fora do ar: tempo gasto por chamada sem e com o disjuntor.
+# Uso: python -m benchmarks.bench_resiliencia [--buscas 200]
+
+import argparse
+import statistics
+import time
+
+import cliente_api
+import limitador
+import resiliencia
+from benchmarks.servidor_local import ServidorLocal, gerar_vagas
+
+PAYLOAD = {"search_term": "Dados", "country": "portugal"}
+
+
+def _buscar(url: str) -> tuple:
+    # Uma busca completa: (segundos, terminou bem?)
+    inicio = time.perf_counter()
+    try:
+        response = cliente_api.post_json(url, PAYLOAD, "chave-de-teste", idempotente=True)
+        sucesso = response.ok
+        response.close()
+    except Exception:
+        sucesso = False
+    return time.perf_counter() - inicio, sucesso
+
+
+def _percentis(tempos: list) -> str:
+    ordenados = sorted(tempos)
+    p = lambda fracao: ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))] * 1000
+    return f"p50 {p(0.50):7.1f} ms | p95 {p(0.95):7.1f} ms | p99 {p(0.99):7.1f} ms | máx {ordenados[-1] * 1000:7.1f} ms"
+
+
+def _medir_cauda(buscas: int) -> None:
+    print(f"Cauda de latência ({buscas} buscas, 2% demoram +1 s):")
+    for nome, duplicar in (("sem duplicação", False), ("com duplicação", True)):
+        resiliencia.reiniciar()
+        resiliencia.DUPLICAR_LENTAS = duplicar
+        with ServidorLocal(vagas=gerar_vagas(5, 200), atraso_resposta=0.02, taxa_lentas=0.02, atraso_lentas=1.0) as servidor:
+            url = f"{servidor.url}/search_jobs"
+            for _ in range(resiliencia.AMOSTRAS_MINIMAS): # Aquece o histórico de latências (p95)
+                _buscar(url)
+            tempos = [_buscar(url)[0] for _ in range(buscas)]
+        estatisticas = resiliencia.estatisticas()
+        print(f"  {nome:<16}: {_percentis(tempos)} | {estatisticas['duplicatas']} duplicatas "
+              f"({estatisticas['duplicatas_vencedoras']} responderam primeiro)")
+
+
+def _medir_erros(buscas: int) -> None:
+    print(f"Erros 5xx ({buscas} buscas, 20% recebem 503):")
+    maximo_original = resiliencia.MAXIMO_TENTATIVAS
+    for nome, tentativas in (("sem repetição", 1), ("com repetição", maximo_original)):
+        resiliencia.reiniciar()
+        resiliencia.MAXIMO_TENTATIVAS = tentativas
+        with ServidorLocal(vagas=gerar_vagas(5, 200), taxa_erro_5xx=0.2) as servidor:
+            url = f"{servidor.url}/search_jobs"
+            resultados = [_buscar(url) for _ in range(buscas)]
+        sucessos = sum(1 for _, sucesso in resultados if sucesso)
+        print(f"  {nome:<16}: {sucessos}/{buscas} buscas terminaram bem | {resiliencia.estatisticas()['repeticoes']} repetições")
+    resiliencia.MAXIMO_TENTATIVAS = maximo_original
+
+
+def _medir_fora_do_ar(chamadas: int) -> None:
+    print(f"API fora do ar ({chamadas} chamadas, cada 503 demora 200 ms):")
+    falhas_original = resiliencia.FALHAS_PARA_ABRIR
+    for nome, falhas_para_abrir in (("sem disjuntor", 10 ** 9), ("com disjuntor", falhas_original)):
+        resiliencia.reiniciar()
+        resiliencia.FALHAS_PARA_ABRIR = falhas_para_abrir
+        with ServidorLocal(atraso_resposta=0.2) as servidor:
+            servidor.fora_do_ar = True
+            url = f"{servidor.url}/search_jobs"
+            inicio = time.perf_counter()
+            tempos = [_buscar(url)[0] for _ in range(chamadas)]
+            total = time.perf_counter() - inicio
+            requisicoes = servidor.requisicoes
+        print(f"  {nome:<16}: {total:6.2f} s no total | mediana {statistics.median(tempos) * 1000:7.1f} ms por chamada | "
+              f"{requisicoes} requisições chegaram ao servidor")
+    resiliencia.FALHAS_PARA_ABRIR = falhas_original
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de repetição, duplicação de chamadas lentas e disjuntor.")
+    parser.add_argument("--buscas", type=int, default=200)
+    parser.add_argument("--chamadas-fora-do-ar", type=int, default=20)
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos a resiliência, não a cota da API
+    duplicar_original = resiliencia.DUPLICAR_LENTAS
+    _medir_cauda(args.buscas)
+    resiliencia.DUPLICAR_LENTAS = duplicar_original
+    _medir_erros(args.buscas)
+    _medir_fora_do_ar(args.chamadas_fora_do_ar)
+    resiliencia.reiniciar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Mede o índice de salários do salarios.py com muitas vagas guardadas:
+#   - normalizar todos os salários e montar o índice (uma vez por lista de vagas);
+#   - "ordenar por salário" e "salário >= X" pelo índice, contra ordenar/filtrar a lista
+#     de vagas em Python a cada consulta (recalculando o salário anual de cada vaga).
+# Também confere que as duas formas devolvem as mesmas vagas.
+# Uso: python -m benchmarks.bench_salarios [--vagas 50000] [--consultas 50]
+
+import argparse
+import random
+import time
+
+import salarios
+from benchmarks.servidor_local import gerar_vagas
+
+UNIDADES = ("hourly", "daily", "weekly", "monthly", "yearly", None)
+LOCALIZACOES = ("Lisboa, 11, PT", "São Paulo, SP, BR", "Austin, TX, US", "London, England, UK", "Remoto")
+
+
+def _variar_salarios(jobs: list, semente: int = 7) -> list:
+    # Unidades, moedas e campos diferentes, e algumas vagas sem salário
+    gerador = random.Random(semente)
+    for job in jobs:
+        job["salary_unit"] = gerador.choice(UNIDADES)
+        job["location"] = gerador.choice(LOCALIZACOES)
+        escala = {"hourly": 30, "daily": 250, "weekly": 1200, "monthly": 4000}.get(job["salary_unit"], 50000)
+        job["salary_from"] = round(escala * gerador.uniform(0.5, 1.5), 2) if gerador.random() < 0.8 else None
+        job["salary_to"] = round(job["salary_from"] * 1.3, 2) if job["salary_from"] and gerador.random() < 0.5 else None
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de salários anuais.")
+    parser.add_argument("--vagas", type=int, default=50000)
+    parser.add_argument("--consultas", type=int, default=50)
+    args = parser.parse_args()
+
+    jobs = _variar_salarios(gerar_vagas(args.vagas, 100))
+    minimos = [random.Random(i).uniform(10000, 80000) for i in range(args.consultas)]
+    print(f"{args.vagas} vagas, {args.consultas} consultas de cada tipo:")
+
+    inicio = time.perf_counter()
+    indice = salarios.IndiceSalarios.das_vagas(jobs)
+    indice.ordenadas()
+    print(f"  normalizar + montar o índice  : {(time.perf_counter() - inicio) * 1000:8.1f} ms ({indice.com_salario} com salário)")
+
+    def so_posicoes():
+        for minimo in minimos:
+            indice.filtrar(minimo)
+            indice.ordenadas()
+
+    def por_indice():
+        for minimo in minimos:
+            salarios.selecionar(jobs, indice.filtrar(minimo))
+            salarios.selecionar(jobs, indice.ordenadas())
+
+    def por_lista():
+        for minimo in minimos:
+            anuais = [(salarios.salario_anual(job), job) for job in jobs]
+            [job for anual, job in anuais if anual is not None and anual >= minimo]
+            sorted((par for par in anuais if par[0] is not None), key=lambda par: -par[0])
+
+    for nome, funcao in (("índice: só as posições", so_posicoes), ("índice + lista de vagas", por_indice),
+                         ("lista em Python a cada vez", por_lista)):
+        inicio = time.perf_counter()
+        funcao()
+        print(f"  {nome:<30}: {(time.perf_counter() - inicio) * 1000 / args.consultas:8.2f} ms por consulta")
+
+    # As duas formas devem devolver as mesmas vagas, na mesma ordem
+    anuais = [salarios.salario_anual(job) for job in jobs]
+    esperado = sorted((posicao for posicao, anual in enumerate(anuais) if anual is not None and anual >= minimos[0]),
+                      key=lambda posicao: -anuais[posicao])
+    if list(indice.filtrar(minimos[0])) != esperado:
+        raise SystemExit("ERRO: o índice devolveu vagas diferentes do filtro em Python.")
+    print("O índice e o filtro em Python devolveram as mesmas vagas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara o tempo até a primeira vaga: response.json() (espera o corpo inteiro, como antes)
+# contra a leitura incremental de json_incremental, com o servidor local enviando uma vaga
+# por vez. Também confere que as duas leituras devolvem exatamente as mesmas vagas.
+# Uso: python -m benchmarks.bench_streaming [--vagas 50] [--atraso-por-vaga 0.02]
+
+import argparse
+import time
+
+import cliente_api
+import json_incremental
+import limitador
+from benchmarks.servidor_local import ServidorLocal, gerar_vagas
+
+PAYLOAD = {"search_term": "Analista de Dados", "location": "Lisboa", "country": "portugal"}
+
+
+def _medir_json_completo(url: str) -> tuple:
+    inicio = time.perf_counter()
+    response = cliente_api.post_json(url, PAYLOAD, "chave-de-teste")
+    response.raise_for_status()
+    jobs = response.json()["jobs"]
+    total = time.perf_counter() - inicio
+    return total, total, jobs # A primeira vaga só existe quando o corpo inteiro chegou
+
+
+def _medir_incremental(url: str) -> tuple:
+    inicio = time.perf_counter()
+    primeira = None
+    jobs = []
+    for job in json_incremental.transmitir_busca(url, PAYLOAD, "chave-de-teste"):
+        if primeira is None:
+            primeira = time.perf_counter() - inicio
+        jobs.append(job)
+    return primeira, time.perf_counter() - inicio, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da leitura incremental do /search_jobs.")
+    parser.add_argument("--vagas", type=int, default=50)
+    parser.add_argument("--tamanho-descricao", type=int, default=4000)
+    parser.add_argument("--atraso-por-vaga", type=float, default=0.02, help="Intervalo simulado entre vagas na rede (s).")
+    args = parser.parse_args()
+
+    limitador.ATIVO = False # Aqui medimos só a leitura da resposta, não a cota da API
+
+    with ServidorLocal(vagas=gerar_vagas(args.vagas, args.tamanho_descricao), atraso_por_vaga=args.atraso_por_vaga) as servidor:
+        url = f"{servidor.url}/search_jobs"
+        cliente_api.pre_conectar(url)
+        print(f"Servidor local em {servidor.url}: {args.vagas} vagas, uma a cada {args.atraso_por_vaga * 1000:.0f} ms")
+
+        resultados = {}
+        for nome, funcao in (("response.json() ", _medir_json_completo), ("json_incremental", _medir_incremental)):
+            primeira, total, jobs = funcao(url)
+            resultados[nome] = jobs
+            print(f"  {nome}: primeira vaga em {primeira * 1000:8.1f} ms | resposta completa em {total * 1000:8.1f} ms | {len(jobs)} vagas")
+
+        if resultados["response.json() "] != resultados["json_incremental"]:
+            raise SystemExit("ERRO: a leitura incremental devolveu vagas diferentes de response.json().")
+        print("As duas leituras devolveram as mesmas vagas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Compara a transformação das vagas para o formato da UI vaga a vaga (laço em Python)
+# com a versão coluna a coluna do transformacao.py, confere que as duas dão o mesmo resultado
+# e mede a exportação em Parquet/CSV/JSONL contra o laço antigo (transformar + json.dumps por linha).
+# Uso: python -m benchmarks.bench_transformacao [--vagas 100000]
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import transformacao
+from benchmarks.servidor_local import gerar_vagas
+
+
+def _variar_vagas(jobs: list) -> list:
+    # Espalha os casos de salário/remoto para exercitar todos os ramos da transformação
+    for i, job in enumerate(jobs):
+        caso = i % 5
+        if caso == 1:
+            job["salary_to"] = None
+        elif caso == 2:
+            job["salary_avg"], job["salary_unit"] = 1800 + i, None
+        elif caso == 3:
+            job["salary_from"] = job["salary_to"] = None
+        elif caso == 4:
+            job["work_from_home_type"], job["title"] = "Remoto", None
+        job["is_remote"] = i % 7 == 0
+    return jobs
+
+
+def _cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da transformação e exportação de vagas.")
+    parser.add_argument("--vagas", type=int, default=100000)
+    parser.add_argument("--tamanho-descricao", type=int, default=300)
+    args = parser.parse_args()
+
+    jobs = _variar_vagas(gerar_vagas(args.vagas, args.tamanho_descricao))
+    transformacao.vagas_para_dataframe(jobs[:1]) # Paga o import do pandas fora da medição
+    print(f"{args.vagas} vagas:")
+
+    tempo_laco, por_vaga = _cronometrar(lambda: [transformacao.transformar_vaga(job) for job in jobs])
+    tempo_tabela, tabela = _cronometrar(lambda: transformacao.transformar_dataframe(transformacao.vagas_para_dataframe(jobs)))
+    print(f"  {'transformação vaga a vaga':<30}: {tempo_laco:6.2f} s")
+    print(f"  {'transformação coluna a coluna':<30}: {tempo_tabela:6.2f} s (incluindo montar o DataFrame)")
+    if tabela.to_dict("records") != [{coluna: job[coluna] for coluna in transformacao.COLUNAS_UI} for job in por_vaga]:
+        raise SystemExit("ERRO: a transformação vetorizada difere da transformação vaga a vaga.")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        def laco_antigo():
+            with open(os.path.join(pasta, "laco.jsonl"), "w", encoding="utf-8") as arquivo:
+                for job in jobs:
+                    arquivo.write(json.dumps(transformacao.transformar_vaga(job).para_dict(), ensure_ascii=False) + "\n")
+
+        tempo_antigo, _ = _cronometrar(laco_antigo)
+        print(f"  {'laço + json.dumps (só a UI)':<30}: {tempo_antigo:6.2f} s")
+        for formato in transformacao.FORMATOS_EXPORTACAO:
+            caminho = os.path.join(pasta, f"vagas.{formato}")
+            try:
+                tempo, _ = _cronometrar(lambda: transformacao.exportar_vagas(jobs, caminho))
+            except RuntimeError as erro: # Parquet sem pyarrow
+                print(f"  {'exportar ' + formato:<30}: {erro}")
+                continue
+            print(f"  {'exportar ' + formato:<30}: {tempo:6.2f} s | {os.path.getsize(caminho) / 1024 / 1024:7.1f} MB")
+
+    print("As duas transformações deram o mesmo resultado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Servidor local que imita os endpoints /search_jobs, /job_description e /chat da API.
+# Usado pelos benchmarks para medir o cliente sem depender da internet.
+# Além das vagas sintéticas, serve as vagas reais dos relatórios "Vagas *.txt" do repositório
+# (reconstruídas pelo importador.py) e respostas fixas do /chat (benchmarks/fixtures/chat.json).
+# Como a API, atende à projeção de campos do painel ("fields" e "description_max_chars", ver projecao.py)
+# e pode comprimir as respostas (gzip, ou br com o pacote brotli instalado).
+
+import glob
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError: # Opcional: sem o pacote, só gzip
+    brotli = None
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_RESPOSTAS_CHAT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "chat.json")
+
+
+def gerar_vagas(quantidade: int, tamanho_descricao: int = 2000) -> list:
+    """
+    Gera vagas sintéticas com os mesmos campos que a API devolve.
+    """
+    vagas = []
+    for i in range(quantidade):
+        vagas.append({
+            "id": f"in-{i:016x}",
+            "site": "indeed" if i % 2 else "linkedin",
+            "job_url": f"https://br.indeed.com/viewjob?jk={i:016x}",
+            "job_url_direct": None,
+            "title": f"Analista de Dados {i}",
+            "company": f"Empresa {i % 50}",
+            "location": "Lisboa, 11, PT",
+            "date_posted": "2025-06-27",
+            "job_type": "fulltime",
+            "salary_from": 1500.0 + i,
+            "salary_to": 2500.0 + i,
+            "salary_unit": "monthly",
+            "salary_avg": None,
+            "salary_hourly": None,
+            "salary_yearly": None,
+            "description": ("Descrição da vaga com requisitos e benefícios. " * (tamanho_descricao // 48 + 1))[:tamanho_descricao],
+            "company_website": None,
+            "company_description": None,
+            "company_num_employees": None,
+            "company_revenue": None,
+            "skills": "SQL, Python",
+            "experience_range": None,
+            "work_from_home_type": None,
+            "company_rating": None,
+            "company_reviews_count": None,
+            "vacancy_count": None,
+            "is_remote": False,
+        })
+    return vagas
+
+
+def vagas_dos_relatorios(caminhos: Optional[Iterable[str]] = None) -> dict:
+    """
+    Reconstrói as respostas do /search_jobs a partir dos relatórios "Vagas *.txt" e do Freelance.txt:
+    {termo buscado em minúsculas: [vagas com os campos da API]}.
+    """
+    import importador # Import local: só os benchmarks que usam os relatórios pagam a leitura
+    if caminhos is None:
+        caminhos = sorted(glob.glob(os.path.join(RAIZ_REPOSITORIO, "Vagas *.txt"))) + [os.path.join(RAIZ_REPOSITORIO, "Freelance.txt")]
+    por_termo = {}
+    for vaga in importador.importar_arquivos(caminhos):
+        termo = (vaga.get("busca_termo") or "").casefold()
+        por_termo.setdefault(termo, []).append({campo: valor for campo, valor in vaga.items() if campo not in importador.CAMPOS_EXTRAS})
+    return por_termo
+
+
+def ampliar_vagas(vagas: list, quantidade: int) -> list:
+    """
+    Repete as vagas até chegar a `quantidade` (para simular respostas maiores). Cada cópia junta a
+    descrição de duas vagas diferentes e ganha id/link próprios, para não ser descartada como repetida.
+    """
+    ampliadas = []
+    for numero in range(quantidade):
+        rodada, posicao = divmod(numero, len(vagas))
+        vaga = dict(vagas[posicao])
+        if rodada:
+            parceira = vagas[(posicao + rodada) % len(vagas)]
+            vaga["id"] = f"{vaga.get('id')}-{rodada}"
+            vaga["job_url"] = f"{vaga.get('job_url')}&copia={rodada}"
+            vaga["title"] = f"{vaga.get('title')} ({rodada + 1})"
+            vaga["description"] = f"{vaga.get('description') or ''}\n\n{parceira.get('description') or ''}"
+        ampliadas.append(vaga)
+    return ampliadas
+
+
+def projetar_vagas(vagas: list, campos: Optional[Iterable[str]] = None, tamanho_descricao: Optional[int] = None) -> list:
+    """
+    Aplica a projeção pedida na busca: só os `campos` listados e a descrição cortada em
+    `tamanho_descricao` caracteres (com "description_truncated": true nas vagas cortadas).
+    """
+    if not campos and not tamanho_descricao:
+        return vagas
+    projetadas = []
+    for vaga in vagas:
+        projetada = {campo: vaga[campo] for campo in campos if campo in vaga} if campos else dict(vaga)
+        descricao = projetada.get("description")
+        if tamanho_descricao and isinstance(descricao, str) and len(descricao) > tamanho_descricao:
+            projetada["description"] = descricao[:tamanho_descricao]
+            projetada["description_truncated"] = True
+        projetadas.append(projetada)
+    return projetadas
+
+
+class _Compressor:
+    # Comprime um corpo em blocos: cada bloco sai completo (sync flush), para o cliente ler em streaming
+    def __init__(self, codificacao: Optional[str]):
+        self.codificacao = codificacao
+        if codificacao == "gzip":
+            self._zlib = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif codificacao == "br":
+            self._brotli = brotli.Compressor(quality=5)
+
+    def bloco(self, dados: bytes) -> bytes:
+        if self.codificacao == "gzip":
+            return self._zlib.compress(dados) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        if self.codificacao == "br":
+            return self._brotli.process(dados) + self._brotli.flush()
+        return dados
+
+    def fim(self) -> bytes:
+        if self.codificacao == "gzip":
+            return self._zlib.flush()
+        if self.codificacao == "br":
+            return self._brotli.finish()
+        return b""
+
+
+def carregar_respostas_chat(caminho: str = ARQUIVO_RESPOSTAS_CHAT) -> dict:
+    """
+    Respostas fixas do /chat: {pergunta em minúsculas: resposta}.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        return {pergunta.casefold(): resposta for pergunta, resposta in json.load(arquivo).items()}
+
+
+class ServidorLocal:
+    """
+    Sobe um ThreadingHTTPServer numa porta livre de 127.0.0.1.
+
+    `atraso_conexao` simula o custo de abrir uma conexão nova (DNS + handshake TLS),
+    pago uma vez por socket; `atraso_resposta` é pago em toda requisição.
+    Com `limite` definido, responde 429 quando uma chave passa de `limite`
+    requisições em qualquer janela deslizante de `janela` segundos, como a API real.
+    Com `atraso_por_vaga` o /search_jobs é enviado em blocos (Transfer-Encoding: chunked),
+    uma vaga a cada `atraso_por_vaga` segundos, como uma resposta grande chegando aos poucos.
+    Com `atraso_por_token` o /chat responde em streaming quando o cliente pede ("stream": true),
+    uma palavra a cada `atraso_por_token` segundos, no `formato_chat` 'sse', 'ndjson' ou 'texto';
+    com `cortar_chat` a conexão fecha sem o evento final ([DONE] / {"done": true}), como uma queda no meio.
+    `atraso_por_kb` é pago por KB do corpo de cada requisição (ex: um contexto de chat que só cresce).
+    Falhas simuladas: uma fração `taxa_erro_5xx` das requisições recebe 503, uma fração `taxa_lentas`
+    demora `atraso_lentas` segundos a mais (cauda de latência) e com `fora_do_ar` todas recebem 503.
+    `atraso_por_pais` ({país: segundos}) atrasa as buscas de cada país, como países mais lentos de raspar.
+    `vagas_por_termo` ({termo em minúsculas: vagas}, ex: vagas_dos_relatorios()) escolhe as vagas pelo
+    search_term (as demais buscas recebem `vagas`); `respostas_chat` ({pergunta em minúsculas: resposta})
+    faz o mesmo com o /chat. `retry_after` é enviado no cabeçalho Retry-After das respostas 429.
+    `corpos_por_termo` ({termo em minúsculas: bytes}) responde a essas buscas com 200 e o corpo cru
+    (ex: um JSON inválido ou que não é um objeto).
+    Com `comprimir` as respostas saem com gzip (ou br, se o cliente aceitar e o brotli estiver instalado);
+    `bytes_por_segundo` limita a banda de cada resposta, como uma conexão móvel lenta.
+    `bytes_enviados` soma os corpos das respostas como saíram na rede (já comprimidos).
+    """
+
+    def __init__(self, vagas: list = None, atraso_conexao: float = 0.0, atraso_resposta: float = 0.0,
+                 limite: int = None, janela: float = 60.0, atraso_por_vaga: float = None,
+                 resposta_chat: str = None, atraso_por_token: float = None, formato_chat: str = "sse",
+                 atraso_por_kb: float = 0.0, taxa_erro_5xx: float = 0.0, taxa_lentas: float = 0.0,
+                 atraso_lentas: float = 0.0, fora_do_ar: bool = False, semente: int = 1,
+                 atraso_por_pais: dict = None, vagas_por_termo: dict = None, respostas_chat: dict = None,
+                 retry_after: float = None, comprimir: bool = False, bytes_por_segundo: float = None,
+                 cortar_chat: bool = False, corpos_por_termo: dict = None):
+        self.vagas = vagas if vagas is not None else gerar_vagas(20)
+        self.atraso_conexao = atraso_conexao
+        self.atraso_resposta = atraso_resposta
+        self.atraso_por_vaga = atraso_por_vaga
+        self.resposta_chat = resposta_chat
+        self.atraso_por_token = atraso_por_token
+        self.formato_chat = formato_chat
+        self.cortar_chat = cortar_chat
+        self.atraso_por_kb = atraso_por_kb
+        self.taxa_erro_5xx = taxa_erro_5xx
+        self.taxa_lentas = taxa_lentas
+        self.atraso_lentas = atraso_lentas
+        self.fora_do_ar = fora_do_ar
+        self.atraso_por_pais = atraso_por_pais or {}
+        self.vagas_por_termo = vagas_por_termo or {}
+        self.respostas_chat = respostas_chat or {}
+        self.corpos_por_termo = corpos_por_termo or {}
+        self.retry_after = retry_after
+        self.comprimir = comprimir
+        self.bytes_por_segundo = bytes_por_segundo
+        self._descricoes = None # {id ou link: descrição}, montado no primeiro /job_description
+        self._sorteio = random.Random(semente)
+        self.limite = limite
+        self.janela = janela
+        self.conexoes_abertas = 0
+        self.requisicoes = 0
+        self.respostas_429 = 0
+        self.bytes_recebidos = 0 # Soma dos corpos das requisições
+        self.bytes_enviados = 0
+        self._historico_por_chave = {}
+        self._trava = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._criar_handler())
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    def _dentro_do_limite(self, api_key: str) -> bool:
+        if self.limite is None:
+            return True
+        agora = time.monotonic()
+        with self._trava:
+            historico = [t for t in self._historico_por_chave.get(api_key, []) if agora - t < self.janela]
+            if len(historico) >= self.limite:
+                self._historico_por_chave[api_key] = historico
+                self.respostas_429 += 1
+                return False
+            historico.append(agora)
+            self._historico_por_chave[api_key] = historico
+            return True
+
+    def descricao(self, id_vaga: Optional[str], link: Optional[str]) -> Optional[str]:
+        with self._trava:
+            if self._descricoes is None:
+                self._descricoes = {}
+                for vaga in [*self.vagas, *(vaga for lista in self.vagas_por_termo.values() for vaga in lista)]:
+                    for chave in (vaga.get("id"), vaga.get("job_url")):
+                        if chave:
+                            self._descricoes.setdefault(chave, vaga.get("description"))
+        return self._descricoes.get(id_vaga) if id_vaga in self._descricoes else self._descricoes.get(link)
+
+    @property
+    def url(self) -> str:
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Permite keep-alive
+            disable_nagle_algorithm = True # Evita o atraso de ACK em respostas pequenas
+
+            def setup(self):
+                super().setup()
+                with servidor._trava:
+                    servidor.conexoes_abertas += 1
+                if servidor.atraso_conexao:
+                    time.sleep(servidor.atraso_conexao)
+
+            def log_message(self, *args):
+                pass # Silencia o log padrão no stderr
+
+            def _codificacao(self) -> Optional[str]:
+                if not servidor.comprimir:
+                    return None
+                aceitas = {item.split(";")[0].strip() for item in self.headers.get("Accept-Encoding", "").split(",")}
+                if "br" in aceitas and brotli is not None:
+                    return "br"
+                return "gzip" if "gzip" in aceitas else None
+
+            def _escrever(self, dados: bytes):
+                with servidor._trava:
+                    servidor.bytes_enviados += len(dados)
+                if not servidor.bytes_por_segundo:
+                    self.wfile.write(dados)
+                    return
+                for inicio in range(0, len(dados), 16384): # Em pedaços, no ritmo da banda simulada
+                    pedaco = dados[inicio:inicio + 16384]
+                    time.sleep(len(pedaco) / servidor.bytes_por_segundo)
+                    self.wfile.write(pedaco)
+                    self.wfile.flush()
+
+            def _responder(self, status: int, corpo: dict, cabecalhos: dict = None):
+                compressor = _Compressor(self._codificacao())
+                dados = compressor.bloco(json.dumps(corpo).encode("utf-8")) + compressor.fim()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if compressor.codificacao:
+                    self.send_header("Content-Encoding", compressor.codificacao)
+                for nome, valor in (cabecalhos or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self._escrever(dados)
+
+            def _enviar_bloco(self, dados: bytes):
+                if dados:
+                    self._escrever(f"{len(dados):X}\r\n".encode("ascii") + dados + b"\r\n")
+                    self.wfile.flush()
+
+            def _responder_vagas_em_blocos(self, vagas: list):
+                compressor = _Compressor(self._codificacao())
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if compressor.codificacao:
+                    self.send_header("Content-Encoding", compressor.codificacao)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self._enviar_bloco(compressor.bloco(f'{{"count": {len(vagas)}, "jobs": ['.encode("utf-8")))
+                for indice, vaga in enumerate(vagas):
+                    time.sleep(servidor.atraso_por_vaga)
+                    self._enviar_bloco(compressor.bloco(((", " if indice else "") + json.dumps(vaga)).encode("utf-8")))
+                self._enviar_bloco(compressor.bloco(b"]}") + compressor.fim())
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _responder_chat_em_blocos(self, resposta: str):
+                tipos = {"sse": "text/event-stream", "ndjson": "application/x-ndjson", "texto": "text/plain; charset=utf-8"}
+                self.send_response(200)
+                self.send_header("Content-Type", tipos[servidor.formato_chat])
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                palavras = resposta.split(" ")
+                for indice, palavra in enumerate(palavras):
+                    if indice:
+                        time.sleep(servidor.atraso_por_token)
+                    token = palavra if indice == 0 else " " + palavra
+                    if servidor.formato_chat == "sse":
+                        evento = f"data: {json.dumps({'token': token}, ensure_ascii=False)}\n\n"
+                    elif servidor.formato_chat == "ndjson":
+                        evento = json.dumps({"token": token}, ensure_ascii=False) + "\n"
+                    else:
+                        evento = token
+                    self._enviar_bloco(evento.encode("utf-8"))
+                fim = {"sse": b"data: [DONE]\n\n", "ndjson": b'{"done": true}\n'}.get(servidor.formato_chat)
+                if fim and not servidor.cortar_chat:
+                    self._enviar_bloco(fim)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _ler_corpo(self) -> dict:
+                tamanho = int(self.headers.get("Content-Length") or 0)
+                with servidor._trava:
+                    servidor.bytes_recebidos += tamanho
+                if servidor.atraso_por_kb:
+                    time.sleep(servidor.atraso_por_kb * tamanho / 1024)
+                if not tamanho:
+                    return {}
+                try:
+                    return json.loads(self.rfile.read(tamanho))
+                except ValueError:
+                    return {}
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                corpo = self._ler_corpo()
+                with servidor._trava:
+                    servidor.requisicoes += 1
+                if not servidor._dentro_do_limite(self.headers.get("X-API-Key", "")):
+                    cabecalhos = {"Retry-After": str(servidor.retry_after)} if servidor.retry_after is not None else None
+                    self._responder(429, {"detail": "Muitas requisições. Tente novamente mais tarde."}, cabecalhos)
+                    return
+                with servidor._trava:
+                    sorteio_erro, sorteio_lenta = servidor._sorteio.random(), servidor._sorteio.random()
+                if servidor.fora_do_ar or sorteio_erro < servidor.taxa_erro_5xx:
+                    self._responder(503, {"detail": "Serviço temporariamente indisponível."})
+                    return
+                if sorteio_lenta < servidor.taxa_lentas:
+                    time.sleep(servidor.atraso_lentas)
+                if servidor.atraso_resposta:
+                    time.sleep(servidor.atraso_resposta)
+                caminho = self.path.rstrip("/").split("/")[-1]
+                if caminho == "search_jobs" and servidor.atraso_por_pais.get(corpo.get("country")):
+                    time.sleep(servidor.atraso_por_pais[corpo["country"]])
+                termo = str(corpo.get("search_term") or "").casefold()
+                if caminho == "search_jobs" and termo in servidor.corpos_por_termo:
+                    dados = servidor.corpos_por_termo[termo]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(dados)))
+                    self.end_headers()
+                    self._escrever(dados)
+                    return
+                vagas = servidor.vagas_por_termo.get(termo, servidor.vagas)
+                vagas = projetar_vagas(vagas, corpo.get("fields"), corpo.get("description_max_chars"))
+                if caminho == "search_jobs" and servidor.atraso_por_vaga is not None:
+                    self._responder_vagas_em_blocos(vagas)
+                elif caminho == "search_jobs":
+                    self._responder(200, {"count": len(vagas), "jobs": vagas})
+                elif caminho == "job_description":
+                    descricao = servidor.descricao(corpo.get("id"), corpo.get("job_url"))
+                    if descricao is None:
+                        self._responder(404, {"detail": "Vaga não encontrada."})
+                    else:
+                        self._responder(200, {"id": corpo.get("id"), "description": descricao})
+                elif caminho == "chat":
+                    resposta = (servidor.respostas_chat.get(str(corpo.get("message") or "").casefold())
+                                or servidor.resposta_chat or f"Resposta local para: {corpo.get('message', '')}")
+                    if corpo.get("stream") and servidor.atraso_por_token is not None:
+                        self._responder_chat_em_blocos(resposta)
+                    else:
+                        self._responder(200, {"response": resposta})
+                else:
+                    self._responder(404, {"detail": "Endpoint não encontrado."})
+
+        return Handler
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
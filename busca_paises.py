@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Busca de um mesmo termo em vários países ao mesmo tempo (fan-out).
+#
+# Cada país é uma chamada ao /search_jobs, feita em paralelo (até `concorrencia` de uma vez)
+# e no ritmo do limitador da chave. As vagas de todos os países chegam por uma única fila,
+# são deduplicadas (a mesma vaga remota costuma aparecer em vários países) e entregues
+# assim que chegam: as primeiras aparecem quando o país mais rápido responde, não o mais lento.
+# Países já buscados recentemente saem do cache local, sem gastar a cota. As vagas recebidas da
+# API entram no arquivo local (arquivo_vagas.py), usado pela busca offline.
+#
+# Uso: python busca_paises.py "Analista de Dados" --paises portugal,spain,brazil
+#      python busca_paises.py "Python Developer" --paises todos --remoto Remoto
+
+import argparse
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+import requests
+
+import arquivo_vagas
+import cache_buscas
+import deduplicacao
+import json_incremental
+import projecao
+
+# Países aceitos pela API (ver IMPORTANTE.txt), com os nomes em inglês que o /search_jobs espera
+PAISES_SUPORTADOS = (
+    "argentina", "australia", "austria", "bahrain", "belgium", "brazil", "canada", "chile", "china",
+    "colombia", "costa rica", "czech republic", "denmark", "ecuador", "egypt", "finland", "france",
+    "germany", "greece", "hong kong", "hungary", "india", "indonesia", "ireland", "israel", "italy",
+    "japan", "kuwait", "luxembourg", "malaysia", "mexico", "morocco", "netherlands", "new zealand",
+    "nigeria", "norway", "oman", "pakistan", "panama", "peru", "philippines", "poland", "portugal",
+    "qatar", "romania", "saudi arabia", "singapore", "south africa", "south korea", "spain", "sweden",
+    "switzerland", "taiwan", "thailand", "turkey", "ukraine", "united arab emirates", "uk", "usa",
+    "uruguay", "venezuela", "vietnam",
+)
+TODOS = ("todos", "all", "*") # Valores que significam "todos os países suportados"
+CONCORRENCIA_PADRAO = 6
+
+
+class EventoPais(NamedTuple):
+    """
+    Um acontecimento da busca: tipo 'vaga' (dados = a vaga), 'concluido'
+    (dados = {'vagas': recebidas, 'cache': bool}) ou 'erro' (dados = mensagem).
+    """
+    pais: str
+    tipo: str
+    dados: object
+
+
+def resolver_paises(paises: Union[str, Iterable[str]]) -> list:
+    """
+    Aceita 'portugal, spain', uma lista de nomes ou 'todos' e devolve os países em minúsculas,
+    sem repetições e na ordem dada. Nomes fora de PAISES_SUPORTADOS são mantidos (a API decide).
+    """
+    if isinstance(paises, str):
+        paises = paises.split(",")
+    nomes = [" ".join(str(pais).split()).lower() for pais in paises]
+    if any(nome in TODOS for nome in nomes):
+        return list(PAISES_SUPORTADOS)
+    return list(dict.fromkeys(nome for nome in nomes if nome))
+
+
+def descrever_erro(erro: Exception) -> str:
+    """
+    Mensagem curta para a falha de um país (HTTP, conexão ou resposta inválida).
+    """
+    if isinstance(erro, requests.exceptions.HTTPError):
+        try:
+            detalhe = erro.response.json().get("detail", erro.response.text)
+        except json.JSONDecodeError:
+            detalhe = erro.response.text
+        return f"Erro HTTP {erro.response.status_code} da API: {detalhe}"
+    if isinstance(erro, requests.exceptions.RequestException):
+        return f"Erro de Conexão com a API: {erro}"
+    return f"Resposta da API inválida: {erro}"
+
+
+def buscar_em_paises(url: str, api_key: str, termo: str, paises: Union[str, Iterable[str]],
+                     localidade: Optional[str] = None, is_remota: Optional[str] = None,
+                     hours_old: Optional[int] = None, concorrencia: int = CONCORRENCIA_PADRAO,
+                     usar_cache: bool = True, deduplicador: Optional[deduplicacao.Deduplicador] = None,
+                     cancelar: Optional[threading.Event] = None,
+                     ao_aguardar: Optional[Callable[[str, float], None]] = None,
+                     projetar: bool = False) -> Iterator[EventoPais]:
+    """
+    Busca `termo` em todos os `paises` em paralelo e devolve os eventos (EventoPais) na ordem em
+    que acontecem. Vagas repetidas entre países (ou já vistas pelo `deduplicador`) não são entregues.
+    `ao_aguardar(pais, segundos)` é chamado quando um país fica na fila do limitador.
+    Parar de consumir o gerador (ou sinalizar `cancelar`) encerra as buscas em andamento.
+    Com `projetar=True` cada vaga vem só com os campos do painel e uma prévia da descrição (ver projecao.py).
+    """
+    paises = resolver_paises(paises)
+    deduplicador = deduplicador or deduplicacao.Deduplicador()
+    fila = queue.Queue()
+    parar = threading.Event()
+    fim_do_pais = object()
+
+    def interrompida() -> bool:
+        return parar.is_set() or (cancelar is not None and cancelar.is_set())
+
+    def buscar_pais(pais: str):
+        payload = {"search_term": termo, "location": localidade, "country": pais,
+                   "is_remote": is_remota, "hours_old": hours_old}
+        if projetar:
+            payload = projecao.payload_projetado(payload)
+        try:
+            if interrompida():
+                return
+            resposta = cache_buscas.cache_padrao().obter(url, payload) if usar_cache else None
+            if resposta is not None:
+                for job in resposta.get("jobs", []):
+                    fila.put(EventoPais(pais, "vaga", job))
+                fila.put(EventoPais(pais, "concluido", {"vagas": len(resposta.get("jobs", [])), "cache": True}))
+                return
+
+            leitor = json_incremental.LeitorVagasIncremental()
+            recebidas = []
+            aguardar = (lambda segundos: ao_aguardar(pais, segundos)) if ao_aguardar else (lambda segundos: None)
+            for job in json_incremental.transmitir_busca(url, payload, api_key, leitor, ao_aguardar=aguardar):
+                if interrompida():
+                    return # Fechar o gerador encerra a conexão em andamento
+                recebidas.append(job)
+                fila.put(EventoPais(pais, "vaga", job))
+            arquivo_vagas.arquivar(recebidas, pais) # Em segundo plano: não atrasa o fim da busca
+            if "jobs" not in leitor.campos:
+                fila.put(EventoPais(pais, "erro", "Resposta da API inválida ou não contém a chave 'jobs'."))
+                return
+            if usar_cache:
+                cache_buscas.cache_padrao().guardar(url, payload, dict(leitor.campos, jobs=recebidas))
+            fila.put(EventoPais(pais, "concluido", {"vagas": len(recebidas), "cache": False}))
+        except (requests.exceptions.RequestException, ValueError) as erro:
+            fila.put(EventoPais(pais, "erro", descrever_erro(erro)))
+        except Exception as erro: # Nunca deixa o consumidor esperando por um país que morreu
+            fila.put(EventoPais(pais, "erro", f"Ocorreu um erro inesperado: {erro}"))
+        finally:
+            fila.put(fim_do_pais)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concorrencia, len(paises))), thread_name_prefix="vagas-pais")
+    try:
+        for pais in paises:
+            executor.submit(buscar_pais, pais)
+        restantes = len(paises)
+        while restantes:
+            evento = fila.get()
+            if evento is fim_do_pais:
+                restantes -= 1
+                continue
+            if cancelar is not None and cancelar.is_set():
+                return
+            if evento.tipo == "vaga" and not deduplicador.e_nova(evento.dados):
+                continue
+            yield evento
+    finally:
+        parar.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    import limitador
+    import vagas
+
+    parser = argparse.ArgumentParser(description="Busca um termo em vários países ao mesmo tempo.")
+    parser.add_argument("termo", help="Termo de busca (ex: 'Analista de Dados').")
+    parser.add_argument("--paises", default="todos", help="Países separados por vírgula ou 'todos' (padrão).")
+    parser.add_argument("--localidade", help="Localidade dentro do país (normalmente vazia numa busca em vários países).")
+    parser.add_argument("--remoto", help="'Remoto', 'Presencial' ou 'Ambos'.")
+    parser.add_argument("--horas", type=int, help="Só vagas publicadas nas últimas N horas.")
+    parser.add_argument("--chave", default=vagas.VALID_FREE_KEY, help="Chave de API (X-API-Key).")
+    parser.add_argument("--plano", choices=list(limitador.LIMITES_POR_PLANO), default=limitador.PLANO_PADRAO,
+                        help="Plano da chave, define o limite de requisições por minuto.")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA_PADRAO, help="Máximo de países buscados ao mesmo tempo.")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="Salva as vagas encontradas em Parquet, CSV ou JSONL.")
+    args = parser.parse_args()
+    limitador.definir_plano(args.chave, args.plano)
+
+    encontradas = vagas.buscar_e_exibir_vagas_em_paises(args.chave, args.termo, args.paises, args.localidade,
+                                                       args.remoto, args.horas, concorrencia=args.concorrencia)
+    if args.exportar:
+        import transformacao # Import local: carrega o pandas só quando a exportação é pedida
+        total = transformacao.exportar_vagas([job for _, job in encontradas], args.exportar)
+        print(f"\n--- {total} vaga(s) exportada(s) para '{args.exportar}' ---")
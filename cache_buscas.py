@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Cache em disco das respostas do /search_jobs.
+#
+# A mesma busca (termo, país, localidade, remoto) é repetida o tempo todo pelo painel e
+# pela linha de comando; com a cota de 4–15 requisições/minuto cada repetição desperdiça
+# uma vaga. O cache guarda a resposta num SQLite local (compartilhado entre processos),
+# com validade derivada de `hours_old`, limite de tamanho com remoção LRU e contadores
+# de acertos/erros.
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+DIRETORIO_CACHE = os.environ.get("VAGAS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "vagas"))
+TAMANHO_MAXIMO_BYTES = 50 * 1024 * 1024 # Tamanho máximo do cache (respostas comprimidas)
+
+# --- Validade (TTL) ---
+# Uma busca pelas vagas das últimas N horas envelhece mais rápido quanto menor for N.
+TTL_MINIMO = 15 * 60       # 'Hoje' (hours_old = 0) ainda vale por 15 minutos
+TTL_MAXIMO = 6 * 60 * 60   # Nenhuma resposta vale por mais de 6 horas
+FRACAO_TTL = 1 / 12        # 72h -> 6h, 24h -> 2h, 6h -> 30min
+
+
+def calcular_ttl(hours_old: Optional[int]) -> float:
+    """
+    Retorna por quantos segundos uma resposta com esse `hours_old` pode ser reaproveitada.
+    """
+    if hours_old is None:
+        return TTL_MAXIMO
+    return min(TTL_MAXIMO, max(TTL_MINIMO, int(hours_old) * 3600 * FRACAO_TTL))
+
+
+def normalizar_payload(payload: dict) -> dict:
+    """
+    Normaliza o payload para que buscas equivalentes ('Lisboa ' e 'lisboa') usem a mesma chave.
+    """
+    def texto(valor):
+        return " ".join(str(valor).split()).lower() if valor not in (None, "") else None
+
+    hours_old = payload.get("hours_old")
+    try:
+        hours_old = int(hours_old) if hours_old not in (None, "") else None
+    except (TypeError, ValueError):
+        hours_old = None
+    normalizado = {
+        "search_term": texto(payload.get("search_term")),
+        "location": texto(payload.get("location")),
+        "country": texto(payload.get("country")),
+        "is_remote": texto(payload.get("is_remote")),
+        "hours_old": hours_old,
+    }
+    # Busca projetada (projecao.py): a resposta traz menos campos e só a prévia da descrição, então não
+    # pode servir a uma busca completa. Só entra quando presente, para não mudar as chaves das buscas completas.
+    if payload.get("fields"):
+        normalizado["fields"] = sorted(payload["fields"])
+    if payload.get("description_max_chars") is not None:
+        normalizado["description_max_chars"] = payload["description_max_chars"]
+    return normalizado
+
+
+def gerar_chave(url: str, payload: dict) -> str:
+    """
+    Chave do cache: hash do endpoint + payload normalizado. A chave de API não entra,
+    pois o resultado de uma busca não depende de quem pergunta.
+    """
+    base = json.dumps([url.rstrip("/"), normalizar_payload(payload)], sort_keys=True)
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+class CacheBuscas:
+    """
+    Cache LRU com validade, guardado num arquivo SQLite. Seguro para várias threads e processos:
+    cada operação abre a própria conexão e o SQLite cuida das travas.
+    """
+
+    def __init__(self, caminho: Optional[str] = None, tamanho_maximo: int = TAMANHO_MAXIMO_BYTES):
+        if caminho is None:
+            os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+            caminho = os.path.join(DIRETORIO_CACHE, "cache_buscas.sqlite3")
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS respostas (
+                    chave TEXT PRIMARY KEY,
+                    dados BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    expira_em REAL NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                )
+            """)
+            conexao.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (ultimo_acesso)")
+            conexao.execute("CREATE TABLE IF NOT EXISTS estatisticas (nome TEXT PRIMARY KEY, valor INTEGER NOT NULL)")
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        try:
+            with conexao: # Confirma a transação (ou desfaz em caso de erro)
+                yield conexao
+        finally:
+            conexao.close()
+
+    @staticmethod
+    def _contar(conexao: sqlite3.Connection, nome: str, quantidade: int = 1):
+        conexao.execute(
+            "INSERT INTO estatisticas (nome, valor) VALUES (?, ?) "
+            "ON CONFLICT(nome) DO UPDATE SET valor = valor + excluded.valor",
+            (nome, quantidade)
+        )
+
+    def obter(self, url: str, payload: dict) -> Optional[dict]:
+        """
+        Retorna a resposta guardada para essa busca, ou None se não houver (ou se já expirou).
+        """
+        chave = gerar_chave(url, payload)
+        agora = time.time()
+        with self._conectar() as conexao:
+            linha = conexao.execute("SELECT dados, expira_em FROM respostas WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                self._contar(conexao, "erros")
+                return None
+            dados, expira_em = linha
+            if expira_em <= agora:
+                conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+                self._contar(conexao, "expirados")
+                self._contar(conexao, "erros")
+                return None
+            conexao.execute("UPDATE respostas SET ultimo_acesso = ? WHERE chave = ?", (agora, chave))
+            self._contar(conexao, "acertos")
+        return json.loads(zlib.decompress(dados))
+
+    def guardar(self, url: str, payload: dict, resposta: dict):
+        """
+        Guarda a resposta da busca e remove as entradas menos usadas se o limite de tamanho for passado.
+        """
+        dados = zlib.compress(json.dumps(resposta, ensure_ascii=False).encode("utf-8"))
+        if len(dados) > self.tamanho_maximo:
+            return # Nunca cabe: não vale a pena apagar o cache inteiro por ela
+        agora = time.time()
+        expira_em = agora + calcular_ttl(normalizar_payload(payload)["hours_old"])
+        with self._conectar() as conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO respostas (chave, dados, tamanho, expira_em, ultimo_acesso) VALUES (?, ?, ?, ?, ?)",
+                (gerar_chave(url, payload), dados, len(dados), expira_em, agora)
+            )
+            self._remover_excesso(conexao, agora)
+
+    def _remover_excesso(self, conexao: sqlite3.Connection, agora: float):
+        removidos = conexao.execute("DELETE FROM respostas WHERE expira_em <= ?", (agora,)).rowcount
+        if removidos:
+            self._contar(conexao, "expirados", removidos)
+        total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        despejados = 0
+        for chave, tamanho in conexao.execute("SELECT chave, tamanho FROM respostas ORDER BY ultimo_acesso").fetchall():
+            if total <= self.tamanho_maximo:
+                break
+            conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+            total -= tamanho
+            despejados += 1
+        self._contar(conexao, "despejados", despejados)
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna acertos, erros, taxa de acerto, entradas e bytes ocupados.
+        """
+        with self._conectar() as conexao:
+            contadores = dict(conexao.execute("SELECT nome, valor FROM estatisticas").fetchall())
+            entradas, tamanho = conexao.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()
+        acertos = contadores.get("acertos", 0)
+        erros = contadores.get("erros", 0)
+        return {
+            "acertos": acertos,
+            "erros": erros,
+            "taxa_acerto": acertos / (acertos + erros) if acertos + erros else 0.0,
+            "expirados": contadores.get("expirados", 0),
+            "despejados": contadores.get("despejados", 0),
+            "entradas": entradas,
+            "bytes": tamanho,
+        }
+
+    def limpar(self):
+        """
+        Apaga todas as respostas e zera as estatísticas.
+        """
+        with self._conectar() as conexao:
+            conexao.execute("DELETE FROM respostas")
+            conexao.execute("DELETE FROM estatisticas")
+
+
+_cache_padrao: Optional[CacheBuscas] = None
+
+
+def cache_padrao() -> CacheBuscas:
+    """
+    Retorna o cache compartilhado por vagas.py e painel.py (criado na primeira chamada).
+    """
+    global _cache_padrao
+    if _cache_padrao is None:
+        _cache_padrao = CacheBuscas()
+    return _cache_padrao
@@ -3,7 +3,10 @@
 
 import requests
 import json
-import time
+import sys
+from typing import Callable, Optional
+
+import conversa # Cache de respostas + contexto compactado, compartilhados com o painel.py
 
 # URL base da sua API
 BASE_URL = "https://minha-api.riberto2006.workers.dev/"
@@ -13,23 +16,28 @@ BASE_URL = "https://minha-api.riberto2006.workers.dev/"
 VALID_CHAT_KEY = "chave-de-teste" # Usando uma chave PRO para garantir acesso total
 
 # --- Função para fazer requisições ao endpoint /chat ---
-def fazer_requisicao_chat(message: str, api_key: str):
+def criar_sessao(api_key: str) -> conversa.SessaoChat:
+    """
+    Cria uma conversa com o /chat (contexto próprio, cache de respostas compartilhado).
+    """
+    return conversa.SessaoChat(f"{BASE_URL.rstrip('/')}/chat", api_key)
+
+def fazer_requisicao_chat(message: str, api_key: str, ao_receber: Optional[Callable[[str], None]] = None,
+                          sessao: Optional[conversa.SessaoChat] = None):
     """
-    Envia uma mensagem para o endpoint /chat da API e retorna a resposta.
+    Envia uma mensagem para o endpoint /chat da API e retorna a resposta ({'response': texto}).
+    A resposta chega em streaming: `ao_receber` é chamado com cada trecho assim que ele chega.
+    'incompleta' é True quando a conexão fechou antes do fim da resposta (texto parcial).
+    Com `sessao`, a pergunta vai com o contexto da conversa; perguntas repetidas saem do cache.
     """
-    headers = {
-        "X-API-Key": api_key,
-        "Content-Type": "application/json"
-    }
-    url = f"{BASE_URL}/chat"
-    payload = {"message": message}
+    sessao = sessao or criar_sessao(api_key)
 
     print(f"\n--- Enviando mensagem para o assistente de IA... ---")
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status() # Levanta um erro para códigos de status HTTP 4xx/5xx
-        return response.json()
+        resposta = sessao.enviar(message, ao_receber=ao_receber)
+        return {"response": resposta or "", "do_cache": sessao.ultima_do_cache, "incompleta": sessao.ultima_incompleta}
     except requests.exceptions.HTTPError as http_err:
+        response = http_err.response
         print(f"\nOops! Algo deu errado na comunicação com o assistente de IA: {http_err}")
         try:
             error_detail = response.json().get('detail', 'Detalhe não disponível.')
@@ -46,33 +54,50 @@ def fazer_requisicao_chat(message: str, api_key: str):
         print(f"\nErro de Timeout: A requisição demorou demais para responder. Detalhe: {timeout_err}")
     except requests.exceptions.RequestException as req_err:
         print(f"\nOcorreu um erro inesperado na requisição: {req_err}")
+    except ValueError as erro_resposta: # Resposta malformada, cortada ou evento de erro do servidor
+        print(f"\nA resposta do assistente de IA foi interrompida: {erro_resposta}")
     return None
 
 # --- Função principal para interagir com a AI ---
 def interagir_com_ai(api_key: str):
     """
     Permite ao usuário digitar mensagens e receber respostas do assistente de IA.
+    A resposta é impressa conforme os tokens chegam.
     """
     print("\n--- Bem-vindo ao Chat com o Assistente de IA! ---")
-    print("Digite sua mensagem ou 'sair' para encerrar.")
+    print("Digite sua mensagem, 'nova' para começar outra conversa ou 'sair' para encerrar.")
+    sessao = criar_sessao(api_key)
 
     while True:
         user_input = input("\nVocê: ")
         if user_input.lower() == 'sair':
             print("Encerrando o chat. Até a próxima!")
             break
+        if user_input.strip().lower() == 'nova':
+            sessao.reiniciar()
+            print("Conversa reiniciada: o assistente não verá as mensagens anteriores.")
+            continue
         
         if not user_input.strip():
             print("Por favor, digite algo para o assistente de IA.")
             continue
 
-        resposta_ai = fazer_requisicao_chat(user_input, api_key)
-        if resposta_ai and 'response' in resposta_ai:
-            print(f"Assistente: {resposta_ai['response']}")
-        else:
+        inicio_impresso = []
+
+        def imprimir_trecho(trecho: str):
+            if not inicio_impresso:
+                sys.stdout.write("Assistente: ")
+                inicio_impresso.append(True)
+            sys.stdout.write(trecho)
+            sys.stdout.flush()
+
+        resposta_ai = fazer_requisicao_chat(user_input, api_key, ao_receber=imprimir_trecho, sessao=sessao)
+        if inicio_impresso:
+            print(" (resposta do cache)" if resposta_ai and resposta_ai["do_cache"] else "") # Termina a linha da resposta
+            if resposta_ai is None or resposta_ai["incompleta"]:
+                print("(A resposta acima ficou incompleta.)")
+        elif not resposta_ai or not resposta_ai['response']:
             print("Assistente: Não foi possível obter uma resposta no momento. Por favor, tente novamente.")
-        
-        time.sleep(1) # Pequena pausa para simular uma interação mais natural
 
 # --- Execução do Script ---
 if __name__ == "__main__":
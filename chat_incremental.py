@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Leitura incremental das respostas do /chat.
+#
+# O cliente pede a resposta em streaming ("stream": true + Accept: text/event-stream) e
+# devolve cada trecho de texto assim que ele chega, para a resposta ir aparecendo na tela
+# em vez de surgir inteira no fim. Formatos aceitos, pelo Content-Type da resposta:
+#   - text/event-stream (SSE): eventos "data: ..." com texto puro ou JSON ({"token": "..."});
+#     "data: [DONE]" encerra e um evento "error" vira ErroChat;
+#   - application/x-ndjson: um JSON por linha, com os mesmos campos ({"done": true} encerra);
+#   - text/plain em blocos (chunked): o próprio texto;
+#   - application/json: a resposta de sempre ({"response": "..."}), entregue de uma vez,
+#     para continuar funcionando com uma API que ainda não transmite.
+
+import codecs
+import json
+import re
+import time
+from typing import Iterable, Iterator, List, Optional
+
+import cliente_api
+import metricas
+from json_incremental import RespostaIncompleta, blocos_da_resposta
+
+FORMATOS = ("sse", "ndjson", "texto", "json")
+ACCEPT_STREAMING = "text/event-stream, application/x-ndjson;q=0.9, application/json;q=0.5"
+
+# Campos, em ordem de preferência, de onde sai o texto de um evento em JSON
+CAMPOS_TEXTO = ("token", "delta", "text", "content", "response")
+
+_RE_QUEBRA = re.compile(r"\r\n|\r|\n") # Quebras de linha do SSE (str.splitlines também quebraria em \u2028 etc.)
+
+
+class ErroChat(ValueError):
+    """
+    O servidor mandou um evento de erro no meio da resposta.
+    """
+
+
+def formato_do_content_type(content_type: Optional[str]) -> str:
+    tipo = (content_type or "").split(";")[0].strip().lower()
+    if tipo == "text/event-stream":
+        return "sse"
+    if tipo in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "ndjson"
+    if tipo.startswith("text/"):
+        return "texto"
+    return "json"
+
+
+def texto_do_evento(dados) -> Optional[str]:
+    """
+    Extrai o texto de um evento já decodificado: uma string, {"token": "..."} (ou delta/text/
+    content/response) ou o formato {"choices": [{"delta": {"content": "..."}}]}.
+    """
+    if isinstance(dados, str):
+        return dados
+    if not isinstance(dados, dict):
+        return None
+    for campo in CAMPOS_TEXTO:
+        valor = dados.get(campo)
+        if isinstance(valor, str):
+            return valor
+        if isinstance(valor, dict): # Ex: {"delta": {"content": "..."}}
+            return texto_do_evento(valor)
+    escolhas = dados.get("choices")
+    if isinstance(escolhas, list) and escolhas:
+        return texto_do_evento(escolhas[0])
+    return None
+
+
+class LeitorChatIncremental:
+    """
+    Analisador em streaming de uma resposta do /chat num dos FORMATOS.
+    Alimente com `alimentar(texto)`; cada chamada devolve os trechos de texto completos.
+    Com `formato=None`, o formato é definido pelo Content-Type em `iterar_trechos_resposta`.
+    `terminada` só fica True quando a resposta chegou inteira: o evento final ([DONE] no SSE,
+    {"done": true} no NDJSON) ou o corpo completo (JSON e texto). `concluido` também fica True
+    quando a conexão fecha antes disso.
+    """
+
+    def __init__(self, formato: Optional[str] = "sse"):
+        if formato is not None and formato not in FORMATOS:
+            raise ValueError(f"Formato de resposta desconhecido: '{formato}'.")
+        self.formato = formato
+        self._buffer = ""
+        self._dados_evento: List[str] = [] # Linhas "data:" do evento SSE em andamento
+        self._tipo_evento = None
+        self.campos = {} # Resposta JSON completa (formato 'json') ou último evento JSON
+        self.concluido = False
+        self.terminada = False
+
+    # --- SSE ---
+    def _despachar_evento(self) -> Optional[str]:
+        dados = "\n".join(self._dados_evento)
+        tipo = self._tipo_evento
+        self._dados_evento, self._tipo_evento = [], None
+        if dados == "[DONE]":
+            self.concluido = self.terminada = True
+            return None
+        try:
+            decodificado = json.loads(dados)
+        except ValueError:
+            decodificado = dados # Texto puro
+        if tipo == "error":
+            detalhe = decodificado.get("detail", dados) if isinstance(decodificado, dict) else dados
+            raise ErroChat(f"O assistente interrompeu a resposta: {detalhe}")
+        if isinstance(decodificado, dict):
+            self.campos = decodificado
+        texto = texto_do_evento(decodificado)
+        return texto if texto is not None else (dados if not isinstance(decodificado, dict) else None)
+
+    def _linha_sse(self, linha: str) -> Optional[str]:
+        if not linha:
+            return self._despachar_evento() if self._dados_evento else None
+        if linha.startswith(":"):
+            return None # Comentário (ex: keep-alive)
+        campo, _, valor = linha.partition(":")
+        if valor.startswith(" "):
+            valor = valor[1:]
+        if campo == "data":
+            self._dados_evento.append(valor)
+        elif campo == "event":
+            self._tipo_evento = valor
+        return None
+
+    # --- NDJSON ---
+    def _linha_ndjson(self, linha: str) -> Optional[str]:
+        if not linha.strip():
+            return None
+        dados = json.loads(linha)
+        if isinstance(dados, dict):
+            if dados.get("done") is True:
+                self.concluido = self.terminada = True
+            if "error" in dados:
+                raise ErroChat(f"O assistente interrompeu a resposta: {dados['error']}")
+            self.campos = dados
+        return texto_do_evento(dados)
+
+    def alimentar(self, texto: str, final: bool = False) -> List[str]:
+        """
+        Acrescenta texto recebido e devolve os trechos de resposta prontos até aqui.
+        Passe `final=True` quando não houver mais dados.
+        """
+        if self.concluido:
+            return []
+        if self.formato == "texto":
+            if final:
+                self.concluido = self.terminada = True # Texto puro não tem evento final: vale o fim do corpo
+            return [texto] if texto else []
+        self._buffer += texto
+        if self.formato == "json":
+            if not final:
+                return [] # Resposta comum: só dá para decodificar com o corpo inteiro
+            self.concluido = True
+            try:
+                self.campos = json.loads(self._buffer)
+            except ValueError:
+                raise RespostaIncompleta("A resposta do assistente não é um JSON válido.")
+            self.terminada = True
+            resposta = texto_do_evento(self.campos)
+            return [resposta] if resposta else []
+
+        trechos = []
+        processar = self._linha_sse if self.formato == "sse" else self._linha_ndjson
+        buffer, retido = self._buffer, ""
+        if not final and buffer.endswith("\r"):
+            buffer, retido = buffer[:-1], "\r" # Pode ser o começo de um "\r\n"
+        linhas = _RE_QUEBRA.split(buffer)
+        # A última linha (sem quebra) ainda pode estar incompleta
+        self._buffer = ("" if final else linhas.pop()) + retido
+        for linha in linhas:
+            trecho = processar(linha)
+            if trecho:
+                trechos.append(trecho)
+            if self.concluido:
+                return trechos
+        if final:
+            if self.formato == "sse" and self._dados_evento:
+                trecho = self._despachar_evento()
+                if trecho:
+                    trechos.append(trecho)
+            self.concluido = True
+        return trechos
+
+
+def iterar_trechos(blocos: Iterable[bytes], leitor: LeitorChatIncremental) -> Iterator[str]:
+    """
+    Recebe blocos de bytes e devolve cada trecho de texto da resposta assim que ele fica completo.
+    """
+    decodificador_utf8 = codecs.getincrementaldecoder("utf-8")()
+    leitura = 0.0 # Só o tempo dentro do leitor, sem o de quem consome os trechos
+    try:
+        for bloco in blocos:
+            if bloco:
+                inicio = time.perf_counter()
+                trechos = leitor.alimentar(decodificador_utf8.decode(bloco))
+                leitura += time.perf_counter() - inicio
+                yield from trechos
+                if leitor.concluido:
+                    return
+        inicio = time.perf_counter()
+        trechos = leitor.alimentar(decodificador_utf8.decode(b"", final=True), final=True)
+        leitura += time.perf_counter() - inicio
+        yield from trechos
+    finally:
+        metricas.observar("vagas_json_segundos", leitura, endpoint="chat")
+
+
+def iterar_trechos_resposta(response, leitor: LeitorChatIncremental = None) -> Iterator[str]:
+    """
+    Atalho para uma resposta do `requests` aberta com stream=True (formato pelo Content-Type).
+    """
+    leitor = leitor or LeitorChatIncremental(None)
+    if leitor.formato is None:
+        leitor.formato = formato_do_content_type(response.headers.get("Content-Type"))
+    return iterar_trechos(blocos_da_resposta(response), leitor)
+
+
+def transmitir_chat(url: str, mensagem: str, api_key: str, payload_extra: Optional[dict] = None,
+                    leitor: Optional[LeitorChatIncremental] = None) -> Iterator[str]:
+    """
+    Envia a mensagem ao /chat pelo pool compartilhado e devolve os trechos da resposta conforme chegam.
+    Passe um `leitor` (ex: LeitorChatIncremental(None)) para consultar `leitor.terminada` no fim.
+    Erros HTTP (4xx/5xx) e de conexão são levantados como exceções do `requests`;
+    resposta malformada ou evento de erro do servidor levantam ValueError (ErroChat).
+    """
+    payload = dict(payload_extra or {}, message=mensagem, stream=True)
+    response = cliente_api.post_json(url, payload, api_key, stream=True, headers={"Accept": ACCEPT_STREAMING})
+    with response:
+        if response.status_code >= 400:
+            response.content # Lê o corpo do erro antes de fechar, para o chamador ver o 'detail'
+        response.raise_for_status()
+        yield from iterar_trechos_resposta(response, leitor)
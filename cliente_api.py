@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Cliente HTTP compartilhado por vagas.py, chat_AI.py e painel.py.
+# Mantém um único pool de conexões keep-alive para que buscas e turnos de chat
+# repetidos não paguem de novo o DNS + handshake TLS a cada chamada.
+# Toda chamada passa pelo limitador da chave e pela camada de resiliência
+# (repetições, duplicação de chamadas lentas e disjuntor; ver resiliencia.py)
+# e tem as etapas medidas em metricas.py (conexão, primeiro byte, download).
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import limitador
+import metricas
+import resiliencia
+
+# --- Configurações de Conexão ---
+TIMEOUT_CONEXAO = 5    # Segundos para abrir a conexão (DNS + TCP + TLS)
+TIMEOUT_LEITURA = 45   # Segundos aguardando dados do servidor
+TAMANHO_POOL = 10      # Conexões mantidas abertas por host
+# Compressões aceitas nas respostas: gzip e deflate sempre; br com o pacote brotli instalado
+# (e zstd com o zstandard). O urllib3 descomprime conforme os bytes chegam, inclusive em streaming.
+ACEITAR_CODIFICACAO = requests.utils.DEFAULT_ACCEPT_ENCODING
+
+_sessao: Optional[requests.Session] = None
+_trava_sessao = threading.Lock()
+_hosts_aquecidos = set()
+_executor: Optional[ThreadPoolExecutor] = None # Threads das chamadas que podem ser duplicadas
+
+
+# --- Conexões medidas: o connect() de cada socket novo vira uma observação de DNS + TCP + TLS ---
+class _ConexaoHTTPMedida(HTTPConnection):
+    def connect(self):
+        with metricas.cronometro("vagas_conexao_segundos", host=self.host):
+            super().connect()
+
+
+class _ConexaoHTTPSMedida(HTTPSConnection):
+    def connect(self):
+        with metricas.cronometro("vagas_conexao_segundos", host=self.host):
+            super().connect()
+
+
+class _PoolHTTPMedido(HTTPConnectionPool):
+    ConnectionCls = _ConexaoHTTPMedida
+
+
+class _PoolHTTPSMedido(HTTPSConnectionPool):
+    ConnectionCls = _ConexaoHTTPSMedida
+
+
+class _AdaptadorMedido(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _PoolHTTPMedido, "https": _PoolHTTPSMedido}
+
+
+def obter_sessao() -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada, criando-a (com o pool de conexões) na primeira chamada.
+    """
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            sessao = requests.Session()
+            adaptador = _AdaptadorMedido(pool_connections=4, pool_maxsize=TAMANHO_POOL)
+            sessao.mount("https://", adaptador)
+            sessao.mount("http://", adaptador)
+            _sessao = sessao
+        return _sessao
+
+
+def fechar_sessao():
+    """
+    Fecha todas as conexões do pool (útil ao encerrar o programa ou em testes).
+    """
+    global _sessao
+    with _trava_sessao:
+        if _sessao is not None:
+            _sessao.close()
+            _sessao = None
+        _hosts_aquecidos.clear()
+
+
+def montar_headers(api_key: str) -> dict:
+    """
+    Monta os cabeçalhos padrão das requisições à API.
+    """
+    return {
+        "X-API-Key": api_key,
+        "Content-Type": "application/json",
+        "Accept-Encoding": ACEITAR_CODIFICACAO,
+    }
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _executor_duplicacao() -> ThreadPoolExecutor:
+    global _executor
+    with _trava_sessao:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TAMANHO_POOL * 4, thread_name_prefix="vagas-http")
+        return _executor
+
+
+def _enviar_uma_vez(metodo: str, url: str, headers: dict, timeout: tuple, **kwargs) -> requests.Response:
+    inicio = time.monotonic()
+    response = obter_sessao().request(metodo, url, headers=headers, timeout=timeout, **kwargs)
+    duracao = time.monotonic() - inicio
+    if response.status_code not in resiliencia.STATUS_REPETIR:
+        resiliencia.latencias.registrar(resiliencia.chave_endpoint(metodo, url), duracao)
+    endpoint = metricas.endpoint_da_url(url)
+    metricas.observar("vagas_requisicao_segundos", duracao, endpoint=endpoint, status=response.status_code)
+    # `elapsed`: do envio até os cabeçalhos. Sem stream, o resto da chamada foi o download do corpo
+    # (com stream o download é medido por quem lê o corpo, em json_incremental.blocos_da_resposta)
+    primeiro_byte = response.elapsed.total_seconds()
+    metricas.observar("vagas_primeiro_byte_segundos", primeiro_byte, endpoint=endpoint)
+    if not kwargs.get("stream"):
+        metricas.observar("vagas_download_segundos", max(0.0, duracao - primeiro_byte), endpoint=endpoint)
+    return response
+
+
+def _fechar_resposta(futuro):
+    if not futuro.cancelled() and futuro.exception() is None:
+        futuro.result().close() # Devolve a conexão ao pool (ou descarta a que ficou no meio)
+
+
+def _enviar_com_duplicata(metodo: str, url: str, api_key: str, headers: dict, timeout: tuple, **kwargs) -> requests.Response:
+    """
+    Envia a chamada e, se ela passar do p95 do endpoint sem responder, uma cópia (se o limitador
+    tiver uma ficha livre). Devolve a primeira resposta que não seja erro 5xx; a outra é fechada
+    quando chegar.
+    """
+    executor = _executor_duplicacao()
+    original = executor.submit(_enviar_uma_vez, metodo, url, headers, timeout, **kwargs)
+    pendentes = {original}
+    atraso = resiliencia.latencias.atraso_duplicacao(resiliencia.chave_endpoint(metodo, url))
+    # Só duplica se a original já saiu (não está só esperando uma thread livre)
+    if not wait(pendentes, timeout=atraso).done and original.running() and limitador.tentar_reservar(api_key):
+        pendentes.add(executor.submit(_enviar_uma_vez, metodo, url, headers, timeout, **kwargs))
+        resiliencia.contar("duplicatas")
+
+    falha = None # Primeira chamada que deu erro, devolvida se nenhuma der certo
+    while pendentes:
+        prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in prontos:
+            if futuro.exception() is None and futuro.result().status_code not in resiliencia.STATUS_REPETIR:
+                if futuro is not original:
+                    resiliencia.contar("duplicatas_vencedoras")
+                for outro in (prontos | pendentes | ({falha} if falha else set())) - {futuro}:
+                    outro.add_done_callback(_fechar_resposta)
+                return futuro.result()
+            if falha is None:
+                falha = futuro
+            else:
+                _fechar_resposta(futuro)
+    return falha.result() # Levanta a exceção ou devolve a resposta 5xx
+
+
+def _pode_tentar_de_novo(tentativa: int, prazo: float) -> bool:
+    return tentativa + 1 < resiliencia.MAXIMO_TENTATIVAS and time.monotonic() < prazo
+
+
+def _enviar(metodo: str, url: str, api_key: str, ao_aguardar: Optional[Callable[[float], None]] = None,
+            timeout: Optional[tuple] = None, headers: Optional[dict] = None, idempotente: bool = False,
+            **kwargs) -> requests.Response:
+    """
+    Passa pelo disjuntor do host e pelo limitador de requisições da chave e envia a requisição pelo pool.
+    - 429: o limitador é ajustado e a requisição volta para a fila uma única vez;
+    - 5xx e falhas de conexão (e timeouts, se `idempotente`): a requisição é repetida após uma
+      espera exponencial aleatória, até resiliencia.MAXIMO_TENTATIVAS vezes (cada vez conta na cota);
+    - `idempotente` e mais lenta que o p95 do endpoint: uma duplicata pode ser enviada.
+    Com o host fora do ar, levanta resiliencia.CircuitoAberto sem ir à rede.
+    """
+    timeout = timeout or (TIMEOUT_CONEXAO, TIMEOUT_LEITURA)
+    headers = dict(montar_headers(api_key), **(headers or {}))
+    disjuntor = resiliencia.disjuntor_para(url)
+    duplicar = idempotente and resiliencia.DUPLICAR_LENTAS
+    prazo = time.monotonic() + resiliencia.PRAZO_TOTAL
+    tentativa = 0
+    reenviada_429 = False
+    while True:
+        teste = disjuntor.verificar()
+        try:
+            limitador.aguardar_vez(api_key, ao_aguardar)
+            if duplicar:
+                response = _enviar_com_duplicata(metodo, url, api_key, headers, timeout, **kwargs)
+            else:
+                response = _enviar_uma_vez(metodo, url, headers, timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as erro:
+            disjuntor.registrar_falha()
+            if not resiliencia.pode_repetir_erro(erro, idempotente) or not _pode_tentar_de_novo(tentativa, prazo):
+                raise
+            time.sleep(resiliencia.espera_repeticao(tentativa))
+        except requests.exceptions.RequestException:
+            if teste:
+                disjuntor.liberar_teste() # Erro do lado do cliente (ex: URL inválida), não do servidor
+            raise
+        except BaseException:
+            if teste:
+                disjuntor.liberar_teste() # Qualquer outra falha antes da resposta (limitador, corpo, duplicata...)
+            raise
+        else:
+            if response.status_code in resiliencia.STATUS_REPETIR:
+                disjuntor.registrar_falha()
+                if not _pode_tentar_de_novo(tentativa, prazo):
+                    return response
+                response.close()
+                time.sleep(resiliencia.espera_repeticao(tentativa, _retry_after(response)))
+            else:
+                disjuntor.registrar_sucesso()
+                if response.status_code == 429:
+                    metricas.incrementar("vagas_respostas_429_total", endpoint=metricas.endpoint_da_url(url))
+                if response.status_code != 429 or reenviada_429:
+                    if response.status_code == 429:
+                        limitador.registrar_429(api_key, _retry_after(response))
+                    return response
+                limitador.registrar_429(api_key, _retry_after(response))
+                response.close() # Devolve a conexão ao pool (necessário quando stream=True)
+                reenviada_429 = True
+                continue # Um 429 não conta como tentativa
+        tentativa += 1
+        resiliencia.contar("repeticoes")
+
+
+def post_json(url: str, payload: dict, api_key: str, timeout: Optional[tuple] = None,
+              ao_aguardar: Optional[Callable[[float], None]] = None, stream: bool = False,
+              headers: Optional[dict] = None, idempotente: bool = False) -> requests.Response:
+    """
+    Envia um POST com corpo JSON reaproveitando uma conexão do pool.
+    Levanta as exceções normais do `requests` (HTTPError não é levantado aqui).
+    Com `stream=True` o corpo não é baixado de uma vez: leia-o com response.iter_content()
+    (ou json_incremental.iterar_vagas_resposta) e feche a resposta ao terminar.
+    `headers` acrescenta cabeçalhos aos padrão (ex: Accept).
+    Marque `idempotente=True` quando repetir a chamada não tiver efeito colateral (ex: uma busca):
+    ela passa a ser repetida também em timeouts e pode ser duplicada quando estiver lenta.
+    """
+    return _enviar("POST", url, api_key, ao_aguardar, data=json.dumps(payload), timeout=timeout, stream=stream,
+                   headers=headers, idempotente=idempotente)
+
+
+def get(url: str, api_key: str, timeout: Optional[tuple] = None,
+        ao_aguardar: Optional[Callable[[float], None]] = None) -> requests.Response:
+    """
+    Envia um GET reaproveitando uma conexão do pool (idempotente: pode ser repetido e duplicado).
+    """
+    return _enviar("GET", url, api_key, ao_aguardar, timeout=timeout, idempotente=True)
+
+
+# --- Pré-conexão ---
+def _origem(url: str) -> Optional[str]:
+    partes = urlsplit(url.strip())
+    if partes.scheme not in ("http", "https") or not partes.netloc:
+        return None
+    return f"{partes.scheme}://{partes.netloc}/"
+
+
+def pre_conectar(url: str) -> bool:
+    """
+    Abre uma conexão com o host da URL antes da primeira requisição real,
+    deixando-a no pool. Retorna True se a conexão foi estabelecida.
+    """
+    origem = _origem(url)
+    if origem is None:
+        return False
+    if origem in _hosts_aquecidos:
+        return True
+    try:
+        # Qualquer resposta serve: o importante é o socket já aberto voltar ao pool.
+        obter_sessao().head(origem, timeout=(TIMEOUT_CONEXAO, TIMEOUT_CONEXAO), allow_redirects=False).close()
+    except requests.exceptions.RequestException:
+        return False
+    _hosts_aquecidos.add(origem)
+    return True
+
+
+def pre_conectar_em_segundo_plano(url: str):
+    """
+    Dispara `pre_conectar` numa thread daemon para não travar a interface.
+    """
+    if _origem(url) is None:
+        return
+    threading.Thread(target=pre_conectar, args=(url,), daemon=True).start()
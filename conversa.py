@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Camada de conversa do /chat, compartilhada pelo chat_AI.py e pelo painel.py.
+#
+# - Cache de respostas: as integrações mandam as mesmas perguntas de FAQ o tempo todo e
+#   cada uma gasta uma requisição da cota. A pergunta é normalizada ("Qual a cota?" e
+#   "  qual a COTA " são a mesma) e a resposta fica guardada em memória, com validade
+#   (TTL) e limite de entradas (LRU).
+# - Contexto da conversa: os últimos turnos vão inteiros para a API; os mais antigos viram
+#   linhas de resumo, e o conjunto é cortado para caber num orçamento de bytes. Assim o
+#   payload (e a latência) não cresce ao longo de uma sessão longa.
+#
+# O contexto vai no payload como "history" ([{"role": "user"|"assistant", "content": ...}])
+# e "summary" (texto); uma API que não usa esses campos simplesmente os ignora.
+
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from typing import Callable, List, Optional
+
+import chat_incremental
+
+# --- Cache de respostas ---
+TTL_PADRAO = 60 * 60        # Uma resposta de FAQ vale por 1 hora
+MAXIMO_ENTRADAS = 256       # Respostas guardadas (as menos usadas saem primeiro)
+
+# --- Contexto ---
+ORCAMENTO_BYTES = 4096      # Tamanho máximo do contexto enviado (JSON em UTF-8)
+TURNOS_INTEIROS = 3         # Últimos turnos (pergunta + resposta) enviados sem resumir
+TAMANHO_RESUMO_PERGUNTA = 80
+TAMANHO_RESUMO_RESPOSTA = 160
+FRACAO_RESUMO = 0.4         # Parte do orçamento reservada às linhas de resumo
+
+_RE_ESPACOS = re.compile(r"\s+")
+_RE_FIM_FRASE = re.compile(r"(?<=[.!?])\s")
+_PONTUACAO_FINAL = " ?!.;:,…"
+
+
+def normalizar_pergunta(texto: str) -> str:
+    """
+    Normaliza a pergunta para o cache: Unicode NFKC, minúsculas, espaços colapsados
+    e sem pontuação no fim ('Qual a cota?' == 'qual a  cota').
+    """
+    texto = unicodedata.normalize("NFKC", texto or "").casefold()
+    return _RE_ESPACOS.sub(" ", texto).strip().rstrip(_PONTUACAO_FINAL)
+
+
+def _tamanho_json(valor) -> int:
+    return len(json.dumps(valor, ensure_ascii=False).encode("utf-8"))
+
+
+def _encurtar(texto: str, limite: int) -> str:
+    # Primeira frase do texto, com no máximo `limite` caracteres
+    texto = _RE_ESPACOS.sub(" ", texto or "").strip()
+    texto = _RE_FIM_FRASE.split(texto, maxsplit=1)[0]
+    return texto if len(texto) <= limite else texto[:limite - 1].rstrip() + "…"
+
+
+class CacheRespostasChat:
+    """
+    Cache em memória de respostas do /chat (validade + LRU), seguro para várias threads.
+    """
+
+    def __init__(self, ttl: float = TTL_PADRAO, maximo_entradas: int = MAXIMO_ENTRADAS):
+        self.ttl = ttl
+        self.maximo_entradas = maximo_entradas
+        self._entradas = OrderedDict() # chave -> (resposta, expira_em)
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.erros = 0
+        self.expirados = 0
+        self.despejados = 0
+
+    @staticmethod
+    def gerar_chave(url: str, pergunta: str, contexto: Optional[dict] = None) -> str:
+        """
+        Chave: endpoint + pergunta normalizada + o contexto enviado junto. Sem contexto (o começo
+        de uma conversa, o caso típico das perguntas de FAQ) a mesma pergunta sempre acerta; no meio
+        de uma conversa a resposta depende do que veio antes, então o contexto entra na chave.
+        """
+        base = json.dumps([url.rstrip("/"), normalizar_pergunta(pergunta), contexto or None], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+    def obter(self, chave: str) -> Optional[str]:
+        agora = time.monotonic()
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.erros += 1
+                return None
+            resposta, expira_em = entrada
+            if expira_em <= agora:
+                del self._entradas[chave]
+                self.expirados += 1
+                self.erros += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return resposta
+
+    def guardar(self, chave: str, resposta: str):
+        with self._trava:
+            self._entradas[chave] = (resposta, time.monotonic() + self.ttl)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.maximo_entradas:
+                self._entradas.popitem(last=False)
+                self.despejados += 1
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            total = self.acertos + self.erros
+            return {
+                "acertos": self.acertos,
+                "erros": self.erros,
+                "taxa_acerto": self.acertos / total if total else 0.0,
+                "expirados": self.expirados,
+                "despejados": self.despejados,
+                "entradas": len(self._entradas),
+            }
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self.acertos = self.erros = self.expirados = self.despejados = 0
+
+
+class ContextoConversa:
+    """
+    Contexto deslizante de uma conversa: os últimos `turnos_inteiros` turnos completos e uma
+    linha de resumo para cada turno mais antigo, tudo dentro de `orcamento_bytes`.
+    O custo de cada turno não depende do tamanho da conversa.
+    """
+
+    def __init__(self, orcamento_bytes: int = ORCAMENTO_BYTES, turnos_inteiros: int = TURNOS_INTEIROS):
+        self.orcamento_bytes = orcamento_bytes
+        self.turnos_inteiros = turnos_inteiros
+        self._recentes = deque() # (pergunta, resposta)
+        self._resumos = deque()  # Linhas de resumo, da mais antiga para a mais nova
+        self._bytes_resumos = 0
+        self.turnos = 0
+        self._trava = threading.Lock()
+
+    @staticmethod
+    def resumir_turno(pergunta: str, resposta: str) -> str:
+        return (f"Usuário: {_encurtar(pergunta, TAMANHO_RESUMO_PERGUNTA)} | "
+                f"Assistente: {_encurtar(resposta, TAMANHO_RESUMO_RESPOSTA)}")
+
+    def registrar(self, pergunta: str, resposta: str):
+        """
+        Acrescenta um turno concluído; o turno inteiro mais antigo vira uma linha de resumo e
+        as linhas de resumo mais antigas saem quando passam da parte do orçamento reservada a elas.
+        """
+        with self._trava:
+            self.turnos += 1
+            self._recentes.append((pergunta, resposta))
+            while len(self._recentes) > self.turnos_inteiros:
+                linha = self.resumir_turno(*self._recentes.popleft())
+                self._resumos.append(linha)
+                self._bytes_resumos += _tamanho_json(linha)
+            limite_resumos = self.orcamento_bytes * FRACAO_RESUMO
+            while self._resumos and self._bytes_resumos > limite_resumos:
+                self._bytes_resumos -= _tamanho_json(self._resumos.popleft())
+
+    def montar(self) -> dict:
+        """
+        Retorna os campos do contexto para o payload ({} numa conversa nova), com no máximo
+        `orcamento_bytes` bytes em JSON. Se os turnos inteiros não couberem, os mais antigos
+        são encurtados (e, em último caso, deixados de fora).
+        """
+        with self._trava:
+            if not self._recentes and not self._resumos:
+                return {}
+            resumos = list(self._resumos)
+            historico = []
+            for pergunta, resposta in self._recentes:
+                historico.append({"role": "user", "content": pergunta})
+                historico.append({"role": "assistant", "content": resposta})
+
+        def tamanho():
+            return _tamanho_json({"summary": "\n".join(resumos), "history": historico})
+
+        while resumos and tamanho() > self.orcamento_bytes: # 1º: as linhas de resumo mais antigas
+            resumos.pop(0)
+        for mensagem in historico: # 2º: encurta as mensagens mais antigas
+            if tamanho() <= self.orcamento_bytes:
+                break
+            mensagem["content"] = _encurtar(mensagem["content"], TAMANHO_RESUMO_RESPOSTA)
+        while historico and tamanho() > self.orcamento_bytes: # 3º: tira turnos inteiros
+            del historico[:2]
+        contexto = {"summary": "\n".join(resumos), "history": historico}
+        if not contexto["summary"]:
+            del contexto["summary"]
+        return contexto
+
+    def limpar(self):
+        with self._trava:
+            self._recentes.clear()
+            self._resumos.clear()
+            self._bytes_resumos = 0
+            self.turnos = 0
+
+
+_cache_padrao: Optional[CacheRespostasChat] = None
+_trava_cache_padrao = threading.Lock()
+
+
+def cache_padrao() -> CacheRespostasChat:
+    """
+    Retorna o cache de respostas compartilhado pelo chat_AI.py e pelo painel.py (criado na primeira chamada).
+    """
+    global _cache_padrao
+    with _trava_cache_padrao:
+        if _cache_padrao is None:
+            _cache_padrao = CacheRespostasChat()
+        return _cache_padrao
+
+
+class SessaoChat:
+    """
+    Uma conversa com o /chat: consulta o cache, envia a pergunta com o contexto compactado,
+    repassa os trechos da resposta conforme chegam e registra o turno.
+    Erros da requisição são levantados como no chat_incremental.transmitir_chat.
+    """
+
+    def __init__(self, url: str, api_key: str, cache: Optional[CacheRespostasChat] = None,
+                 contexto: Optional[ContextoConversa] = None, usar_cache: bool = True):
+        self.url = url
+        self.api_key = api_key
+        self.cache = cache if cache is not None else cache_padrao()
+        self.contexto = contexto if contexto is not None else ContextoConversa()
+        self.usar_cache = usar_cache
+        self.ultima_do_cache = False # A última resposta veio do cache?
+        self.ultima_incompleta = False # A última resposta foi cortada antes do evento final?
+        self.ultimo_payload_bytes = 0 # Tamanho do contexto enviado na última requisição
+
+    def enviar(self, mensagem: str, ao_receber: Optional[Callable[[str], None]] = None,
+               cancelar: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        Envia a mensagem e retorna a resposta completa. `ao_receber` é chamado com cada trecho
+        (uma vez só, com a resposta inteira, quando ela vem do cache). Se `cancelar` for sinalizado
+        no meio da resposta, a conexão é fechada, o turno é descartado e o retorno é None.
+        Se a conexão fechar antes do evento final, o texto parcial é devolvido sem ir para o cache
+        nem para o contexto, e `ultima_incompleta` fica True.
+        """
+        campos_contexto = self.contexto.montar()
+        self.ultimo_payload_bytes = _tamanho_json(campos_contexto) if campos_contexto else 0
+        chave = self.cache.gerar_chave(self.url, mensagem, campos_contexto) if self.usar_cache else None
+        resposta = self.cache.obter(chave) if chave else None
+        self.ultima_do_cache = resposta is not None
+        self.ultima_incompleta = False
+
+        if resposta is None:
+            recebido: List[str] = []
+            leitor = chat_incremental.LeitorChatIncremental(None) # Formato pelo Content-Type
+            for trecho in chat_incremental.transmitir_chat(self.url, mensagem, self.api_key, campos_contexto, leitor):
+                if cancelar is not None and cancelar.is_set():
+                    return None # Fechar o gerador encerra a conexão em andamento
+                recebido.append(trecho)
+                if ao_receber:
+                    ao_receber(trecho)
+            resposta = "".join(recebido)
+            self.ultima_incompleta = not leitor.terminada
+            if self.ultima_incompleta:
+                return resposta # Cortada: a mesma pergunta vai de novo ao /chat na próxima vez
+            if chave and resposta:
+                self.cache.guardar(chave, resposta)
+        elif ao_receber:
+            ao_receber(resposta)
+
+        if resposta:
+            self.contexto.registrar(mensagem, resposta)
+        return resposta
+
+    def reiniciar(self):
+        """
+        Começa uma conversa nova (o cache de respostas continua valendo).
+        """
+        self.contexto.limpar()
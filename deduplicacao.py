@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Remoção de vagas duplicadas entre buscas.
+#
+# A mesma vaga volta em toda busca que se sobrepõe e, muitas vezes, vem do LinkedIn e do
+# Indeed com título e localidade um pouco diferentes. O Deduplicador combina:
+#   - igualdade exata de `id` e `job_url`;
+#   - quase-duplicadas por MinHash + LSH sobre título + empresa + descrição,
+# mantido de forma incremental: cada vaga é comparada só com as candidatas do seu balde.
+
+import hashlib
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+NUM_PERMUTACOES = 64
+NUM_FAIXAS = 8             # 8 faixas x 8 linhas: pares com similaridade ~0,77+ caem no mesmo balde
+LIMIAR_SIMILARIDADE = 0.8  # Jaccard estimado a partir do qual duas vagas são a mesma
+TAMANHO_SHINGLE = 3        # Palavras por trecho comparado
+
+_PRIMO = np.uint64((1 << 61) - 1)
+_MASCARA_32 = np.uint64(0xFFFFFFFF)
+_RE_PALAVRA = re.compile(r"\w+", re.UNICODE)
+
+
+def _gerar_permutacoes(quantidade: int, semente: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    gerador = np.random.default_rng(semente)
+    a = gerador.integers(1, 1 << 32, size=quantidade, dtype=np.uint64)
+    b = gerador.integers(0, 1 << 32, size=quantidade, dtype=np.uint64)
+    return a, b
+
+
+def texto_para_comparacao(job: dict) -> str:
+    """
+    Texto usado na detecção de quase-duplicadas. A localidade fica de fora de propósito:
+    é justamente o campo que muda entre as plataformas.
+    """
+    partes = (job.get("title"), job.get("company"), job.get("description"))
+    return " ".join(str(parte) for parte in partes if parte)
+
+
+def gerar_shingles(texto: str, tamanho: int = TAMANHO_SHINGLE) -> np.ndarray:
+    """
+    Divide o texto em sequências de `tamanho` palavras e devolve o hash de 32 bits de cada uma.
+    """
+    palavras = _RE_PALAVRA.findall(texto.lower())
+    if len(palavras) < tamanho:
+        trechos = {" ".join(palavras)} if palavras else set()
+    else:
+        trechos = {" ".join(palavras[i:i + tamanho]) for i in range(len(palavras) - tamanho + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(trecho.encode("utf-8"), digest_size=4).digest(), "little") for trecho in trechos),
+        dtype=np.uint64,
+        count=len(trechos),
+    )
+
+
+def normalizar_url(url) -> Optional[str]:
+    if not url or not isinstance(url, str):
+        return None
+    return url.strip().rstrip("/").lower() or None
+
+
+class Deduplicador:
+    """
+    Guarda o que já foi visto e responde, vaga a vaga, se ela é nova.
+    Use `e_nova(job)` durante o streaming ou `filtrar(jobs)` para uma lista inteira.
+    """
+
+    def __init__(self, limiar: float = LIMIAR_SIMILARIDADE, num_permutacoes: int = NUM_PERMUTACOES, num_faixas: int = NUM_FAIXAS):
+        if num_permutacoes % num_faixas:
+            raise ValueError("num_permutacoes precisa ser múltiplo de num_faixas.")
+        self.limiar = limiar
+        self.num_faixas = num_faixas
+        self.linhas_por_faixa = num_permutacoes // num_faixas
+        self._a, self._b = _gerar_permutacoes(num_permutacoes)
+        self._ids = set()
+        self._urls = set()
+        self._baldes = {}       # (faixa, hash da faixa) -> índices das assinaturas
+        self._assinaturas = []  # Assinatura MinHash de cada vaga mantida
+        self.duplicadas_exatas = 0
+        self.quase_duplicadas = 0
+
+    def assinatura(self, job: dict) -> Optional[np.ndarray]:
+        shingles = gerar_shingles(texto_para_comparacao(job))
+        if not shingles.size:
+            return None
+        # (a * x + b) mod p para todas as permutações de uma vez; o mínimo por linha é a assinatura
+        valores = (np.outer(self._a, shingles) + self._b[:, None]) % _PRIMO
+        return (valores & _MASCARA_32).min(axis=1)
+
+    def _faixas(self, assinatura: np.ndarray):
+        for faixa in range(self.num_faixas):
+            inicio = faixa * self.linhas_por_faixa
+            yield faixa, assinatura[inicio:inicio + self.linhas_por_faixa].tobytes()
+
+    def e_nova(self, job: dict) -> bool:
+        """
+        Retorna True (e registra a vaga) se ela ainda não foi vista; False se for duplicada.
+        """
+        job_id = job.get("id")
+        url = normalizar_url(job.get("job_url"))
+        if (job_id and job_id in self._ids) or (url and url in self._urls):
+            self.duplicadas_exatas += 1
+            return False
+
+        assinatura = self.assinatura(job)
+        if assinatura is not None:
+            candidatas = set()
+            for chave in self._faixas(assinatura):
+                candidatas.update(self._baldes.get(chave, ()))
+            for indice in candidatas:
+                if np.mean(self._assinaturas[indice] == assinatura) >= self.limiar:
+                    self.quase_duplicadas += 1
+                    # Guarda o id/url para que as próximas cópias caiam no teste exato, mais barato
+                    if job_id:
+                        self._ids.add(job_id)
+                    if url:
+                        self._urls.add(url)
+                    return False
+            indice = len(self._assinaturas)
+            self._assinaturas.append(assinatura)
+            for chave in self._faixas(assinatura):
+                self._baldes.setdefault(chave, []).append(indice)
+
+        if job_id:
+            self._ids.add(job_id)
+        if url:
+            self._urls.add(url)
+        return True
+
+    def filtrar(self, jobs: Iterable[dict]) -> Iterator[dict]:
+        """
+        Devolve, na ordem original, só as vagas que ainda não foram vistas.
+        """
+        for job in jobs:
+            if self.e_nova(job):
+                yield job
+
+
+def remover_duplicadas(jobs: Iterable[dict], deduplicador: Optional[Deduplicador] = None) -> Tuple[list, int]:
+    """
+    Atalho para uma lista: retorna (vagas únicas, quantidade removida).
+    Passe um `deduplicador` já existente para deduplicar também contra buscas anteriores.
+    """
+    jobs = list(jobs)
+    unicas = list((deduplicador or Deduplicador()).filtrar(jobs))
+    return unicas, len(jobs) - len(unicas)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Armazém das descrições das vagas: comprimidas num arquivo temporário e lidas só quando alguém
+# precisa do texto (o card mostra 250 caracteres; a descrição inteira só no "Ver Mais...").
+#
+# Os registros compactos (registro.py) guardam no lugar da descrição apenas a posição dela no
+# armazém; descrições curtas ficam na memória, em UTF-8, porque comprimi-las não compensa.
+# O arquivo é apagado pelo sistema ao fechar o programa. Também divide textos longos em páginas,
+# para o painel não montar um único controle gigante.
+#
+# Uso: chave = guardar("texto..."); ler(chave)
+
+import tempfile
+import threading
+import zlib
+from array import array
+from typing import List, Optional, Union
+
+LIMIAR_BYTES = 300      # A partir deste tamanho (em UTF-8) vão para o disco; prévias de 250 caracteres (projecao.py) ficam na memória
+NIVEL_COMPRESSAO = 1    # zlib: o nível 1 comprime quase tanto quanto o 6 em textos curtos e é bem mais rápido
+TAMANHO_PAGINA = 4000   # Caracteres por página no diálogo do "Ver Mais..."
+
+
+class ArmazemDescricoes:
+    """
+    Textos comprimidos (zlib) num arquivo temporário só de acréscimo; cada texto é identificado
+    pela posição devolvida em `guardar`. Seguro para várias threads.
+    """
+
+    def __init__(self, diretorio: Optional[str] = None):
+        self.diretorio = diretorio
+        self._arquivo = None # Criado na primeira descrição guardada
+        self._inicios = array("q")
+        self._tamanhos = array("l")
+        self._fim = 0
+        self._trava = threading.Lock()
+
+    def guardar(self, texto: Union[str, bytes]) -> int:
+        """
+        Comprime e grava o texto no fim do arquivo. Retorna a chave para `ler`.
+        """
+        bruto = texto.encode("utf-8") if isinstance(texto, str) else texto
+        comprimido = zlib.compress(bruto, NIVEL_COMPRESSAO)
+        with self._trava:
+            if self._arquivo is None:
+                self._arquivo = tempfile.TemporaryFile(prefix="vagas-descricoes-", dir=self.diretorio)
+            self._arquivo.seek(self._fim)
+            self._arquivo.write(comprimido)
+            self._inicios.append(self._fim)
+            self._tamanhos.append(len(comprimido))
+            self._fim += len(comprimido)
+            return len(self._inicios) - 1
+
+    def ler(self, chave: int) -> str:
+        with self._trava:
+            self._arquivo.seek(self._inicios[chave])
+            comprimido = self._arquivo.read(self._tamanhos[chave])
+        return zlib.decompress(comprimido).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._inicios)
+
+    @property
+    def bytes_em_disco(self) -> int:
+        return self._fim
+
+    def fechar(self):
+        """
+        Apaga o arquivo; as chaves já entregues deixam de valer.
+        """
+        with self._trava:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+            self._inicios = array("q")
+            self._tamanhos = array("l")
+            self._fim = 0
+
+
+_armazem_padrao: Optional[ArmazemDescricoes] = None
+_trava_padrao = threading.Lock()
+
+
+def armazem_padrao() -> ArmazemDescricoes:
+    global _armazem_padrao
+    with _trava_padrao:
+        if _armazem_padrao is None:
+            _armazem_padrao = ArmazemDescricoes()
+        return _armazem_padrao
+
+
+# --- Valores guardados nos registros ---
+def guardar(texto):
+    """
+    O que um registro guarda no lugar da descrição: a chave no armazém (descrições longas),
+    os bytes em UTF-8 (curtas) ou o próprio valor, se não for texto (ex: None).
+    """
+    if not isinstance(texto, str):
+        return texto
+    bruto = texto.encode("utf-8")
+    return armazem_padrao().guardar(bruto) if len(bruto) >= LIMIAR_BYTES else bruto
+
+
+def ler(valor):
+    """
+    Inverso de `guardar`: devolve o texto (lendo do armazém quando for uma chave).
+    """
+    if type(valor) is int:
+        return armazem_padrao().ler(valor)
+    if type(valor) is bytes:
+        return valor.decode("utf-8")
+    return valor
+
+
+# --- Páginas para exibição ---
+def paginar(texto: str, tamanho: int = TAMANHO_PAGINA) -> List[str]:
+    """
+    Divide o texto em páginas de até `tamanho` caracteres, cortando de preferência entre
+    parágrafos, depois entre linhas e por fim entre palavras.
+    """
+    paginas = []
+    while len(texto) > tamanho:
+        for separador in ("\n\n", "\n", " "):
+            corte = texto.rfind(separador, tamanho // 2, tamanho)
+            if corte != -1:
+                corte += len(separador)
+                break
+        else:
+            corte = tamanho
+        paginas.append(texto[:corte].rstrip())
+        texto = texto[corte:].lstrip("\n")
+    paginas.append(texto)
+    return paginas
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Importador dos relatórios "Vagas *.txt" salvos a partir da saída de buscar_e_exibir_vagas.
+#
+# Inverte os rótulos de JOB_FIELD_TRANSLATIONS ("  > Rótulo: valor") e devolve cada vaga
+# como um dicionário tipado, com as mesmas chaves da API. O arquivo é lido linha a linha,
+# então arquivos de vários GB são processados com memória constante.
+#
+# Uso: python importador.py "Vagas encontradas.txt" "Freelance.txt" --saida vagas.jsonl
+#      (use a extensão .parquet para gravar em Parquet; requer pyarrow)
+
+import argparse
+import json
+import re
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from vagas import JOB_FIELD_TRANSLATIONS
+
+ROTULO_PARA_CAMPO = {rotulo: campo for campo, rotulo in JOB_FIELD_TRANSLATIONS.items()}
+
+# Campos extras adicionados pelo importador (não vêm da API).
+CAMPOS_EXTRAS = ("busca_termo", "busca_localidade", "busca_pais", "descricao_truncada", "arquivo_origem")
+
+CAMPOS_DECIMAIS = ("salary_from", "salary_to", "salary_avg", "salary_hourly", "salary_yearly", "company_rating")
+CAMPOS_INTEIROS = ("company_reviews_count", "vacancy_count")
+CAMPOS_LINK = ("job_url", "job_url_direct", "company_website")
+
+_RE_BUSCA = re.compile(r"^##### Buscando vagas de '(?P<termo>.*)' em '(?P<local>.*)' #####\s*$")
+_RE_VAGA = re.compile(r"^--- Vaga #\d+: .* ---\s*$")
+_RE_CAMPO = re.compile(r"^  > (?P<rotulo>[^:]+): ?(?P<valor>.*)$")
+_RE_SEPARADOR = re.compile(r"^={20,}\s*$")
+_RE_UNIDADE_SALARIO = re.compile(r" por (Ano|Hora|Mês|Dia|Semana)$")
+_RE_MOEDA = re.compile(r"^[A-Z]{3} ") # "EUR ", "BRL ", "USD "...
+
+
+# --- Conversão dos valores exibidos de volta para os tipos da API ---
+def _nao_disponivel(valor: str) -> bool:
+    return valor == "" or valor.startswith("Não disponível")
+
+
+def _converter_numero_br(valor: str) -> Optional[float]:
+    # "EUR 1.234,56 por Mês" -> 1234.56
+    texto = _RE_MOEDA.sub("", _RE_UNIDADE_SALARIO.sub("", valor))
+    texto = texto.strip().replace(".", "").replace(",", ".")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def converter_valor(campo: str, valor: str):
+    """
+    Converte o texto exibido no relatório para o valor original (None quando 'Não disponível').
+    """
+    valor = valor.strip()
+    if _nao_disponivel(valor):
+        return None
+    if campo in CAMPOS_LINK:
+        return valor[len("Link: "):] if valor.startswith("Link: ") else valor
+    if campo.startswith("salary_") and campo != "salary_unit":
+        numero = _converter_numero_br(valor)
+        return numero if numero is not None else valor
+    if campo in CAMPOS_DECIMAIS:
+        try:
+            return float(valor)
+        except ValueError:
+            return valor
+    if campo in CAMPOS_INTEIROS:
+        try:
+            return int(float(valor))
+        except ValueError:
+            return valor
+    if campo == "date_posted":
+        try:
+            return datetime.strptime(valor, "%d/%m/%Y").date().isoformat()
+        except ValueError:
+            return valor
+    if valor in ("Sim", "Não"):
+        return valor == "Sim"
+    return valor
+
+
+def _finalizar(campos: dict, contexto: dict) -> dict:
+    vaga = {campo: None for campo in JOB_FIELD_TRANSLATIONS}
+    for campo, linhas in campos.items():
+        vaga[campo] = converter_valor(campo, "\n".join(linhas))
+    # O relatório sempre corta a descrição em 400 caracteres e acrescenta "..."
+    descricao = vaga.get("description")
+    vaga["descricao_truncada"] = False
+    if isinstance(descricao, str) and descricao.endswith("..."):
+        vaga["description"] = descricao[:-3].rstrip() or None
+        vaga["descricao_truncada"] = True
+    vaga.update(contexto)
+    return vaga
+
+
+# --- Leitura em streaming ---
+def ler_relatorio(linhas: Iterable[str], arquivo_origem: Optional[str] = None) -> Iterator[dict]:
+    """
+    Percorre as linhas de um relatório e devolve uma vaga por vez.
+    Só a vaga em leitura fica em memória.
+    """
+    contexto = {"busca_termo": None, "busca_localidade": None, "busca_pais": None, "arquivo_origem": arquivo_origem}
+    campos = None       # Campos da vaga atual: {campo: [linhas]}
+    campo_atual = None  # Campo que recebe as linhas de continuação (ex: descrição)
+
+    for linha in linhas:
+        linha = linha.rstrip("\r\n")
+
+        busca = _RE_BUSCA.match(linha)
+        if busca:
+            if campos:
+                yield _finalizar(campos, contexto)
+            campos, campo_atual = None, None
+            localidade, _, pais = busca.group("local").rpartition(", ")
+            contexto = dict(contexto, busca_termo=busca.group("termo").strip(), busca_localidade=localidade or None, busca_pais=pais or None)
+            continue
+
+        if _RE_VAGA.match(linha):
+            if campos:
+                yield _finalizar(campos, contexto)
+            campos, campo_atual = {}, None
+            continue
+
+        if campos is None:
+            continue # Texto livre antes da primeira vaga (observações do arquivo)
+
+        if _RE_SEPARADOR.match(linha):
+            yield _finalizar(campos, contexto)
+            campos, campo_atual = None, None
+            continue
+
+        campo_encontrado = _RE_CAMPO.match(linha)
+        if campo_encontrado and campo_encontrado.group("rotulo") in ROTULO_PARA_CAMPO:
+            campo_atual = ROTULO_PARA_CAMPO[campo_encontrado.group("rotulo")]
+            campos[campo_atual] = [campo_encontrado.group("valor")]
+        elif campo_atual is not None:
+            campos[campo_atual].append(linha) # Continuação de um valor com várias linhas
+
+    if campos:
+        yield _finalizar(campos, contexto)
+
+
+def importar_arquivos(caminhos: Iterable[str]) -> Iterator[dict]:
+    """
+    Lê vários relatórios em sequência, devolvendo as vagas de todos eles.
+    """
+    for caminho in caminhos:
+        with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+            yield from ler_relatorio(arquivo, arquivo_origem=caminho)
+
+
+# --- Exportação ---
+def exportar_jsonl(vagas_importadas: Iterable[dict], caminho: str) -> int:
+    """
+    Grava as vagas em JSON Lines, uma por linha. Retorna quantas foram gravadas.
+    """
+    total = 0
+    with open(caminho, "w", encoding="utf-8") as saida:
+        for vaga in vagas_importadas:
+            saida.write(json.dumps(vaga, ensure_ascii=False) + "\n")
+            total += 1
+    return total
+
+
+def exportar_parquet(vagas_importadas: Iterable[dict], caminho: str, tamanho_lote: int = 10000) -> int:
+    """
+    Grava as vagas em Parquet, em lotes de `tamanho_lote` linhas (memória constante).
+    Requer o pacote opcional pyarrow (pip install pyarrow).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Para exportar em Parquet instale o pyarrow: pip install pyarrow")
+
+    colunas = list(JOB_FIELD_TRANSLATIONS) + list(CAMPOS_EXTRAS)
+    tipos = {campo: pa.float64() for campo in CAMPOS_DECIMAIS}
+    tipos.update({campo: pa.int64() for campo in CAMPOS_INTEIROS})
+    tipos["descricao_truncada"] = pa.bool_()
+    esquema = pa.schema([(coluna, tipos.get(coluna, pa.string())) for coluna in colunas])
+
+    def normalizar(vaga: dict) -> dict:
+        # Valores que não puderam ser convertidos (ex: salário em texto) viram None na coluna tipada
+        linha = {}
+        for coluna in colunas:
+            valor = vaga.get(coluna)
+            tipo = tipos.get(coluna)
+            if tipo is None:
+                linha[coluna] = None if valor is None else str(valor)
+            elif tipo == pa.bool_():
+                linha[coluna] = bool(valor)
+            else:
+                linha[coluna] = valor if isinstance(valor, (int, float)) and not isinstance(valor, bool) else None
+        return linha
+
+    total = 0
+    lote = []
+    with pq.ParquetWriter(caminho, esquema) as escritor:
+        for vaga in vagas_importadas:
+            lote.append(normalizar(vaga))
+            if len(lote) >= tamanho_lote:
+                escritor.write_table(pa.Table.from_pylist(lote, schema=esquema))
+                total += len(lote)
+                lote = []
+        if lote:
+            escritor.write_table(pa.Table.from_pylist(lote, schema=esquema))
+            total += len(lote)
+    return total
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte relatórios 'Vagas *.txt' em registros estruturados.")
+    parser.add_argument("arquivos", nargs="+", help="Relatórios .txt gerados por buscar_e_exibir_vagas.")
+    parser.add_argument("--saida", required=True, help="Arquivo de saída (.jsonl ou .parquet).")
+    args = parser.parse_args()
+
+    vagas_importadas = importar_arquivos(args.arquivos)
+    if args.saida.lower().endswith(".parquet"):
+        total = exportar_parquet(vagas_importadas, args.saida)
+    else:
+        total = exportar_jsonl(vagas_importadas, args.saida)
+    print(f"--- {total} vaga(s) importada(s) para '{args.saida}' ---")
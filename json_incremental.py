@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Leitura incremental da resposta do /search_jobs.
+#
+# Em vez de esperar o corpo inteiro para chamar response.json(), o leitor decodifica o
+# array "jobs" item a item conforme os bytes chegam. Assim a primeira vaga aparece
+# enquanto o resto (dezenas de descrições de vários KB) ainda está sendo baixado.
+# Os demais campos do objeto (ex: "count") ficam disponíveis em `campos`.
+
+import codecs
+import json
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import cliente_api
+import metricas
+
+TAMANHO_BLOCO = 16 * 1024 # Bytes lidos do socket por vez
+
+_ESPACOS = " \t\r\n"
+
+
+class RespostaIncompleta(ValueError):
+    """
+    A conexão terminou antes do JSON ser concluído.
+    """
+
+
+class LeitorVagasIncremental:
+    """
+    Analisador em streaming para respostas no formato {"count": N, "jobs": [{...}, ...], ...}.
+    Alimente com `alimentar(texto)`; cada chamada devolve as vagas que ficaram completas.
+    """
+
+    def __init__(self):
+        self._decodificador = json.JSONDecoder()
+        self._buffer = ""
+        self._posicao = 0
+        self._estado = "inicio"   # inicio -> chave -> dois_pontos -> valor (ou jobs) -> chave ... -> fim
+        self._chave_atual = None
+        self.campos = {}
+        self.total_vagas = 0
+
+    # --- Auxiliares de leitura do buffer ---
+    def _pular_espacos(self) -> bool:
+        while self._posicao < len(self._buffer) and self._buffer[self._posicao] in _ESPACOS:
+            self._posicao += 1
+        return self._posicao < len(self._buffer)
+
+    def _decodificar_valor(self, final: bool):
+        """
+        Decodifica um valor JSON completo a partir da posição atual, ou devolve (False, None)
+        se os dados ainda não chegaram inteiros.
+        """
+        try:
+            valor, fim = self._decodificador.raw_decode(self._buffer, self._posicao)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        # Um número no fim do buffer pode estar cortado ("2" de "20"): espera o próximo caractere.
+        # Objetos, listas e textos terminam num delimitador, então já estão completos.
+        if fim >= len(self._buffer) and not final and isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            return False, None
+        self._posicao = fim
+        return True, valor
+
+    def _erro(self, esperado: str):
+        raise ValueError(f"JSON inesperado na posição {self._posicao}: esperava {esperado}.")
+
+    def alimentar(self, texto: str, final: bool = False) -> List[dict]:
+        """
+        Acrescenta texto recebido e devolve as vagas completas encontradas até aqui.
+        Passe `final=True` quando não houver mais dados.
+        """
+        self._buffer += texto
+        vagas = []
+        while self._pular_espacos():
+            caractere = self._buffer[self._posicao]
+
+            if self._estado == "inicio":
+                if caractere != "{":
+                    self._erro("'{'")
+                self._posicao += 1
+                self._estado = "chave"
+
+            elif self._estado == "chave":
+                if caractere == "}":
+                    self._posicao += 1
+                    self._estado = "fim"
+                    continue
+                if caractere == ",":
+                    self._posicao += 1
+                    continue
+                completo, chave = self._decodificar_valor(final)
+                if not completo:
+                    break
+                self._chave_atual = chave
+                self._estado = "dois_pontos"
+
+            elif self._estado == "dois_pontos":
+                if caractere != ":":
+                    self._erro("':'")
+                self._posicao += 1
+                self._estado = "valor"
+
+            elif self._estado == "valor":
+                if self._chave_atual == "jobs" and caractere == "[":
+                    self._posicao += 1
+                    self.campos["jobs"] = None # Marca a presença; as vagas saem por `alimentar`
+                    self._estado = "jobs"
+                    continue
+                completo, valor = self._decodificar_valor(final)
+                if not completo:
+                    break
+                self.campos[self._chave_atual] = valor
+                self._estado = "chave"
+
+            elif self._estado == "jobs":
+                if caractere == ",":
+                    self._posicao += 1
+                    continue
+                if caractere == "]":
+                    self._posicao += 1
+                    self._estado = "chave"
+                    continue
+                completo, vaga = self._decodificar_valor(final)
+                if not completo:
+                    break
+                self.total_vagas += 1
+                vagas.append(vaga)
+
+            else: # fim: ignora o que vier depois do objeto
+                self._posicao = len(self._buffer)
+
+        # Descarta o que já foi consumido para manter o buffer pequeno
+        if self._posicao:
+            self._buffer = self._buffer[self._posicao:]
+            self._posicao = 0
+        if final and self._estado != "fim":
+            raise RespostaIncompleta("A resposta da API terminou antes do JSON ser concluído.")
+        return vagas
+
+    @property
+    def concluido(self) -> bool:
+        return self._estado == "fim"
+
+
+def iterar_vagas(blocos: Iterable[bytes], leitor: LeitorVagasIncremental = None) -> Iterator[dict]:
+    """
+    Recebe blocos de bytes (ex: response.iter_content()) e devolve cada vaga assim que ela fica completa.
+    Passe o próprio `leitor` para consultar `leitor.campos` (ex: 'count') durante ou depois da leitura.
+    """
+    leitor = leitor or LeitorVagasIncremental()
+    decodificador_utf8 = codecs.getincrementaldecoder("utf-8")()
+    leitura = 0.0 # Só o tempo dentro do leitor, sem o de quem consome as vagas
+    try:
+        for bloco in blocos:
+            if bloco:
+                inicio = time.perf_counter()
+                vagas = leitor.alimentar(decodificador_utf8.decode(bloco))
+                leitura += time.perf_counter() - inicio
+                yield from vagas
+        inicio = time.perf_counter()
+        vagas = leitor.alimentar(decodificador_utf8.decode(b"", final=True), final=True)
+        leitura += time.perf_counter() - inicio
+        yield from vagas
+    finally:
+        metricas.observar("vagas_json_segundos", leitura, endpoint="search_jobs")
+
+
+def blocos_da_resposta(response) -> Iterator[bytes]:
+    """
+    Lê o corpo conforme os bytes chegam. `iter_content(n)` espera juntar n bytes antes de devolver;
+    `read1` (urllib3 2.x) devolve o que já estiver disponível, então a primeira vaga não fica presa no buffer.
+    Também usado por chat_incremental.py para os tokens do /chat.
+    """
+    bruto = response.raw
+    blocos = response.iter_content(chunk_size=TAMANHO_BLOCO) if not hasattr(bruto, "read1") else None
+    espera = 0.0 # Tempo esperando bytes da rede (o resto é de quem consome os blocos)
+    recebidos = 0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            bloco = next(blocos, b"") if blocos is not None else bruto.read1(TAMANHO_BLOCO, decode_content=True)
+            espera += time.perf_counter() - inicio
+            if not bloco:
+                return
+            recebidos += len(bloco)
+            yield bloco
+    finally:
+        na_rede = getattr(bruto, "tell", None) # urllib3: bytes como vieram da rede (antes de descomprimir)
+        if callable(na_rede) and isinstance(na_rede(), int):
+            recebidos = na_rede()
+        endpoint = metricas.endpoint_da_url(response.url)
+        metricas.observar("vagas_download_segundos", espera, endpoint=endpoint)
+        metricas.incrementar("vagas_bytes_recebidos_total", recebidos, endpoint=endpoint)
+
+
+def iterar_vagas_resposta(response, leitor: LeitorVagasIncremental = None) -> Iterator[dict]:
+    """
+    Atalho para uma resposta do `requests` aberta com stream=True.
+    """
+    return iterar_vagas(blocos_da_resposta(response), leitor)
+
+
+def transmitir_busca(url: str, payload: dict, api_key: str, leitor: LeitorVagasIncremental = None,
+                     ao_aguardar: Optional[Callable[[float], None]] = None) -> Iterator[dict]:
+    """
+    Envia a busca pelo pool compartilhado com stream=True e devolve as vagas conforme chegam.
+    Erros HTTP (4xx/5xx) e de conexão são levantados como exceções do `requests`;
+    JSON malformado ou cortado levanta ValueError.
+    `ao_aguardar` é repassado ao limitador (ver cliente_api.post_json).
+    """
+    response = cliente_api.post_json(url, payload, api_key, stream=True, idempotente=True, ao_aguardar=ao_aguardar)
+    with response:
+        if response.status_code >= 400:
+            response.content # Lê o corpo do erro antes de fechar, para o chamador ver o 'detail'
+        response.raise_for_status()
+        yield from iterar_vagas_resposta(response, leitor)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Limitador de requisições do lado do cliente (token bucket) compartilhado entre processos.
+#
+# A API permite 4 requisições/minuto para chaves gratuitas e 15/minuto para chaves Pro
+# (veja IMPORTANTE.txt). Em vez de disparar a requisição e receber um 429, cada chamada
+# reserva uma vaga no balde da sua chave e espera a sua vez. O estado do balde fica num
+# arquivo protegido por trava, então vários vagas.py / painel.py / lote.py na mesma
+# máquina dividem a mesma cota sem ultrapassá-la.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+import metricas
+
+# --- Limites por plano (requisições por PERIODO_LIMITE segundos) ---
+LIMITES_POR_PLANO = {
+    "free": 4,
+    "pro": 15,
+}
+PERIODO_LIMITE = 60.0
+# Folga somada ao período para absorver a variação de latência da rede
+# (uma requisição que chega atrasada no servidor não pode "encostar" na seguinte).
+FOLGA_SEGUNDOS = 0.5
+# Quantas requisições podem sair de uma vez com o balde cheio. Com 1, as requisições
+# saem espaçadas igualmente e nunca passam do limite em nenhuma janela do servidor.
+RAJADA = 1
+
+# Desligue (VAGAS_LIMITADOR=0) apenas ao usar um servidor próprio, sem cota.
+ATIVO = os.environ.get("VAGAS_LIMITADOR", "1") != "0"
+PLANO_PADRAO = os.environ.get("VAGAS_API_PLANO", "free")
+DIRETORIO_ESTADO = os.environ.get("VAGAS_LIMITE_DIR", os.path.join(tempfile.gettempdir(), "vagas_limites"))
+
+_planos_por_chave = {}
+_trava_local = threading.Lock()
+
+if os.name == "nt":
+    import msvcrt
+
+    def _travar(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _destravar(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _travar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+
+    def _destravar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+
+def definir_plano(api_key: str, plano: str):
+    """
+    Informa o plano ('free' ou 'pro') de uma chave. Chaves não registradas usam PLANO_PADRAO.
+    """
+    if plano not in LIMITES_POR_PLANO:
+        raise ValueError(f"Plano desconhecido: '{plano}'. Use um de: {', '.join(LIMITES_POR_PLANO)}.")
+    _planos_por_chave[api_key] = plano
+
+
+def obter_plano(api_key: str) -> str:
+    return _planos_por_chave.get(api_key, PLANO_PADRAO)
+
+
+def _caminho_estado(api_key: str, plano: str) -> str:
+    # A chave nunca vai para o disco: o arquivo é nomeado pelo hash dela.
+    resumo_chave = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(DIRETORIO_ESTADO, f"{resumo_chave}-{plano}.json")
+
+
+def _atualizar_balde(api_key: str, alterar: Callable[[dict, float, float], float]) -> float:
+    """
+    Abre o arquivo do balde com trava exclusiva, reabastece as fichas pelo tempo decorrido,
+    aplica `alterar(estado, agora, taxa)` e grava o resultado. Retorna o valor de `alterar`.
+    """
+    plano = obter_plano(api_key)
+    taxa = LIMITES_POR_PLANO[plano] / (PERIODO_LIMITE + FOLGA_SEGUNDOS) # Fichas por segundo
+    os.makedirs(DIRETORIO_ESTADO, exist_ok=True)
+    caminho = _caminho_estado(api_key, plano)
+
+    with _trava_local, open(caminho, "a+", encoding="utf-8") as arquivo:
+        _travar(arquivo)
+        try:
+            arquivo.seek(0)
+            try:
+                estado = json.loads(arquivo.read() or "{}")
+            except json.JSONDecodeError:
+                estado = {}
+            agora = time.time()
+            fichas = estado.get("fichas", float(RAJADA))
+            ultimo = estado.get("atualizado", agora)
+            estado["fichas"] = min(float(RAJADA), fichas + max(0.0, agora - ultimo) * taxa)
+            estado["atualizado"] = agora
+
+            resultado = alterar(estado, agora, taxa)
+
+            arquivo.seek(0)
+            arquivo.truncate()
+            arquivo.write(json.dumps(estado))
+            arquivo.flush()
+            return resultado
+        finally:
+            _destravar(arquivo)
+
+
+def reservar(api_key: str) -> float:
+    """
+    Reserva a próxima vaga no balde da chave e devolve quantos segundos faltam para ela.
+    As fichas podem ficar negativas: cada reserva entra numa fila implícita, com ETA exato,
+    sem que os processos precisem ficar tentando de novo.
+    """
+    def tirar_ficha(estado: dict, agora: float, taxa: float) -> float:
+        estado["fichas"] -= 1.0
+        return 0.0 if estado["fichas"] >= 0 else -estado["fichas"] / taxa
+
+    return _atualizar_balde(api_key, tirar_ficha)
+
+
+def tentar_reservar(api_key: str) -> bool:
+    """
+    Tira uma ficha só se houver uma disponível agora, sem entrar na fila.
+    Usado por requisições opcionais (ex: a duplicata de uma busca lenta, ver resiliencia.py),
+    que também contam na cota mas não devem atrasar as requisições normais.
+    """
+    if not ATIVO:
+        return True
+
+    def tirar_se_houver(estado: dict, agora: float, taxa: float) -> float:
+        if estado["fichas"] < 1.0:
+            return 0.0
+        estado["fichas"] -= 1.0
+        return 1.0
+
+    return bool(_atualizar_balde(api_key, tirar_se_houver))
+
+
+def aguardar_vez(api_key: str, ao_aguardar: Optional[Callable[[float], None]] = None) -> float:
+    """
+    Bloqueia até a requisição poder sair sem estourar o limite da chave.
+    Se for preciso esperar, chama `ao_aguardar(segundos)` com a estimativa (por padrão, imprime).
+    Retorna o tempo esperado em segundos.
+    """
+    if not ATIVO:
+        return 0.0
+    espera = reservar(api_key)
+    if espera > 0:
+        metricas.incrementar("vagas_limitador_esperas_total", plano=obter_plano(api_key))
+        metricas.observar("vagas_limitador_espera_segundos", espera, plano=obter_plano(api_key))
+        if ao_aguardar is None:
+            print(f"\n⏳ Limite de requisições do plano '{obter_plano(api_key)}': sua requisição está na fila e sai em ~{espera:.0f}s.")
+        else:
+            ao_aguardar(espera)
+        time.sleep(espera)
+    return espera
+
+
+def registrar_429(api_key: str, retry_after: Optional[float] = None):
+    """
+    Chamado quando a API responde 429 mesmo assim (ex: a mesma chave usada em outra máquina).
+    Esvazia o balde para que as próximas reservas esperem pelo menos `retry_after`
+    (ou um intervalo completo entre requisições, se o servidor não informar).
+    """
+    if not ATIVO:
+        return
+
+    def esvaziar(estado: dict, agora: float, taxa: float) -> float:
+        espera = retry_after if retry_after is not None else 1.0 / taxa
+        estado["fichas"] = min(estado["fichas"], -espera * taxa + 1.0)
+        return espera
+
+    _atualizar_balde(api_key, esvaziar)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Modo lote: lê várias buscas de um arquivo JSONL e executa em paralelo (com limite),
+# gravando cada resultado como uma linha JSON assim que ele fica pronto.
+#
+# Cada linha de entrada é um payload do /search_jobs, por exemplo:
+#   {"search_term": "Analista de Dados", "location": "Lisboa", "country": "portugal", "is_remote": "Ambos", "hours_old": 72}
+#
+# Uso: python lote.py buscas.jsonl resultados.jsonl --chave SUA_CHAVE --concorrencia 4
+
+import argparse
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+import requests
+
+import arquivo_vagas
+import cliente_api
+import deduplicacao
+import limitador
+import metricas
+import vagas
+
+# Campos aceitos pelo /search_jobs; o resto da linha é ignorado.
+CAMPOS_BUSCA = ("search_term", "location", "country", "is_remote", "hours_old")
+CONCORRENCIA_PADRAO = 4
+
+
+def ler_buscas(caminho: str) -> Iterator[tuple]:
+    """
+    Lê o arquivo JSONL linha a linha, devolvendo (número_da_linha, payload ou mensagem de erro).
+    Linhas vazias e comentários (#) são ignorados.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, start=1):
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            try:
+                dados = json.loads(linha)
+            except json.JSONDecodeError as erro:
+                yield numero, f"JSON inválido: {erro}"
+                continue
+            if not isinstance(dados, dict) or not dados.get("search_term") or not dados.get("country"):
+                yield numero, "Os campos 'search_term' e 'country' são obrigatórios."
+                continue
+            yield numero, {campo: dados.get(campo) for campo in CAMPOS_BUSCA}
+
+
+def executar_busca(payload: dict, api_key: str, url: Optional[str] = None) -> dict:
+    """
+    Executa uma única busca e devolve um dicionário com 'count' e 'jobs' ou com 'error'.
+    Diferente de `vagas.fazer_requisicao`, não imprime nada: o erro vai para o resultado.
+    """
+    url = url or f"{vagas.BASE_URL}/search_jobs"
+    try:
+        response = cliente_api.post_json(url, payload, api_key, idempotente=True)
+        response.raise_for_status()
+        with metricas.cronometro("vagas_json_segundos", endpoint="search_jobs"):
+            dados = response.json()
+        if not isinstance(dados, dict): # Ex: uma lista ou null; sem isto o erro pararia o lote inteiro
+            return {"error": "Resposta da API em formato inesperado."}
+        arquivo_vagas.arquivar(dados.get("jobs", []), payload.get("country")) # Também usado pelo monitor.py
+        return {"count": dados.get("count", 0), "jobs": dados.get("jobs", [])}
+    except requests.exceptions.HTTPError as http_err:
+        try:
+            error_detail = http_err.response.json().get("detail", http_err.response.text)
+        except json.JSONDecodeError:
+            error_detail = http_err.response.text
+        return {"error": f"Erro HTTP {http_err.response.status_code} da API: {error_detail}"}
+    except json.JSONDecodeError: # Antes do RequestException: o erro do response.json() é subclasse dos dois
+        return {"error": "Resposta da API não é um JSON válido."}
+    except requests.exceptions.RequestException as req_err:
+        return {"error": f"Erro de Conexão com a API: {req_err}"}
+
+
+def executar_lote(caminho_entrada: str, caminho_saida: str, api_key: str,
+                  concorrencia: int = CONCORRENCIA_PADRAO, url: Optional[str] = None,
+                  deduplicar: bool = True) -> dict:
+    """
+    Executa todas as buscas do arquivo de entrada com no máximo `concorrencia` requisições
+    simultâneas. Cada resultado é gravado (e o arquivo é descarregado) assim que termina,
+    na ordem de conclusão. Com `deduplicar`, uma vaga que já saiu em outra busca do lote
+    não é gravada de novo. Retorna um resumo com o total de buscas, erros, vagas e duplicadas.
+    """
+    resumo = {"buscas": 0, "erros": 0, "vagas": 0, "duplicadas": 0}
+    trava_saida = threading.Lock()
+    deduplicador = deduplicacao.Deduplicador() if deduplicar else None
+
+    with open(caminho_saida, "w", encoding="utf-8") as saida, \
+            ThreadPoolExecutor(max_workers=concorrencia) as executor:
+
+        def gravar(registro: dict):
+            with trava_saida:
+                if deduplicador is not None and "jobs" in registro:
+                    jobs = registro["jobs"]
+                    registro["jobs"] = list(deduplicador.filtrar(jobs))
+                    registro["duplicadas"] = len(jobs) - len(registro["jobs"])
+                    registro["count"] = len(registro["jobs"])
+                    resumo["duplicadas"] += registro["duplicadas"]
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                saida.flush()
+                resumo["buscas"] += 1
+                if "error" in registro:
+                    resumo["erros"] += 1
+                else:
+                    resumo["vagas"] += registro.get("count", 0)
+
+        pendentes = {}
+
+        def recolher_concluidas():
+            concluidas, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                numero_concluido, payload_concluido = pendentes.pop(futuro)
+                gravar({"linha": numero_concluido, "payload": payload_concluido, **futuro.result()})
+
+        for numero, payload in ler_buscas(caminho_entrada):
+            if isinstance(payload, str): # Linha inválida: registra o erro sem chamar a API
+                gravar({"linha": numero, "error": payload})
+                continue
+            # Mantém no máximo `concorrencia` buscas na fila para não carregar o arquivo todo
+            while len(pendentes) >= concorrencia:
+                recolher_concluidas()
+            pendentes[executor.submit(executar_busca, payload, api_key, url)] = (numero, payload)
+
+        while pendentes:
+            recolher_concluidas()
+
+    return resumo
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa várias buscas de vagas a partir de um arquivo JSONL.")
+    parser.add_argument("entrada", help="Arquivo JSONL com um payload do /search_jobs por linha.")
+    parser.add_argument("saida", help="Arquivo JSONL onde os resultados serão gravados.")
+    parser.add_argument("--chave", default=vagas.VALID_FREE_KEY, help="Chave de API (X-API-Key).")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA_PADRAO, help="Máximo de buscas simultâneas.")
+    parser.add_argument("--plano", choices=list(limitador.LIMITES_POR_PLANO), default=limitador.PLANO_PADRAO,
+                        help="Plano da chave, define o limite de requisições por minuto.")
+    parser.add_argument("--sem-deduplicar", action="store_true", help="Grava vagas repetidas entre as buscas.")
+    args = parser.parse_args()
+    limitador.definir_plano(args.chave, args.plano)
+
+    print(f"\n##### Executando buscas de '{args.entrada}' (até {args.concorrencia} ao mesmo tempo) #####")
+    resumo = executar_lote(args.entrada, args.saida, args.chave, concorrencia=max(1, args.concorrencia), deduplicar=not args.sem_deduplicar)
+    print(f"\n--- Lote concluído: {resumo['buscas']} busca(s), {resumo['vagas']} vaga(s), {resumo['duplicadas']} repetida(s) descartada(s), {resumo['erros']} erro(s). Resultados em '{args.saida}' ---")
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Métricas de tempo das chamadas à API e da interface.
+#
+# Cada etapa de uma chamada (conexão, tempo até o primeiro byte, download, leitura do JSON),
+# a transformação das vagas e a renderização do painel são registradas em histogramas;
+# esperas do limitador, respostas 429 e repetições são contadores. Tudo fica em memória e é
+# gravado ao fim do programa (e ao fim de cada busca no painel) no arquivo indicado em
+# VAGAS_METRICAS: texto no formato do Prometheus (ex: metricas.prom, para o textfile collector
+# do node_exporter) ou um instantâneo em JSON (extensão .json).
+#
+# Uso: VAGAS_METRICAS=metricas.json python vagas.py
+#      python metricas.py metricas.json   (resume um instantâneo gravado)
+
+import argparse
+import atexit
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Arquivo de saída (.json = instantâneo JSON; qualquer outra extensão = texto do Prometheus)
+ARQUIVO_METRICAS = os.environ.get("VAGAS_METRICAS")
+
+# Limites superiores dos baldes dos histogramas, em segundos (o último balde é +Inf)
+BALDES_PADRAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Texto do "# HELP" de cada métrica na exportação para o Prometheus
+DESCRICOES = {
+    "vagas_requisicao_segundos": "Duração total de cada chamada HTTP à API (até os cabeçalhos, ou o corpo inteiro sem streaming).",
+    "vagas_conexao_segundos": "Abertura de conexões novas: DNS + TCP + TLS.",
+    "vagas_primeiro_byte_segundos": "Do envio da requisição até os cabeçalhos da resposta (tempo até o primeiro byte).",
+    "vagas_download_segundos": "Tempo esperando os bytes do corpo da resposta.",
+    "vagas_json_segundos": "Tempo lendo o JSON (ou os eventos do chat) da resposta.",
+    "vagas_transformacao_segundos": "Transformação das vagas de uma busca para o formato do painel.",
+    "vagas_renderizacao_segundos": "Renderização no painel (tela='vaga': exibir um card; tela='atualizacao': page.update).",
+    "vagas_limitador_espera_segundos": "Esperas na fila do limitador de requisições.",
+    "vagas_limitador_esperas_total": "Requisições que esperaram na fila do limitador.",
+    "vagas_respostas_429_total": "Respostas 429 (limite de requisições) recebidas da API.",
+    "vagas_bytes_recebidos_total": "Bytes recebidos nos corpos das respostas em streaming, como vieram da rede (comprimidos).",
+    "vagas_repeticoes_total": "Requisições repetidas após erro 5xx ou falha de conexão.",
+    "vagas_duplicatas_total": "Duplicatas enviadas para chamadas lentas.",
+    "vagas_duplicatas_vencedoras_total": "Duplicatas que responderam antes da chamada original.",
+}
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+class Histograma:
+    """
+    Contagem de observações por balde (como o histogram do Prometheus), com soma e total.
+    """
+
+    def __init__(self, baldes: Tuple[float, ...] = BALDES_PADRAO):
+        self.baldes = tuple(baldes)
+        self.contagens = [0] * (len(self.baldes) + 1) # Não acumuladas; a última é o balde +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        self.contagens[bisect.bisect_left(self.baldes, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def quantil(self, fracao: float) -> Optional[float]:
+        """
+        Estimativa do quantil por interpolação linear dentro do balde (como o histogram_quantile).
+        """
+        if not self.total:
+            return None
+        alvo = fracao * self.total
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            if acumulado + contagem >= alvo and contagem:
+                if indice == len(self.baldes):
+                    return self.baldes[-1] # Acima do último limite: só se sabe que passou dele
+                inicio = self.baldes[indice - 1] if indice else 0.0
+                return inicio + (self.baldes[indice] - inicio) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return self.baldes[-1]
+
+
+_histogramas: Dict[Tuple[str, Rotulos], Histograma] = {}
+_contadores: Dict[Tuple[str, Rotulos], float] = {}
+_trava = threading.Lock()
+
+
+def endpoint_da_url(url: str) -> str:
+    """
+    Rótulo curto do endpoint (último trecho do caminho, ex: 'search_jobs' ou 'chat').
+    """
+    return urlsplit(url or "").path.rstrip("/").rsplit("/", 1)[-1] or "/"
+
+
+def _chave(nome: str, rotulos: dict) -> Tuple[str, Rotulos]:
+    return nome, tuple(sorted((rotulo, str(valor)) for rotulo, valor in rotulos.items()))
+
+
+# --- Registro ---
+def observar(nome: str, segundos: float, **rotulos):
+    """
+    Registra uma duração (em segundos) no histograma `nome` com os `rotulos` dados.
+    """
+    chave = _chave(nome, rotulos)
+    with _trava:
+        histograma = _histogramas.get(chave)
+        if histograma is None:
+            histograma = _histogramas[chave] = Histograma()
+        histograma.observar(segundos)
+
+
+def incrementar(nome: str, quantidade: float = 1, **rotulos):
+    chave = _chave(nome, rotulos)
+    with _trava:
+        _contadores[chave] = _contadores.get(chave, 0) + quantidade
+
+
+@contextmanager
+def cronometro(nome: str, **rotulos):
+    """
+    Mede o bloco `with` e registra a duração em `nome` (mesmo se o bloco levantar uma exceção).
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(nome, time.perf_counter() - inicio, **rotulos)
+
+
+def reiniciar():
+    """
+    Esquece todas as medidas (útil em testes e benchmarks).
+    """
+    with _trava:
+        _histogramas.clear()
+        _contadores.clear()
+
+
+# --- Exportação ---
+def instantaneo() -> dict:
+    """
+    Todas as métricas num dicionário serializável em JSON (quantis estimados pelos baldes).
+    """
+    with _trava:
+        histogramas = [(nome, rotulos, list(h.contagens), h.soma, h.total, h.quantil(0.5), h.quantil(0.95), h.baldes)
+                       for (nome, rotulos), h in sorted(_histogramas.items())]
+        contadores = sorted(_contadores.items())
+    return {
+        "gerado_em": time.time(),
+        "contadores": [{"nome": nome, "rotulos": dict(rotulos), "valor": valor} for (nome, rotulos), valor in contadores],
+        "histogramas": [{
+            "nome": nome, "rotulos": dict(rotulos), "total": total, "soma": soma, "p50": p50, "p95": p95,
+            "baldes": {str(limite): contagem for limite, contagem in zip(baldes + ("+Inf",), _acumular(contagens))},
+        } for nome, rotulos, contagens, soma, total, p50, p95, baldes in histogramas],
+    }
+
+
+def _acumular(contagens: list) -> list:
+    acumuladas, soma = [], 0
+    for contagem in contagens:
+        soma += contagem
+        acumuladas.append(soma)
+    return acumuladas
+
+
+def _formatar_rotulos(rotulos: dict, extra: Optional[dict] = None) -> str:
+    todos = dict(rotulos, **(extra or {}))
+    if not todos:
+        return ""
+    escapar = lambda valor: str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{rotulo}="{escapar(valor)}"' for rotulo, valor in todos.items()) + "}"
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if math.isfinite(valor) else "+Inf"
+
+
+def texto_prometheus(dados: Optional[dict] = None) -> str:
+    """
+    As métricas no formato de texto do Prometheus (contadores e histogramas com _bucket/_sum/_count).
+    """
+    dados = dados or instantaneo()
+    linhas = []
+    declaradas = set()
+
+    def declarar(nome: str, tipo: str):
+        if nome not in declaradas:
+            declaradas.add(nome)
+            if nome in DESCRICOES:
+                linhas.append(f"# HELP {nome} {DESCRICOES[nome]}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+    for contador in dados["contadores"]:
+        declarar(contador["nome"], "counter")
+        linhas.append(f"{contador['nome']}{_formatar_rotulos(contador['rotulos'])} {_numero(contador['valor'])}")
+    for histograma in dados["histogramas"]:
+        nome, rotulos = histograma["nome"], histograma["rotulos"]
+        declarar(nome, "histogram")
+        for limite, acumulado in histograma["baldes"].items():
+            linhas.append(f"{nome}_bucket{_formatar_rotulos(rotulos, {'le': limite})} {acumulado}")
+        linhas.append(f"{nome}_sum{_formatar_rotulos(rotulos)} {_numero(histograma['soma'])}")
+        linhas.append(f"{nome}_count{_formatar_rotulos(rotulos)} {histograma['total']}")
+    return "\n".join(linhas) + "\n"
+
+
+def gravar(caminho: Optional[str] = None) -> Optional[str]:
+    """
+    Grava as métricas em `caminho` (padrão: VAGAS_METRICAS; nada é gravado sem nenhum dos dois).
+    A extensão .json grava o instantâneo em JSON; as demais, o texto do Prometheus.
+    O arquivo é substituído de uma vez, então um coletor nunca lê um arquivo pela metade.
+    """
+    caminho = caminho or ARQUIVO_METRICAS
+    if not caminho:
+        return None
+    dados = instantaneo()
+    conteudo = json.dumps(dados, ensure_ascii=False, indent=1) if caminho.lower().endswith(".json") else texto_prometheus(dados)
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+atexit.register(gravar) # Só grava se VAGAS_METRICAS estiver definida
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume um instantâneo de métricas gravado em JSON.")
+    parser.add_argument("arquivo", help="Arquivo .json gravado com VAGAS_METRICAS=arquivo.json.")
+    args = parser.parse_args()
+
+    with open(args.arquivo, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    print(f"{'Histograma':<58} {'total':>7} {'p50 ms':>9} {'p95 ms':>9} {'soma s':>9}")
+    for histograma in dados["histogramas"]:
+        nome = histograma["nome"] + _formatar_rotulos(histograma["rotulos"])
+        p50, p95 = histograma["p50"], histograma["p95"]
+        print(f"{nome:<58} {histograma['total']:>7} {(p50 or 0) * 1000:>9.1f} {(p95 or 0) * 1000:>9.1f} {histograma['soma']:>9.2f}")
+    print(f"\n{'Contador':<58} {'valor':>7}")
+    for contador in dados["contadores"]:
+        print(f"{contador['nome'] + _formatar_rotulos(contador['rotulos']):<58} {contador['valor']:>7.0f}")
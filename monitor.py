@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Modo "monitorar": repete um conjunto de buscas salvas e mostra só o que é novo.
+#
+# Para cada busca guardamos um conjunto compacto de vagas já vistas (id -> impressão digital
+# curta do conteúdo) e a data da última consulta. A cada rodada:
+#   - `hours_old` é reduzido ao tempo desde a última consulta (respostas menores);
+#   - só vagas novas ou alteradas são exibidas;
+#   - o intervalo entre rodadas respeita o limite de requisições do plano.
+#
+# Uso: python vagas.py --monitorar buscas.jsonl [--intervalo 600] [--plano pro]
+
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import cache_buscas
+import limitador
+import lote
+import vagas
+
+CAMINHO_ESTADO_PADRAO = os.path.join(cache_buscas.DIRETORIO_CACHE, "monitor_estado.json")
+INTERVALO_PADRAO = 10 * 60            # Segundos entre rodadas
+RETENCAO_VISTOS = 14 * 24 * 60 * 60   # Esquece vagas que não aparecem há 14 dias
+FOLGA_HORAS = 1                       # Hora extra de sobreposição entre consultas
+
+# Campos que, se mudarem, fazem a vaga ser exibida de novo como "alterada".
+CAMPOS_IMPRESSAO = ("title", "company", "location", "job_type", "salary_from", "salary_to",
+                    "salary_avg", "salary_unit", "work_from_home_type", "description")
+
+
+def impressao_digital(job: dict) -> str:
+    """
+    Resumo de 8 bytes do conteúdo relevante da vaga (para detectar alterações).
+    """
+    conteudo = json.dumps([job.get(campo) for campo in CAMPOS_IMPRESSAO], ensure_ascii=False, default=str)
+    return hashlib.blake2b(conteudo.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def identificador(job: dict) -> str:
+    return job.get("id") or job.get("job_url") or impressao_digital(job)
+
+
+# --- Estado persistido ---
+def carregar_estado(caminho: str = CAMINHO_ESTADO_PADRAO) -> dict:
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def salvar_estado(estado: dict, caminho: str = CAMINHO_ESTADO_PADRAO):
+    # Grava num arquivo temporário e troca de uma vez, para nunca deixar o estado pela metade
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporario, caminho)
+
+
+def calcular_hours_old(configurado: Optional[int], ultima_consulta: Optional[float], agora: float) -> Optional[int]:
+    """
+    Reduz `hours_old` ao intervalo desde a última consulta (arredondado para cima, mais uma hora de folga),
+    sem nunca passar do valor configurado na busca salva.
+    """
+    if ultima_consulta is None:
+        return configurado
+    desde_ultima = math.ceil(max(0.0, agora - ultima_consulta) / 3600) + FOLGA_HORAS
+    return desde_ultima if configurado is None else min(int(configurado), desde_ultima)
+
+
+def separar_novidades(estado_busca: dict, jobs: Iterable[dict], agora: float) -> List[Tuple[str, dict]]:
+    """
+    Compara as vagas com o conjunto já visto e devolve [(tipo, vaga)], com tipo 'nova' ou 'alterada'.
+    Atualiza o conjunto visto (e a data de publicação mais recente) no próprio `estado_busca`.
+    """
+    vistos = estado_busca.setdefault("vistos", {})
+    novidades = []
+    for job in jobs:
+        chave = identificador(job)
+        impressao = impressao_digital(job)
+        anterior = vistos.get(chave)
+        if anterior is None:
+            novidades.append(("nova", job))
+        elif anterior[0] != impressao:
+            novidades.append(("alterada", job))
+        vistos[chave] = [impressao, agora]
+        data = job.get("date_posted")
+        if isinstance(data, str) and data > (estado_busca.get("ultima_publicacao") or ""):
+            estado_busca["ultima_publicacao"] = data
+
+    # Mantém o conjunto compacto: remove vagas que não aparecem há muito tempo
+    for chave in [chave for chave, (_, visto_em) in vistos.items() if agora - visto_em > RETENCAO_VISTOS]:
+        del vistos[chave]
+    return novidades
+
+
+def intervalo_minimo(quantidade_buscas: int, api_key: str) -> float:
+    """
+    Menor intervalo entre rodadas que cabe na cota do plano da chave.
+    """
+    limite = limitador.LIMITES_POR_PLANO[limitador.obter_plano(api_key)]
+    return quantidade_buscas * (limitador.PERIODO_LIMITE + limitador.FOLGA_SEGUNDOS) / limite
+
+
+def executar_rodada(buscas: List[dict], api_key: str, estado: dict, url: Optional[str] = None,
+                    ao_encontrar: Optional[Callable[[dict, str, dict], None]] = None) -> int:
+    """
+    Consulta cada busca salva uma vez e chama `ao_encontrar(busca, tipo, vaga)` para cada novidade.
+    Retorna quantas novidades foram encontradas.
+    """
+    url = url or f"{vagas.BASE_URL}/search_jobs"
+    total = 0
+    for busca in buscas:
+        chave = cache_buscas.gerar_chave(url, busca)
+        estado_busca = estado.setdefault(chave, {})
+        agora = time.time()
+        payload = dict(busca, hours_old=calcular_hours_old(busca.get("hours_old"), estado_busca.get("ultima_consulta"), agora))
+
+        resultado = lote.executar_busca(payload, api_key, url)
+        if "error" in resultado:
+            print(f"\nNão foi possível consultar '{busca.get('search_term')}' agora: {resultado['error']}")
+            continue # Não avança `ultima_consulta`: a próxima rodada cobre o intervalo perdido
+
+        novidades = separar_novidades(estado_busca, resultado["jobs"], agora)
+        estado_busca["ultima_consulta"] = agora
+        for tipo, job in novidades:
+            if ao_encontrar is not None:
+                ao_encontrar(busca, tipo, job)
+        total += len(novidades)
+    return total
+
+
+def monitorar(caminho_buscas: str, api_key: str, intervalo: float = INTERVALO_PADRAO,
+              caminho_estado: str = CAMINHO_ESTADO_PADRAO, rodadas: Optional[int] = None):
+    """
+    Executa rodadas de consulta até ser interrompido (Ctrl+C) ou completar `rodadas`.
+    """
+    buscas = []
+    for numero, payload in lote.ler_buscas(caminho_buscas):
+        if isinstance(payload, str):
+            print(f"Linha {numero} de '{caminho_buscas}' ignorada: {payload}")
+        else:
+            buscas.append(payload)
+    if not buscas:
+        print("Nenhuma busca válida para monitorar.")
+        return
+
+    minimo = intervalo_minimo(len(buscas), api_key)
+    if intervalo < minimo:
+        print(f"Intervalo ajustado de {intervalo:.0f}s para {minimo:.0f}s para caber no limite do plano '{limitador.obter_plano(api_key)}'.")
+        intervalo = minimo
+
+    contador = {"vagas": 0}
+
+    def exibir_novidade(busca: dict, tipo: str, job: dict):
+        contador["vagas"] += 1
+        local = ", ".join(parte for parte in (busca.get("location"), busca.get("country")) if parte)
+        print(f"\n[{tipo.upper()}] Busca '{busca.get('search_term')}' em '{local}'")
+        vagas.exibir_vaga(contador["vagas"], job)
+
+    estado = carregar_estado(caminho_estado)
+    rodada = 0
+    print(f"\n##### Monitorando {len(buscas)} busca(s) a cada {intervalo:.0f}s (Ctrl+C para sair) #####")
+    try:
+        while rodadas is None or rodada < rodadas:
+            inicio = time.monotonic()
+            novidades = executar_rodada(buscas, api_key, estado, ao_encontrar=exibir_novidade)
+            salvar_estado(estado, caminho_estado)
+            rodada += 1
+            print(f"\n--- Rodada {rodada} concluída às {time.strftime('%H:%M:%S')}: {novidades} novidade(s). ---")
+            if rodadas is not None and rodada >= rodadas:
+                break
+            time.sleep(max(0.0, intervalo - (time.monotonic() - inicio)))
+    except KeyboardInterrupt:
+        salvar_estado(estado, caminho_estado)
+        print("\nMonitoramento encerrado. Até a próxima!")
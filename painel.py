@@ -1,8 +1,16 @@
 import flet as ft
 import asyncio
-import pandas as pd
-import requests # <--- ADICIONADO: Para fazer requisições HTTP
 import json     # <--- ADICIONADO: Para manipular dados JSON
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import descricoes # Só a biblioteca padrão: divide as descrições longas em páginas no "Ver Mais..."
+import metricas # Só a biblioteca padrão: mede a renderização e grava as métricas ao fim de cada busca
+
+# Inicialização rápida: requests, numpy e os módulos da busca (cliente_api, cache_buscas, arquivo_vagas,
+# deduplicacao, json_incremental, busca_paises) são importados só quando o modo de busca é usado.
 
 # --- Configurações Iniciais ---
 SPACE_BACKGROUND_URL = "background.jpeg"
@@ -20,8 +28,91 @@ SPACE_COLORS = {
 
 current_mode = "chat_ai"
 # Variáveis globais para a busca de vagas
-all_found_jobs = []
+all_found_jobs = [] # Vagas navegáveis (todas, ou a visão filtrada/ordenada por salário ou relevância)
 current_job_index = 0
+received_jobs = [] # Vagas da busca na ordem em que chegaram
+salary_index = None # salarios.IndiceSalarios das vagas recebidas (mesmas posições de received_jobs)
+relevance_index = None # relevancia.IndiceRelevancia das vagas recebidas, montado no primeiro uso do filtro
+searched_title = "" # Título da busca atual, usado como consulta da relevância
+searched_api = None # (URL, chave) da busca atual, para pedir a descrição completa no "Ver Mais..."
+loading_jobs = False # True enquanto as vagas da busca atual ainda estão chegando
+cancel_current_search = None # threading.Event da busca em andamento (sinalizado ao trocar de modo)
+chat_cancel_event = threading.Event() # Sinalizado ao trocar de modo: as respostas em andamento param de chegar
+chat_session = None # conversa.SessaoChat do modo chat (contexto da conversa atual); recriada ao trocar de modo
+
+# --- Limites da Interface ---
+MAX_CHAT_HISTORY_CONTROLS = 200 # Mensagens mantidas na tela; as mais antigas são descartadas
+MAX_CACHED_JOB_CARDS = 16       # Cards de vaga já montados guardados para a navegação
+
+# Uma única thread monta os cards vizinhos em segundo plano, sem competir com a UI
+card_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="card-prefetch")
+
+
+class UpdateScheduler:
+    """
+    Junta as alterações feitas nos controles num único page.update() por volta do loop de eventos.
+    Pode ser chamado tanto do loop quanto de threads (handlers síncronos do Flet rodam em threads).
+    """
+
+    def __init__(self, page: ft.Page, loop: asyncio.AbstractEventLoop):
+        self._page = page
+        self._loop = loop
+        self._pending = False
+        self._lock = threading.Lock()
+        self.flush_count = 0
+
+    def request(self):
+        with self._lock:
+            if self._pending:
+                return # Já existe um envio agendado para esta volta do loop
+            self._pending = True
+        self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self):
+        with self._lock:
+            self._pending = False
+        self.flush_count += 1
+        try:
+            with metricas.cronometro("vagas_renderizacao_segundos", tela="atualizacao"):
+                self._page.update()
+        except Exception as e:
+            print(f"DEBUG: Erro ao atualizar a página: {e}")
+
+
+class JobCardCache:
+    """
+    LRU dos cards de vaga já montados, indexados pela posição na lista de vagas atual.
+    Um card só é reaproveitado para o mesmo dicionário de vaga e a mesma largura de janela.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_JOB_CARDS):
+        self.max_size = max_size
+        self._cards = OrderedDict() # índice -> (vaga, largura, controle)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, index: int, job: dict, width: float):
+        with self._lock:
+            item = self._cards.get(index)
+            if item is not None and item[0] is job and item[1] == width:
+                self._cards.move_to_end(index)
+                self.hits += 1
+                return item[2]
+            self.misses += 1
+            return None
+
+    def put(self, index: int, job: dict, width: float, card: ft.Control):
+        with self._lock:
+            self._cards[index] = (job, width, card)
+            self._cards.move_to_end(index)
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cards.clear()
+
 
 async def main(page: ft.Page):
     page.title = "Assistente Espacial de IA e Vagas"
@@ -35,6 +126,10 @@ async def main(page: ft.Page):
     page.spacing = 0
     page.bgcolor = SPACE_COLORS["background"]
 
+    update_scheduler = UpdateScheduler(page, asyncio.get_running_loop())
+    schedule_update = update_scheduler.request
+    job_card_cache = JobCardCache()
+
     try:
         page.appbar = ft.AppBar(
             title=ft.Text("🚀 Space AI & Job Finder 🛰️", color=SPACE_COLORS["text"], weight=ft.FontWeight.BOLD),
@@ -63,7 +158,7 @@ async def main(page: ft.Page):
         )
 
         welcome_message_ref = ft.Ref[ft.Text]()
-        chat_history_ref = ft.Ref[ft.Column]()
+        chat_history_ref = ft.Ref[ft.ListView]()
         chat_input_field_ref = ft.Ref[ft.TextField]()
         send_button_ref = ft.Ref[ft.FloatingActionButton]()
         job_search_form_ref = ft.Ref[ft.Column]()
@@ -77,9 +172,15 @@ async def main(page: ft.Page):
         job_location_field_ref = ft.Ref[ft.TextField]()
         job_remote_dropdown_ref = ft.Ref[ft.Dropdown]()
         job_hours_field_ref = ft.Ref[ft.TextField]()
+        job_offline_switch_ref = ft.Ref[ft.Switch]()
         job_search_button_ref = ft.Ref[ft.ElevatedButton]()
         new_search_button_ref = ft.Ref[ft.ElevatedButton]()
         job_navigation_buttons_ref = ft.Ref[ft.Row]() 
+        job_counter_text_ref = ft.Ref[ft.Text]()
+        job_salary_controls_ref = ft.Ref[ft.Row]()
+        min_salary_field_ref = ft.Ref[ft.TextField]()
+        sort_by_salary_switch_ref = ft.Ref[ft.Switch]()
+        relevance_switch_ref = ft.Ref[ft.Switch]()
 
         page.add(
             ft.Stack(
@@ -101,12 +202,13 @@ async def main(page: ft.Page):
                                             visible=True,
                                             ref=welcome_message_ref
                                         ),
-                                        ft.Column(
+                                        # ListView só constrói as mensagens visíveis e rola sozinha para a última
+                                        ft.ListView(
                                             [],
                                             expand=True,
                                             spacing=10,
-                                            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                                            scroll=ft.ScrollMode.ADAPTIVE, 
+                                            auto_scroll=True,
+                                            build_controls_on_demand=True,
                                             ref=chat_history_ref
                                         ),
                                         ft.Row(
@@ -136,79 +238,9 @@ async def main(page: ft.Page):
                                             spacing=10,
                                             visible=True
                                         ),
+                                        # Formulário de busca: os campos só são montados na primeira vez que o modo é aberto
                                         ft.Column(
-                                            [
-                                                # --- ADICIONADO: Campos para URL e Chave da API ---
-                                                ft.TextField(
-                                                    label="URL da API (Endpoint de busca)",
-                                                    hint_text="ex: http://seuservidor.com/search_jobs",
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=api_url_field_ref
-                                                ),
-                                                ft.TextField(
-                                                    label="Sua Chave de API (X-API-Key)",
-                                                    password=True,
-                                                    can_reveal_password=True,
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=api_key_field_ref
-                                                ),
-                                                ft.Divider(height=10, color=ft.Colors.TRANSPARENT), # Espaçador
-                                                
-                                                ft.TextField(
-                                                    label="Título da Vaga (ex: Analista de Dados)",
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=job_title_field_ref
-                                                ),
-                                                ft.TextField(
-                                                    label="País (em inglês, ex: brazil, usa)",
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=job_country_field_ref
-                                                ),
-                                                ft.TextField(
-                                                    label="Localidade (cidade ou 'Home Office')",
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=job_location_field_ref
-                                                ),
-                                                ft.Dropdown(
-                                                    label="Tipo de Trabalho",
-                                                    options=[
-                                                        ft.dropdown.Option("Ambos"),
-                                                        ft.dropdown.Option("Remoto"),
-                                                        ft.dropdown.Option("Presencial"),
-                                                    ],
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    label_style=ft.TextStyle(color=SPACE_COLORS["text"]), text_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"],
-                                                    value="Ambos",
-                                                    ref=job_remote_dropdown_ref
-                                                ),
-                                                ft.TextField(
-                                                    label="Horas atrás (0 para 'Hoje')",
-                                                    keyboard_type=ft.KeyboardType.NUMBER,
-                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
-                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
-                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
-                                                    ref=job_hours_field_ref
-                                                ),
-                                                ft.ElevatedButton(
-                                                    "🚀 Buscar Vagas",
-                                                    on_click=None,
-                                                    bgcolor=SPACE_COLORS["primary"],
-                                                    color=SPACE_COLORS["text"],
-                                                    style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=10)),
-                                                    ref=job_search_button_ref
-                                                )
-                                            ],
+                                            [],
                                             spacing=15,
                                             visible=False,
                                             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -224,6 +256,7 @@ async def main(page: ft.Page):
                                                     style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=10)),
                                                     data="previous"
                                                 ),
+                                                ft.Text("", color=SPACE_COLORS["text"], ref=job_counter_text_ref),
                                                 ft.ElevatedButton(
                                                     "Próxima ▶️",
                                                     on_click=None,
@@ -238,6 +271,42 @@ async def main(page: ft.Page):
                                             visible=False, 
                                             ref=job_navigation_buttons_ref
                                         ),
+                                        ft.Row(
+                                            [
+                                                ft.TextField(
+                                                    label="Salário anual mínimo",
+                                                    hint_text="ex: 30000",
+                                                    width=220,
+                                                    keyboard_type=ft.KeyboardType.NUMBER,
+                                                    border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                                                    text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                                                    filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                                                    on_submit=None,
+                                                    ref=min_salary_field_ref
+                                                ),
+                                                ft.Switch(
+                                                    label="Ordenar por salário",
+                                                    value=False,
+                                                    active_color=SPACE_COLORS["accent"],
+                                                    label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                                                    on_change=None,
+                                                    ref=sort_by_salary_switch_ref
+                                                ),
+                                                ft.Switch(
+                                                    label="Só as relevantes",
+                                                    tooltip="Oculta as vagas pouco relacionadas ao título buscado e mostra as mais relevantes primeiro",
+                                                    value=False,
+                                                    active_color=SPACE_COLORS["accent"],
+                                                    label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                                                    on_change=None,
+                                                    ref=relevance_switch_ref
+                                                ),
+                                            ],
+                                            alignment=ft.MainAxisAlignment.CENTER,
+                                            spacing=20,
+                                            visible=False,
+                                            ref=job_salary_controls_ref
+                                        ),
                                         ft.ElevatedButton(
                                             "🔄 Nova Busca / Voltar ao Chat",
                                             on_click=lambda e: switch_mode(current_mode),
@@ -266,7 +335,15 @@ async def main(page: ft.Page):
         return
 
     # --- Funções Auxiliares para Mensagens ---
+    def append_to_history(control: ft.Control):
+        # Mantém o histórico limitado: descarta as mensagens mais antigas da tela
+        history = chat_history_ref.current.controls
+        history.append(control)
+        if len(history) > MAX_CHAT_HISTORY_CONTROLS:
+            del history[:len(history) - MAX_CHAT_HISTORY_CONTROLS]
+
     def add_message(sender: str, message: str, color: str = SPACE_COLORS["text"]):
+        # Retorna o ft.Text da mensagem, para quem precisar atualizá-lo depois (ex: resposta em streaming)
         message_margin_bottom = 15
         message_bubble_width = min(page.window_width * 0.75, 600) 
 
@@ -298,10 +375,11 @@ async def main(page: ft.Page):
             if sender != "Sistema" or ("Processando" not in display_message and "Buscando vagas" not in display_message and "Bem-vindo" not in display_message):
                 message_content_controls.append(ft.Text(f"**{sender}:**", size=11, color=message_text_color, weight=ft.FontWeight.BOLD))
             
-            message_content_controls.append(ft.Text(display_message, color=message_text_color, size=14, selectable=True, text_align=ft.TextAlign.START))
+            message_text = ft.Text(display_message, color=message_text_color, size=14, selectable=True, text_align=ft.TextAlign.START)
+            message_content_controls.append(message_text)
 
 
-            chat_history_ref.current.controls.append(
+            append_to_history(
                 ft.Row(
                     [
                         ft.Container(
@@ -323,17 +401,14 @@ async def main(page: ft.Page):
                     wrap=False 
                 )
             )
-            page.update()
-            if chat_history_ref.current:
-                 chat_history_ref.current.scroll_to(offset=-1, duration=500)
+            schedule_update()
+            return message_text
         except Exception as e:
             print(f"DEBUG: Erro crítico ao tentar adicionar mensagem '{message}' à UI: {e}")
             page.add(ft.Text(f"Erro interno de UI (add_message): {e}", color=ft.Colors.RED_500))
-            page.update()
 
     def show_loading(message: str):
         add_message("Sistema", message, color=SPACE_COLORS["accent"])
-        page.update()
 
     def hide_loading():
         try:
@@ -347,7 +422,7 @@ async def main(page: ft.Page):
                        isinstance(message_text_control, ft.Text) and \
                        ("Processando" in message_text_control.value or "Buscando vagas" in message_text_control.value):
                         chat_history_ref.current.controls.pop()
-                        page.update()
+                        schedule_update()
         except Exception as e:
             print(f"DEBUG: Erro ao esconder mensagem de loading: {e}")
 
@@ -357,27 +432,56 @@ async def main(page: ft.Page):
 
     # --- Nova função para mostrar descrição completa em um diálogo (Reintroduzida) ---
     def show_full_description(e, description_text):
-        print(f"DEBUG: Descrição recebida para 'Ver Mais...' (primeiros 200 caracteres): {description_text[:200]}...")
-        print(f"DEBUG: Comprimento total da descrição recebida: {len(description_text)} caracteres.")
+        # Descrições longas são exibidas em páginas: um Markdown gigante trava a UI ao abrir
+        # Retorna uma função para trocar o texto exibido (ex: quando a descrição completa chega)
+        pages = descricoes.paginar(description_text)
+        page_index = 0
+
+        description_markdown = ft.Markdown(
+            pages[0], 
+            extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
+            selectable=True,
+            # Adicione on_tap_link se houver links dentro da descrição
+            on_tap_link=lambda e: page.launch_url(e.data),
+        )
+        page_counter_text = ft.Text("", size=12, color=SPACE_COLORS["text"])
+        previous_page_button = ft.TextButton("◀ Anterior", on_click=lambda e: go_to_page(page_index - 1),
+                                             style=ft.ButtonStyle(color=SPACE_COLORS["accent"]))
+        next_page_button = ft.TextButton("Próxima ▶", on_click=lambda e: go_to_page(page_index + 1),
+                                         style=ft.ButtonStyle(color=SPACE_COLORS["accent"]))
+        page_navigation = ft.Row([previous_page_button, page_counter_text, next_page_button],
+                                 alignment=ft.MainAxisAlignment.CENTER)
+        description_column = ft.Column(
+            [
+                # Usando ft.Markdown aqui para renderizar a descrição completa com formatação
+                description_markdown,
+            ],
+            scroll=ft.ScrollMode.ADAPTIVE, 
+            expand=True 
+        )
+
+        def go_to_page(index):
+            nonlocal page_index
+            page_index = max(0, min(index, len(pages) - 1))
+            description_markdown.value = pages[page_index]
+            page_counter_text.value = f"Página {page_index + 1} de {len(pages)}"
+            previous_page_button.disabled = page_index == 0
+            next_page_button.disabled = page_index == len(pages) - 1
+            page_navigation.visible = len(pages) > 1
+            if page_navigation.visible and description_column.page:
+                description_column.scroll_to(offset=0) # Cada página começa do topo
+            schedule_update()
+
+        def set_description(text):
+            nonlocal pages
+            pages = descricoes.paginar(text)
+            go_to_page(0)
 
         page.dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text("Descrição Completa da Vaga", color=SPACE_COLORS["text"]),
             content=ft.Container(
-                content=ft.Column(
-                    [
-                        # Usando ft.Markdown aqui para renderizar a descrição completa com formatação
-                        ft.Markdown(
-                            description_text, 
-                            extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
-                            selectable=True,
-                            # Adicione on_tap_link se houver links dentro da descrição
-                            on_tap_link=lambda e: page.launch_url(e.data),
-                        ),
-                    ],
-                    scroll=ft.ScrollMode.ADAPTIVE, 
-                    expand=True 
-                ),
+                content=ft.Column([description_column, page_navigation], expand=True),
                 width=page.window_width * 0.8, 
                 height=page.window_height * 0.7, 
                 padding=10,
@@ -392,17 +496,141 @@ async def main(page: ft.Page):
             shape=ft.RoundedRectangleBorder(radius=15),
         )
         page.dialog.open = True
-        page.update()
+        go_to_page(0)
+        return set_description
+
+    async def open_full_description(e):
+        # A busca do painel recebe só uma prévia da descrição (projecao.py): a completa é pedida aqui
+        job = e.control.data
+        description = job.get('description', 'Descrição não disponível') # Lida do armazém só agora (descricoes.py)
+        if not job.get('description_truncated') or searched_api is None:
+            show_full_description(e, description)
+            return
+        set_description = show_full_description(e, f"{description}...\n\n*Carregando a descrição completa...*")
+
+        def load_description():
+            import busca_paises # Imports locais: já carregados pela busca
+            import projecao
+            import arquivo_vagas
+            try:
+                full_description = projecao.buscar_descricao(*searched_api, job)
+            except Exception as ex_description:
+                return None, busca_paises.descrever_erro(ex_description)
+            arquivo_vagas.completar_descricao(job, full_description) # A busca offline passa a ter o texto inteiro
+            return full_description, None
+
+        full_description, error_message = await asyncio.to_thread(load_description)
+        if error_message:
+            set_description(f"{description}...\n\n*Não foi possível carregar a descrição completa: {error_message}*")
+        else:
+            job['description'], job['description_truncated'] = full_description, False # Próximas aberturas não vão à rede
+            set_description(full_description)
 
     def close_dialog(page):
         page.dialog.open = False
-        page.update()
+        schedule_update()
+
+    # --- Montagem e cache dos cards de vaga ---
+    def build_job_card(job, max_card_width):
+        title_text = job.get('title', 'Título não disponível')
+        company_text = job.get('company', 'Empresa não disponível')
+        location_text = job.get('location', 'Localização não disponível')
+        is_remote_text = 'Sim ✅' if job.get('is_remote') else 'Não ❌'
+        date_posted_text = job.get('date_posted', 'Data não disponível')
+        full_description = job.get('description', 'Descrição não disponível') 
+        job_type_text = job.get('job_type', 'Não disponível') 
+        salary_text = job.get('salary', 'Não disponível')
+        if job.get('annual_salary') is not None:
+            import salarios # Já carregado pela busca (transformacao.py)
+            salary_text += f" | ≈ {salarios.formatar_salario_anual(job['annual_salary'])}"
+
+        has_more = len(full_description) > 250 or job.get('description_truncated')
+        display_description = full_description
+        if has_more: 
+            display_description = full_description[:250] + "..."
+
+        job_url = job.get('job_url')
+
+        card_content_controls = [
+            ft.Text(f"💼 **{title_text}**", size=16, weight=ft.FontWeight.BOLD, color=SPACE_COLORS["text"])
+        ]
+
+        if job_url and isinstance(job_url, str) and job_url.strip().startswith('http'):
+            card_content_controls.append(ft.Markdown(
+                f"🔗 [Link da Vaga]({job_url})",
+                extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
+                on_tap_link=lambda e: page.launch_url(e.data),
+                selectable=True,
+            ))
+        else:
+            card_content_controls.append(ft.Text("🔗 Link da Vaga: Não disponível ou inválido", size=12, color=ft.Colors.with_opacity(0.8, SPACE_COLORS["text"])))
+
+        card_content_controls.extend([
+            ft.Text(f"🏢 Empresa: {company_text}", size=12, color=SPACE_COLORS["text"]),
+            ft.Text(f"📍 Localização: {location_text}", size=12, color=SPACE_COLORS["text"]),
+            ft.Text(f"🌍 Remoto: {is_remote_text}", size=12, color=SPACE_COLORS["text"]),
+            ft.Text(f"📅 Postado: {date_posted_text}", size=12, color=SPACE_COLORS["text"]),
+            ft.Text(f"💰 Salário: {salary_text}", size=12, color=SPACE_COLORS["text"]), 
+            ft.Text(f"🏷️ Tipo de Vaga: {job_type_text}", size=12, color=SPACE_COLORS["text"]), 
+            ft.Text(f"📝 Descrição:\n{display_description}", size=12, color=ft.Colors.with_opacity(0.9, SPACE_COLORS["text"]), selectable=True)
+        ])
+
+        if has_more: 
+            card_content_controls.append(
+                ft.TextButton(
+                    "Ver Mais...",
+                    data=job,
+                    on_click=open_full_description,
+                    style=ft.ButtonStyle(color=SPACE_COLORS["accent"])
+                )
+            )
+
+        return ft.Row(
+            [
+                ft.Card(
+                    content=ft.Container(
+                        ft.Column(card_content_controls, spacing=5, horizontal_alignment=ft.CrossAxisAlignment.START),
+                        padding=ft.padding.all(15),
+                        bgcolor=SPACE_COLORS["surface"],
+                        border_radius=15,
+                        border=ft.border.all(1, SPACE_COLORS["primary_dark"]),
+                        width=max_card_width 
+                    ),
+                    elevation=5,
+                    margin=ft.margin.only(bottom=15)
+                )
+            ],
+            alignment=ft.MainAxisAlignment.CENTER, 
+            expand=True 
+        )
+
+    def get_job_card(job_data_list, index):
+        # Reaproveita o card já montado (inclusive por prefetch) ou monta e guarda no cache
+        job = job_data_list[index]
+        max_card_width = min(page.window_width * 0.8, 700)
+        card = job_card_cache.get(index, job, max_card_width)
+        if card is None:
+            card = build_job_card(job, max_card_width)
+            job_card_cache.put(index, job, max_card_width, card)
+        return card
+
+    def prefetch_neighbor_cards(job_data_list, index):
+        # Roda fora do loop da UI: deixa prontos os cards de "Próxima" e "Anterior"
+        for neighbor in (index + 1, index - 1):
+            if 0 <= neighbor < len(job_data_list):
+                try:
+                    get_job_card(job_data_list, neighbor)
+                except Exception as ex_prefetch:
+                    print(f"DEBUG: Falha ao pré-montar o card da vaga {neighbor+1}: {ex_prefetch}")
 
     # --- Função para exibir uma única vaga ---
     def display_single_job(job_data_list, index):
+        with metricas.cronometro("vagas_renderizacao_segundos", tela="vaga"):
+            show_job(job_data_list, index)
+
+    def show_job(job_data_list, index):
         global current_job_index
         chat_history_ref.current.controls.clear() 
-        page.update()
 
         if not job_data_list or index < 0 or index >= len(job_data_list):
             add_message("Sistema", "Não há mais vagas para exibir.", color=SPACE_COLORS["accent"])
@@ -410,93 +638,36 @@ async def main(page: ft.Page):
             return
 
         job = job_data_list[index]
-        max_card_width = min(page.window_width * 0.8, 700) 
 
         try:
-            title_text = job.get('title', 'Título não disponível')
-            company_text = job.get('company', 'Empresa não disponível')
-            location_text = job.get('location', 'Localização não disponível')
-            is_remote_text = 'Sim ✅' if job.get('is_remote') else 'Não ❌'
-            date_posted_text = job.get('date_posted', 'Data não disponível')
-            full_description = job.get('description', 'Descrição não disponível') 
-            job_type_text = job.get('job_type', 'Não disponível') 
-            salary_text = job.get('salary', 'Não disponível')
-
-            display_description = full_description
-            if len(full_description) > 250: 
-                display_description = full_description[:250] + "..."
-
-            job_url = job.get('job_url')
-
-            card_content_controls = [
-                ft.Text(f"💼 **{title_text}**", size=16, weight=ft.FontWeight.BOLD, color=SPACE_COLORS["text"])
-            ]
+            append_to_history(get_job_card(job_data_list, index))
 
-            if job_url and isinstance(job_url, str) and job_url.strip().startswith('http'):
-                card_content_controls.append(ft.Markdown(
-                    f"🔗 [Link da Vaga]({job_url})",
-                    extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
-                    on_tap_link=lambda e: page.launch_url(e.data),
-                    selectable=True,
-                ))
-            else:
-                card_content_controls.append(ft.Text("🔗 Link da Vaga: Não disponível ou inválido", size=12, color=ft.Colors.with_opacity(0.8, SPACE_COLORS["text"])))
-
-            card_content_controls.extend([
-                ft.Text(f"🏢 Empresa: {company_text}", size=12, color=SPACE_COLORS["text"]),
-                ft.Text(f"📍 Localização: {location_text}", size=12, color=SPACE_COLORS["text"]),
-                ft.Text(f"🌍 Remoto: {is_remote_text}", size=12, color=SPACE_COLORS["text"]),
-                ft.Text(f"📅 Postado: {date_posted_text}", size=12, color=SPACE_COLORS["text"]),
-                ft.Text(f"💰 Salário: {salary_text}", size=12, color=SPACE_COLORS["text"]), 
-                ft.Text(f"🏷️ Tipo de Vaga: {job_type_text}", size=12, color=SPACE_COLORS["text"]), 
-                ft.Text(f"📝 Descrição:\n{display_description}", size=12, color=ft.Colors.with_opacity(0.9, SPACE_COLORS["text"]), selectable=True)
-            ])
-
-            if len(full_description) > 250: 
-                card_content_controls.append(
-                    ft.TextButton(
-                        "Ver Mais...",
-                        on_click=lambda e, desc=full_description: show_full_description(e, desc),
-                        style=ft.ButtonStyle(color=SPACE_COLORS["accent"])
-                    )
-                )
-            
-            chat_history_ref.current.controls.append(
-                ft.Row(
-                    [
-                        ft.Card(
-                            content=ft.Container(
-                                ft.Column(card_content_controls, spacing=5, horizontal_alignment=ft.CrossAxisAlignment.START),
-                                padding=ft.padding.all(15),
-                                bgcolor=SPACE_COLORS["surface"],
-                                border_radius=15,
-                                border=ft.border.all(1, SPACE_COLORS["primary_dark"]),
-                                width=max_card_width 
-                            ),
-                            elevation=5,
-                            margin=ft.margin.only(bottom=15)
-                        )
-                    ],
-                    alignment=ft.MainAxisAlignment.CENTER, 
-                    expand=True 
-                )
-            )
-            page.update()
-
-            # Habilita/Desabilita botões de navegação
-            job_navigation_buttons_ref.current.controls[0].disabled = (index == 0) # Anterior
-            job_navigation_buttons_ref.current.controls[1].disabled = (index >= len(job_data_list) - 1) # Próxima
+            # Habilita/Desabilita botões de navegação (agenda a atualização do card junto)
             job_navigation_buttons_ref.current.visible = True
-            
-            page.update()
+            update_job_navigation(job_data_list, index)
+            card_prefetch_executor.submit(prefetch_neighbor_cards, job_data_list, index)
             
         except Exception as ex_card:
             print(f"DEBUG: ERRO CRÍTICO ao renderizar Card da vaga {index+1}: {type(ex_card).__name__}: {ex_card}. Dados parciais da vaga: {job.keys()}")
             show_error(f"ERRO INTERNO NA EXIBIÇÃO: Falha ao exibir vaga {index+1}. Verifique o console para detalhes.")
             job_navigation_buttons_ref.current.visible = False
-            page.update()
+            schedule_update()
 
     # --- Funções para Navegação de Vagas ---
+    def update_job_navigation(job_data_list, index):
+        # Atualiza o contador e os botões; chamado também a cada vaga que chega durante a busca
+        job_navigation_buttons_ref.current.controls[0].disabled = (index == 0) # Anterior
+        job_navigation_buttons_ref.current.controls[-1].disabled = (index >= len(job_data_list) - 1) # Próxima
+        counter_text = f"{index + 1} de {len(job_data_list)}"
+        if loading_jobs:
+            counter_text += " (recebendo mais...)"
+        elif job_data_list is not received_jobs and len(job_data_list) < len(received_jobs):
+            counter_text += f" (filtradas de {len(received_jobs)})"
+        elif job_data_list is not received_jobs:
+            counter_text += " (ordenadas por salário)" if sort_by_salary_switch_ref.current.value else " (ordenadas por relevância)"
+        job_counter_text_ref.current.value = counter_text
+        schedule_update()
+
     def navigate_jobs(e):
         global current_job_index, all_found_jobs
         
@@ -507,27 +678,143 @@ async def main(page: ft.Page):
         
         display_single_job(all_found_jobs, current_job_index)
 
+    # --- Filtro e ordenação por salário anual e por relevância ---
+    def parse_min_salary(text):
+        # Aceita "30000", "30.000" ou "30 000"; vazio = sem filtro
+        text = (text or "").strip().replace(" ", "").replace(".", "").replace(",", ".")
+        return float(text) if text else None
+
+    def apply_job_view(e):
+        global all_found_jobs, current_job_index, relevance_index
+        if loading_jobs or salary_index is None:
+            return
+        import salarios # Já carregado pela busca (transformacao.py)
+
+        try:
+            min_salary = parse_min_salary(min_salary_field_ref.current.value)
+        except ValueError:
+            show_error("ERRO DE VALIDAÇÃO: 'Salário anual mínimo' deve ser um número (ex: 30000).")
+            schedule_update()
+            return
+        sort_by_salary = sort_by_salary_switch_ref.current.value
+        only_relevant = relevance_switch_ref.current.value
+
+        if min_salary is None and not sort_by_salary and not only_relevant:
+            all_found_jobs = received_jobs
+        else:
+            import numpy as np # Já carregado pela busca (salarios.py)
+            if min_salary is not None or sort_by_salary:
+                positions = salary_index.filtrar(min_salary) if min_salary is not None else salary_index.ordenadas()
+                if not sort_by_salary:
+                    positions.sort() # Só o filtro: mantém a ordem em que as vagas chegaram
+            else:
+                positions = np.arange(len(received_jobs))
+            if only_relevant:
+                import relevancia # Import local: só quem usa o filtro de relevância carrega o índice
+                if relevance_index is None:
+                    relevance_index = relevancia.IndiceRelevancia.das_vagas(received_jobs)
+                # A ordem por salário, se ligada, tem precedência sobre a da relevância
+                positions = relevancia.combinar(positions, relevance_index.filtrar(searched_title), not sort_by_salary)
+            all_found_jobs = salarios.selecionar(received_jobs, positions)
+
+        current_job_index = 0
+        job_card_cache.clear() # Os cards são guardados pela posição na lista navegada
+        if all_found_jobs:
+            display_single_job(all_found_jobs, current_job_index)
+        else:
+            chat_history_ref.current.controls.clear()
+            criteria = []
+            if min_salary is not None:
+                criteria.append(f"salário anual de pelo menos {salarios.formatar_salario_anual(min_salary)}")
+            if only_relevant:
+                criteria.append(f"relevância suficiente para '{searched_title}'")
+            add_message("Sistema", f"Nenhuma das {len(received_jobs)} vagas tem {' e '.join(criteria)}.", color=SPACE_COLORS["accent"])
+            job_navigation_buttons_ref.current.visible = False
+            schedule_update()
+
 
     # --- Funções de Lógica (Chat e Busca de Vagas) ---
+    def chat_endpoint_and_key():
+        # Usa a URL/chave do formulário de busca, se preenchidas; senão, as padrão do chat_AI.py
+        import chat_AI # Import local: carrega o requests só no primeiro uso do chat
+        url = api_url_field_ref.current.value.strip() if api_url_field_ref.current and api_url_field_ref.current.value else ""
+        key = api_key_field_ref.current.value.strip() if api_key_field_ref.current and api_key_field_ref.current.value else ""
+        if url.rstrip("/").endswith("/search_jobs"):
+            url = url.rstrip("/")[:-len("search_jobs")] + "chat"
+        else:
+            url = f"{chat_AI.BASE_URL.rstrip('/')}/chat"
+        return url, key or chat_AI.VALID_CHAT_KEY
+
     async def send_message_chat(e):
         user_message = chat_input_field_ref.current.value.strip()
         chat_input_field_ref.current.value = ""
-        page.update()
+        schedule_update()
 
         if not user_message:
             return
 
         welcome_message_ref.current.visible = False
         add_message("Você", user_message)
-        show_loading("...")
-        
-        # --- MODIFICADO: Lógica do chat desativada ---
-        hide_loading()
-        add_message("Assistente", "A função de Chat com a IA foi desativada nesta versão.")
-        page.update()
+        response_text = add_message("Assistente", "...") # Preenchida conforme os tokens chegam
+        if response_text is None:
+            return
+
+        # --- Resposta em streaming: cada trecho vai para a bolha assim que chega ---
+        loop = asyncio.get_running_loop()
+        cancel_event = chat_cancel_event
+        received = []
+
+        def show_piece(piece):
+            # Roda no loop da UI; várias chegadas na mesma volta viram um único page.update()
+            if cancel_event.is_set():
+                return
+            received.append(piece)
+            response_text.value = "".join(received)
+            schedule_update()
+
+        def stream_chat():
+            global chat_session
+            import requests # Imports locais: carregados na thread, sem travar a interface
+            import conversa # Cache de respostas + contexto compactado, os mesmos do chat_AI.py
+
+            url, api_key = chat_endpoint_and_key()
+            if chat_session is None or (chat_session.url, chat_session.api_key) != (url, api_key):
+                chat_session = conversa.SessaoChat(url, api_key)
+            session = chat_session # Trocar de modo zera a global no meio da resposta
+            try:
+                session.enviar(user_message, ao_receber=lambda piece: loop.call_soon_threadsafe(show_piece, piece),
+                               cancelar=cancel_event)
+            except requests.exceptions.HTTPError as http_err:
+                try:
+                    error_detail = http_err.response.json().get('detail', http_err.response.text)
+                except json.JSONDecodeError:
+                    error_detail = http_err.response.text
+                return f"Erro HTTP {http_err.response.status_code} da API: {error_detail}"
+            except requests.exceptions.RequestException as req_err:
+                return f"Erro de Conexão com a API: {req_err}"
+            except Exception as ex_chat:
+                return f"A resposta do assistente foi interrompida: {ex_chat}"
+            if session.ultima_incompleta:
+                return "A conexão com o assistente fechou antes do fim da resposta."
+            return None
+
+        error_message = await asyncio.to_thread(stream_chat)
+        if cancel_event.is_set():
+            return
+        if error_message:
+            if received:
+                response_text.value = "".join(received) + " (resposta interrompida)"
+            else:
+                response_text.value = "Não foi possível obter uma resposta no momento. Por favor, tente novamente."
+            show_error(error_message)
+        elif not received:
+            response_text.value = "Não foi possível obter uma resposta no momento. Por favor, tente novamente."
+        schedule_update()
+        metricas.gravar() # Só grava com VAGAS_METRICAS definida
     
     async def search_jobs_gui(e):
-        global all_found_jobs, current_job_index 
+        global all_found_jobs, current_job_index, loading_jobs, cancel_current_search, received_jobs, salary_index
+        global relevance_index, searched_title, searched_api
 
         # --- MODIFICADO: Obter valores dos campos da API ---
         api_url = api_url_field_ref.current.value.strip()
@@ -538,18 +825,19 @@ async def main(page: ft.Page):
         location = job_location_field_ref.current.value.strip()
         is_remote_str = job_remote_dropdown_ref.current.value
         hours_ago_str = job_hours_field_ref.current.value.strip()
+        offline = bool(job_offline_switch_ref.current.value) # Busca no arquivo local (arquivo_vagas.py), sem a API
 
         print(f"DEBUG: Iniciando busca com: Título='{title}', País='{country}', Localidade='{location}', Remoto='{is_remote_str}', Horas='{hours_ago_str}'")
 
         # --- MODIFICADO: Validação dos campos da API ---
-        if not api_url or not api_key:
+        if not offline and (not api_url or not api_key):
             show_error("ERRO DE VALIDAÇÃO: A URL e a Chave de API são obrigatórias!")
-            page.update()
+            schedule_update()
             return
 
-        if not title or not country:
+        if not offline and (not title or not country):
             show_error("ERRO DE VALIDAÇÃO: Título da vaga e País são obrigatórios para a busca!")
-            page.update()
+            schedule_update()
             return
 
         hours_ago = None
@@ -558,132 +846,301 @@ async def main(page: ft.Page):
                 hours_ago = int(hours_ago_str)
                 if hours_ago < 0:
                     show_error("ERRO DE VALIDAÇÃO: Horas atrás deve ser um número positivo ou 0.")
-                    page.update()
+                    schedule_update()
                     return
             except ValueError:
                 show_error("ERRO DE VALIDAÇÃO: 'Horas atrás' deve ser um número inteiro válido (ex: 0 para hoje, 24 para 24h atrás).")
                 print(f"DEBUG: ValueError para horas_ago_str: '{hours_ago_str}'")
-                page.update()
+                schedule_update()
                 return
 
         chat_history_ref.current.controls.clear()
         welcome_message_ref.current.visible = False
-        add_message("Sistema", "📡 Conectando à API e buscando vagas... isso pode levar um momento.")
-        page.update()
+        if offline:
+            add_message("Sistema", "📦 Buscando nas vagas já recebidas (arquivo local)...")
+        else:
+            add_message("Sistema", "📡 Conectando à API e buscando vagas... isso pode levar um momento.")
+        schedule_update()
+
+        # --- Busca em streaming: as vagas chegam à UI uma a uma por esta fila ---
+        loop = asyncio.get_running_loop()
+        job_queue = asyncio.Queue()
+        cancel_event = threading.Event()
+        if cancel_current_search is not None:
+            cancel_current_search.set() # Abandona uma busca anterior que ainda esteja chegando
+        cancel_current_search = cancel_event
+
+        def deliver(kind, content=None):
+            loop.call_soon_threadsafe(job_queue.put_nowait, (kind, content))
+
+        def fetch_archived_jobs():
+            import arquivo_vagas # Imports locais: já pré-carregados com busca_paises ao abrir o formulário
+            import deduplicacao
+            import transformacao
+            # Busca offline: as vagas já vêm das mais relevantes para o título, sem passar pela rede
+            deduplicator = deduplicacao.Deduplicador()
+            transform_seconds = 0.0
+            try:
+                for job_country, job_data in arquivo_vagas.pesquisar(title, country, location, is_remote_str, hours_ago):
+                    if cancel_event.is_set():
+                        break
+                    if not deduplicator.e_nova(job_data):
+                        continue
+                    started = time.perf_counter()
+                    job = transformacao.transformar_vaga(job_data, pais=job_country)
+                    transform_seconds += time.perf_counter() - started
+                    deliver("job", job)
+            except Exception as e:
+                deliver("error", f"Falha ao ler o arquivo local: {e}")
+            finally:
+                metricas.observar("vagas_transformacao_segundos", transform_seconds)
+                deliver("end")
 
         # --- MODIFICADO: Função interna para chamada de API e transformação de dados ---
         def fetch_and_transform_jobs():
-            headers = {"X-API-Key": api_key, "Content-Type": "application/json"}
-            payload = {
-                "search_term": title,
-                "location": location,
-                "country": country,
-                "is_remote": is_remote_str,
-                "hours_old": hours_ago if hours_ago is not None else 0
-            }
-            try:
-                response = requests.post(api_url, headers=headers, data=json.dumps(payload), timeout=45)
-                response.raise_for_status()
-                api_response_data = response.json()
-
-                if not api_response_data or 'jobs' not in api_response_data:
-                    return {"error": "Resposta da API inválida ou não contém a chave 'jobs'."}
-
-                transformed_jobs = []
-                for job in api_response_data.get('jobs', []):
-                    # Formata o salário a partir dos múltiplos campos da API
-                    salary_text = "Não disponível"
-                    salary_from = job.get('salary_from')
-                    salary_to = job.get('salary_to')
-                    salary_avg = job.get('salary_avg')
-                    salary_unit = job.get('salary_unit')
-                    
-                    if salary_avg:
-                        salary_text = f"~ {salary_avg}"
-                    elif salary_from and salary_to:
-                        salary_text = f"{salary_from} - {salary_to}"
-                    elif salary_from:
-                        salary_text = f"A partir de {salary_from}"
-                    
-                    if salary_unit and salary_text != "Não disponível":
-                         salary_text += f" ({salary_unit})"
-
-                    # Transforma o dicionário da API para o formato esperado pela UI
-                    transformed_job = {
-                        'title': job.get('title', 'N/A'),
-                        'company': job.get('company', 'N/A'),
-                        'location': job.get('location', 'N/A'),
-                        'is_remote': job.get('is_remote', False) or (job.get('work_from_home_type') == 'Remoto'),
-                        'date_posted': job.get('date_posted', 'N/A'),
-                        'description': job.get('description', 'Descrição não disponível.'),
-                        'job_type': job.get('job_type', 'N/A'),
-                        'salary': salary_text,
-                        'job_url': job.get('job_url')
-                    }
-                    transformed_jobs.append(transformed_job)
-                
-                return transformed_jobs
+            import busca_paises # Imports locais: já pré-carregados em segundo plano ao abrir o formulário
+            import transformacao # Converte cada vaga da API para o formato esperado pela UI
 
-            except requests.exceptions.HTTPError as http_err:
-                error_detail = "Detalhe não disponível."
-                try:
-                    error_detail = http_err.response.json().get('detail', http_err.response.text)
-                except json.JSONDecodeError:
-                    error_detail = http_err.response.text
-                return {"error": f"Erro HTTP {http_err.response.status_code} da API: {error_detail}"}
-            except requests.exceptions.RequestException as req_err:
-                return {"error": f"Erro de Conexão com a API: {req_err}"}
+            # Um ou vários países ('portugal, spain' ou 'todos'): cada país é uma busca em streaming,
+            # em paralelo, e as vagas entram na fila da UI assim que qualquer país responde
+            countries = busca_paises.resolver_paises(country)
+            errors = []
+            transform_seconds = 0.0
+            try:
+                events = busca_paises.buscar_em_paises(
+                    api_url, api_key, title, countries, location, is_remote_str,
+                    hours_ago if hours_ago is not None else 0, cancelar=cancel_event, projetar=True)
+                for event in events:
+                    if event.tipo == "vaga":
+                        started = time.perf_counter()
+                        job = transformacao.transformar_vaga(event.dados, pais=event.pais)
+                        transform_seconds += time.perf_counter() - started
+                        deliver("job", job)
+                    elif event.tipo == "erro":
+                        errors.append(event.dados if len(countries) == 1 else f"{event.pais}: {event.dados}")
+                    else:
+                        print(f"DEBUG: {event.pais}: {event.dados['vagas']} vaga(s){' (cache local)' if event.dados['cache'] else ''}.")
+                if errors:
+                    deliver("error", errors[0] if len(errors) == 1 else f"{len(errors)} de {len(countries)} países falharam ({'; '.join(errors[:3])}).")
             except Exception as e:
-                return {"error": f"Ocorreu um erro inesperado: {e}"}
+                deliver("error", f"Ocorreu um erro inesperado: {e}")
+            finally:
+                metricas.observar("vagas_transformacao_segundos", transform_seconds)
+                deliver("end")
+
+        # Executa a função de rede em uma thread separada e consome as vagas conforme chegam
+        received_jobs = all_found_jobs = [] # Mesma lista até o usuário filtrar/ordenar por salário ou relevância
+        salary_index = None
+        relevance_index = None
+        searched_title = title
+        searched_api = (api_url, api_key) if api_url and api_key else None # Offline sem a API: o "Ver Mais..." mostra a prévia
+        job_card_cache.clear()
+        current_job_index = 0
+        loading_jobs = True
+        error_message = None
+        network_task = asyncio.create_task(asyncio.to_thread(fetch_archived_jobs if offline else fetch_and_transform_jobs))
+        while True:
+            kind, content = await job_queue.get()
+            if kind == "end":
+                break
+            if cancel_event.is_set():
+                continue # O usuário trocou de modo: descarta o resto sem mexer na tela
+            if kind == "error":
+                error_message = content
+            elif not all_found_jobs:
+                # Primeira vaga: mostra o card imediatamente, sem esperar o resto da resposta
+                import salarios # Já carregado pela thread de rede (transformacao.py)
+                salary_index = salarios.IndiceSalarios()
+                salary_index.adicionar(content.get('annual_salary'))
+                all_found_jobs.append(content)
+                display_single_job(all_found_jobs, current_job_index)
 
-        # Executa a função de rede em uma thread separada
-        jobs_data = await asyncio.to_thread(fetch_and_transform_jobs)
+                job_search_form_ref.current.visible = False
+                chat_input_field_ref.current.parent.visible = False
+                new_search_button_ref.current.visible = True
+                job_navigation_buttons_ref.current.visible = True
+
+                job_navigation_buttons_ref.current.controls[0].on_click = navigate_jobs
+                job_navigation_buttons_ref.current.controls[-1].on_click = navigate_jobs
+
+                # Filtro/ordenação por salário e relevância: visíveis já, habilitados quando a busca terminar
+                min_salary_field_ref.current.label = f"Salário anual mínimo ({salarios.tabela_padrao().referencia})"
+                min_salary_field_ref.current.value = ""
+                min_salary_field_ref.current.on_submit = apply_job_view
+                sort_by_salary_switch_ref.current.value = False
+                sort_by_salary_switch_ref.current.on_change = apply_job_view
+                relevance_switch_ref.current.value = False
+                relevance_switch_ref.current.on_change = apply_job_view
+                for control in job_salary_controls_ref.current.controls:
+                    control.disabled = True
+                job_salary_controls_ref.current.visible = True
+                schedule_update()
+            else:
+                salary_index.adicionar(content.get('annual_salary'))
+                all_found_jobs.append(content)
+                update_job_navigation(all_found_jobs, current_job_index) # Só o contador muda; o card atual fica
+        await network_task
+        if cancel_event.is_set():
+            return
+        loading_jobs = False
+        cancel_current_search = None
 
         hide_loading()
         
         # --- MODIFICADO: Tratamento da resposta da API ---
-        if isinstance(jobs_data, dict) and jobs_data.get("error"):
-            show_error(f"ERRO DA API: {jobs_data.get('error')}")
+        error_source = "ERRO DO ARQUIVO LOCAL" if offline else "ERRO DA API"
+        if error_message and not all_found_jobs:
+            show_error(f"{error_source}: {error_message}")
             new_search_button_ref.current.visible = True
             job_navigation_buttons_ref.current.visible = False
+
+        elif error_message:
+            # A conexão caiu no meio: as vagas já recebidas continuam navegáveis
+            show_error(f"{error_source}: {error_message} Exibindo as {len(all_found_jobs)} vaga(s) recebidas até a falha.")
+            update_job_navigation(all_found_jobs, current_job_index)
         
-        elif not isinstance(jobs_data, list):
-            show_error(f"ERRO DE DADOS: Formato inesperado recebido. Esperava uma LISTA, recebi: {type(jobs_data).__name__}.")
+        elif not all_found_jobs and offline:
+            show_error("😔 Nenhuma vaga do arquivo local atende a esses critérios. Desligue a busca offline para buscar na API.")
             new_search_button_ref.current.visible = True
             job_navigation_buttons_ref.current.visible = False
-        
-        elif not jobs_data:
+
+        elif not all_found_jobs:
             show_error("😔 Nenhuma vaga encontrada com os critérios fornecidos.")
             new_search_button_ref.current.visible = True
             job_navigation_buttons_ref.current.visible = False
 
         else: 
-            all_found_jobs = jobs_data 
-            current_job_index = 0     
-            
-            add_message("Sistema", f"🎉 Encontrei {len(all_found_jobs)} vaga(s) para você! Exibindo a primeira...")
-            display_single_job(all_found_jobs, current_job_index) 
+            print(f"DEBUG: Busca concluída com {len(all_found_jobs)} vaga(s).")
+            update_job_navigation(all_found_jobs, current_job_index)
 
-            job_search_form_ref.current.visible = False
-            chat_input_field_ref.current.parent.visible = False
-            new_search_button_ref.current.visible = True
-            job_navigation_buttons_ref.current.visible = True 
+        if all_found_jobs:
+            for control in job_salary_controls_ref.current.controls:
+                control.disabled = False
             
-            job_navigation_buttons_ref.current.controls[0].on_click = navigate_jobs
-            job_navigation_buttons_ref.current.controls[1].on_click = navigate_jobs
-            
-        page.update()
+        schedule_update()
+        metricas.gravar() # Só grava com VAGAS_METRICAS definida
+
+    # --- Construção adiada do formulário de busca de vagas ---
+    def preconnect_api(e):
+        import cliente_api # Import local: o cliente HTTP (requests) só é carregado quando o formulário é usado
+        cliente_api.pre_conectar_em_segundo_plano(e.control.value or "")
+
+    def preload_search_modules():
+        # Carrega em segundo plano os módulos da busca enquanto o usuário preenche o formulário
+        try:
+            import busca_paises, transformacao # noqa: F401 (busca_paises carrega arquivo_vagas, cache_buscas, deduplicacao e json_incremental)
+        except Exception as e:
+            print(f"DEBUG: Falha ao pré-carregar os módulos de busca: {e}")
+
+    def build_job_search_form():
+        return [
+            # --- ADICIONADO: Campos para URL e Chave da API ---
+            ft.TextField(
+                label="URL da API (Endpoint de busca)",
+                hint_text="ex: http://seuservidor.com/search_jobs",
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                # Abre a conexão com a API assim que a URL é preenchida
+                on_blur=preconnect_api,
+                on_submit=preconnect_api,
+                ref=api_url_field_ref
+            ),
+            ft.TextField(
+                label="Sua Chave de API (X-API-Key)",
+                password=True,
+                can_reveal_password=True,
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                ref=api_key_field_ref
+            ),
+            ft.Divider(height=10, color=ft.Colors.TRANSPARENT), # Espaçador
+
+            ft.TextField(
+                label="Título da Vaga (ex: Analista de Dados)",
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                ref=job_title_field_ref
+            ),
+            ft.TextField(
+                label="País (em inglês, ex: brazil, usa)",
+                helper_text="Vários países: separe por vírgula (ex: portugal, spain) ou escreva 'todos'",
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                ref=job_country_field_ref
+            ),
+            ft.TextField(
+                label="Localidade (cidade ou 'Home Office')",
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                ref=job_location_field_ref
+            ),
+            ft.Dropdown(
+                label="Tipo de Trabalho",
+                options=[
+                    ft.dropdown.Option("Ambos"),
+                    ft.dropdown.Option("Remoto"),
+                    ft.dropdown.Option("Presencial"),
+                ],
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                label_style=ft.TextStyle(color=SPACE_COLORS["text"]), text_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"],
+                value="Ambos",
+                ref=job_remote_dropdown_ref
+            ),
+            ft.TextField(
+                label="Horas atrás (0 para 'Hoje')",
+                keyboard_type=ft.KeyboardType.NUMBER,
+                border_radius=10, border_color=SPACE_COLORS["border"], focused_border_color=SPACE_COLORS["primary"],
+                text_style=ft.TextStyle(color=SPACE_COLORS["text"]), label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                filled=True, bgcolor=SPACE_COLORS["surface"], cursor_color=SPACE_COLORS["accent"],
+                ref=job_hours_field_ref
+            ),
+            ft.Switch(
+                label="Buscar offline (vagas já recebidas, sem usar a API)",
+                tooltip="Busca no arquivo local das buscas anteriores: responde na hora e não gasta a cota da chave",
+                value=False,
+                active_color=SPACE_COLORS["accent"],
+                label_style=ft.TextStyle(color=SPACE_COLORS["text"]),
+                ref=job_offline_switch_ref
+            ),
+            ft.ElevatedButton(
+                "🚀 Buscar Vagas",
+                on_click=None,
+                bgcolor=SPACE_COLORS["primary"],
+                color=SPACE_COLORS["text"],
+                style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=10)),
+                ref=job_search_button_ref
+            )
+        ]
 
     def switch_mode(mode: str):
-        global current_mode, all_found_jobs, current_job_index
+        global current_mode, all_found_jobs, current_job_index, loading_jobs, cancel_current_search, received_jobs, salary_index
+        global chat_cancel_event, chat_session, relevance_index
         current_mode = mode
+        if cancel_current_search is not None:
+            cancel_current_search.set() # Para de receber as vagas de uma busca em andamento
+            cancel_current_search = None
+        chat_cancel_event.set() # Idem para respostas do chat ainda chegando (a tela será limpa)
+        chat_cancel_event = threading.Event()
+        chat_session = None # A tela é limpa: a próxima pergunta começa uma conversa nova
+        loading_jobs = False
         chat_history_ref.current.controls.clear()
         welcome_message_ref.current.visible = True
         new_search_button_ref.current.visible = False
         job_navigation_buttons_ref.current.visible = False 
+        job_salary_controls_ref.current.visible = False
         
         all_found_jobs = [] 
+        received_jobs = []
+        salary_index = None
+        relevance_index = None
         current_job_index = 0 
+        job_card_cache.clear()
 
         chat_input_row = chat_input_field_ref.current.parent
 
@@ -694,20 +1151,21 @@ async def main(page: ft.Page):
                 chat_input_row.visible = True
                 job_search_form_ref.current.visible = False
                 page.vertical_alignment = ft.MainAxisAlignment.START # Modo chat, alinha ao topo para scrollar
-                page.update()
                 add_message("Sistema", "Você está agora no **modo de chat com a IA**. Pergunte-me qualquer coisa!", color=SPACE_COLORS["accent"])
             elif mode == "job_search":
+                if not job_search_form_ref.current.controls:
+                    job_search_form_ref.current.controls = build_job_search_form()
+                    threading.Thread(target=preload_search_modules, daemon=True).start()
                 job_search_button_ref.current.on_click = search_jobs_gui
                 chat_input_row.visible = False
                 job_search_form_ref.current.visible = True
                 page.vertical_alignment = ft.MainAxisAlignment.CENTER # Modo busca, centraliza o formulário ou a vaga
-                page.update()
                 add_message("Sistema", "Você está no **modo de busca de vagas**. Preencha os campos abaixo para encontrar sua vaga ideal.", color=SPACE_COLORS["accent"])
-            page.update()
+            schedule_update()
         except Exception as e:
             print(f"DEBUG: Erro ao trocar de modo: {e}")
             show_error(f"ERRO INTERNO: Falha ao mudar de modo. Tente reiniciar.")
-            page.update()
+            schedule_update()
 
     switch_mode(current_mode)
 
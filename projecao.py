@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Projeção de campos das buscas do painel e descrição completa sob demanda.
+#
+# O painel usa só uma parte dos ~26 campos de cada vaga, mas a resposta completa traz a descrição
+# inteira, a descrição da empresa etc. de todas as vagas. Com a projeção, a busca pede só os
+# CAMPOS_PAINEL ("fields") e uma prévia da descrição ("description_max_chars"); a API marca as vagas
+# cortadas com "description_truncated" e a descrição inteira é pedida ao /job_description só quando
+# o usuário abre o "Ver Mais...". Uma API que ignore a projeção continua funcionando: as vagas
+# chegam completas e o "Ver Mais..." usa a descrição que já veio.
+# A compressão da resposta (gzip/brotli) é pedida em todas as chamadas (ver cliente_api.py).
+
+from typing import Iterable
+from urllib.parse import urlsplit, urlunsplit
+
+import cliente_api
+
+# Campos usados pelo painel: exibição (transformacao.py), salário anual (salarios.py),
+# deduplicação (deduplicacao.py) e relevância (relevancia.py)
+CAMPOS_PAINEL = (
+    "id", "job_url", "title", "company", "location", "date_posted", "job_type", "is_remote",
+    "work_from_home_type", "salary_from", "salary_to", "salary_unit", "salary_avg", "salary_hourly",
+    "salary_yearly", "currency", "skills", "description",
+)
+TAMANHO_PREVIA = 250 # Caracteres da descrição exibidos no card (o resto fica atrás do "Ver Mais...")
+ENDPOINT_DESCRICAO = "job_description"
+
+
+def payload_projetado(payload: dict, campos: Iterable[str] = CAMPOS_PAINEL, tamanho_previa: int = TAMANHO_PREVIA) -> dict:
+    """
+    Acrescenta ao payload do /search_jobs a lista de campos desejados e o tamanho da prévia da descrição.
+    """
+    return dict(payload, fields=list(campos), description_max_chars=tamanho_previa)
+
+
+def descricao_cortada(job: dict) -> bool:
+    """
+    True quando a vaga veio só com a prévia da descrição.
+    """
+    return bool(job.get("description_truncated"))
+
+
+def url_descricao(url_busca: str) -> str:
+    """
+    Endpoint da descrição completa, ao lado do de busca (ex: .../search_jobs -> .../job_description).
+    """
+    partes = urlsplit(url_busca.strip())
+    caminho = partes.path.rstrip("/").rsplit("/", 1)[0]
+    return urlunsplit((partes.scheme, partes.netloc, f"{caminho}/{ENDPOINT_DESCRICAO}", "", ""))
+
+
+def buscar_descricao(url_busca: str, api_key: str, job: dict) -> str:
+    """
+    Pede a descrição completa de uma vaga recebida com projeção (identificada pelo id e pelo link).
+    Erros HTTP e de conexão são levantados como exceções do `requests`; uma resposta sem a
+    descrição levanta ValueError.
+    """
+    response = cliente_api.post_json(url_descricao(url_busca), {"id": job.get("id"), "job_url": job.get("job_url")},
+                                     api_key, idempotente=True)
+    response.raise_for_status()
+    dados = response.json()
+    descricao = dados.get("description") if isinstance(dados, dict) else None
+    if not isinstance(descricao, str):
+        raise ValueError("Resposta da API sem a descrição da vaga.")
+    return descricao
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Registro compacto de uma vaga, para guardar muitas vagas em memória (buscas em lote,
+# em vários países, relatórios e exportações com dezenas de milhares de vagas).
+#
+# Cada vaga vinda da API é um dicionário com ~26 chaves; cada vaga é guardada num objeto com
+# __slots__ (sem o dicionário por instância). Os textos que se repetem muito entre vagas
+# (site, tipo de contrato, unidade do salário, localização...) são internados: todas as vagas
+# apontam para a mesma string. A descrição, o maior campo, vai comprimida para o armazém em disco
+# (descricoes.py) e só é lida e decodificada quando alguém a usa; as curtas ficam em UTF-8 na memória
+# (uma descrição com um único caractere fora do Latin-1, como '•' ou '’', ocupa 2 a 4 bytes
+# por caractere como str).
+# Os registros leem como um dicionário (get, [], in, keys, items), então o resto do código
+# (deduplicação, salários, relevância, relatórios) não precisa saber a diferença.
+#
+# Uso: vaga = Vaga(job_da_api); vaga.get("title"); vaga["description"]; vaga.para_dict()
+
+import sys
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Tuple
+
+import descricoes
+from vagas import JOB_FIELD_TRANSLATIONS
+
+# Campos da API que se repetem muito entre vagas
+CAMPOS_INTERNADOS = frozenset({
+    "site", "job_type", "salary_unit", "location", "company", "currency", "date_posted",
+    "work_from_home_type", "experience_range", "company_num_employees", "company_revenue",
+})
+
+
+class RegistroCompacto:
+    """
+    Base dos registros com __slots__: as subclasses definem CAMPOS (na ordem do dicionário
+    de origem), INTERNADOS e `__slots__ = slots_dos_campos(CAMPOS)`.
+    Campos ausentes na origem ficam None (e `get` devolve o padrão, como num dicionário sem a chave).
+    As descrições longas ficam no armazém deste processo: para gravar ou enviar a outro processo, use `para_dict`.
+    """
+
+    __slots__ = ()
+    CAMPOS: Tuple[str, ...] = ()
+    INTERNADOS = frozenset()
+
+    def __init__(self, dados: dict):
+        internados = self.INTERNADOS
+        for campo, slot in self._CAMPOS_SLOTS: # Grava direto nos slots (sem passar pela propriedade da descrição)
+            valor = dados.get(campo)
+            if type(valor) is str:
+                if campo in internados:
+                    valor = sys.intern(valor)
+                elif slot == "_description":
+                    valor = descricoes.guardar(valor)
+            setattr(self, slot, valor)
+
+    # --- Descrição no armazém (ou em UTF-8, se curta), decodificada a cada leitura ---
+    @property
+    def description(self):
+        return descricoes.ler(self._description)
+
+    @description.setter
+    def description(self, valor):
+        self._description = descricoes.guardar(valor)
+
+    # --- Leitura como dicionário ---
+    def get(self, campo: str, padrao=None):
+        if campo not in self._NOMES:
+            return padrao
+        valor = getattr(self, campo)
+        return padrao if valor is None else valor
+
+    def __getitem__(self, campo: str):
+        if campo not in self._NOMES:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo: str, valor):
+        if campo not in self._NOMES:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self._NOMES and getattr(self, campo) is not None
+
+    def keys(self) -> List[str]:
+        return [campo for campo in self.CAMPOS if getattr(self, campo) is not None]
+
+    def items(self) -> List[tuple]:
+        return [(campo, valor) for campo in self.CAMPOS if (valor := getattr(self, campo)) is not None]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def para_dict(self) -> dict:
+        """
+        O registro como dicionário (ex: para json.dumps), sem os campos ausentes.
+        """
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(title={self.get('title')!r}, company={self.get('company')!r})"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NOMES = frozenset(cls.CAMPOS)
+        cls._CAMPOS_SLOTS = tuple(zip(cls.CAMPOS, slots_dos_campos(cls.CAMPOS)))
+
+
+def slots_dos_campos(campos: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Os __slots__ de um registro com estes campos (a descrição fica no slot '_description').
+    """
+    return tuple("_description" if campo == "description" else campo for campo in campos)
+
+
+class Vaga(RegistroCompacto):
+    """
+    Uma vaga da API (os campos dos relatórios + is_remote, currency e description_truncated).
+    Chaves que a API mande fora desses campos são descartadas.
+    """
+
+    CAMPOS = tuple(JOB_FIELD_TRANSLATIONS) + ("is_remote", "currency", "description_truncated")
+    INTERNADOS = CAMPOS_INTERNADOS
+    __slots__ = slots_dos_campos(CAMPOS)
+
+
+def compactar(jobs: Iterable[dict]) -> List[Vaga]:
+    """
+    Converte vagas da API (dicionários) em registros Vaga; as que já são registros ficam como estão.
+    """
+    return [job if isinstance(job, RegistroCompacto) else Vaga(job) for job in jobs]
+
+
+def colunas(registros: List[RegistroCompacto], campos: Iterable[str]) -> dict:
+    """
+    {campo: [valor de cada registro]}, lido direto dos slots (ex: para montar um DataFrame).
+    """
+    tipos = set(map(type, registros))
+    saida = {}
+    for campo in campos:
+        if all(campo in tipo._NOMES for tipo in tipos):
+            saida[campo] = list(map(attrgetter(campo), registros))
+        else:
+            saida[campo] = [registro.get(campo) for registro in registros]
+    return saida
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Motor de renderização dos relatórios de vagas.
+#
+# Cada campo de JOB_FIELD_TRANSLATIONS recebe, uma única vez, a sua função de formatação
+# (tabela pré-compilada), em vez de passar por toda a cadeia de if/elif para cada campo de
+# cada vaga. O texto é montado em memória e escrito em blocos, sem um print por campo.
+# Formatos: 'txt' (idêntico à saída de sempre do buscar_e_exibir_vagas), 'md' e 'html'.
+#
+# Uso: python relatorio.py resultados.jsonl --saida relatorio.html --formato html
+#      (--salario-minimo 30000 e/ou --ordenar-salario usam o salário anual estimado pelo salarios.py)
+
+import argparse
+import html
+import json
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, TextIO, Tuple
+
+from vagas import JOB_FIELD_TRANSLATIONS
+
+NAO_DISPONIVEL = "Não disponível :("
+FORMATOS = ("txt", "md", "html")
+VAGAS_POR_BLOCO = 256 # Vagas acumuladas antes de cada escrita no arquivo
+
+# Campos exibidos mesmo quando não há valor
+CAMPOS_SEMPRE_EXIBIDOS = frozenset(['title', 'company', 'location', 'job_url', 'date_posted'])
+CAMPOS_LINK = frozenset(['job_url', 'job_url_direct', 'company_website'])
+
+_VALORES_VAZIOS = frozenset(['none', 'nan', 'null', ''])
+_MOEDA_BR = str.maketrans({'.': ',', ',': '.'}) # 1,234.56 -> 1.234,56 numa só passada
+_SEPARADOR_TXT = "\n" + "=" * 60 + "\n\n"
+
+# Sufixo de cada unidade salarial, por campo (mesmas regras do relatório original)
+_SUFIXOS_SALARIO = {
+    'yearly': (' por Ano', frozenset(['salary_yearly'])),
+    'hourly': (' por Hora', frozenset(['salary_hourly'])),
+    'monthly': (' por Mês', frozenset(['salary_from', 'salary_to', 'salary_avg'])),
+    'daily': (' por Dia', None),      # None = vale para qualquer campo salarial
+    'weekly': (' por Semana', None),
+}
+
+
+# --- Formatadores por campo ---
+# Cada formatador recebe (valor, vaga) e devolve o texto exibido, ou None quando "Não disponível".
+# Um texto igual a NAO_DISPONIVEL também é tratado como ausente, como no relatório original.
+def _e_vazio(valor) -> bool:
+    if valor is None:
+        return True
+    if isinstance(valor, str):
+        valor = valor.strip()
+        # Textos com mais de 4 letras nunca são 'none'/'null'/'nan': evita o lower() em descrições longas
+        return len(valor) <= 4 and valor.lower() in _VALORES_VAZIOS
+    if isinstance(valor, (int, float)):
+        # Zero e NaN/Inf vindos do NumPy/pandas também contam como ausentes
+        if valor == 0:
+            return True
+        return hasattr(valor, '__array_ufunc__') and isinstance(valor, float) and (
+            valor != valor or valor == float('inf') or valor == float('-inf'))
+    return False
+
+
+def _formatar_booleano_texto(valor):
+    if isinstance(valor, str) and 4 <= len(valor) <= 5:
+        minusculo = valor.lower()
+        if minusculo == 'true':
+            return "Sim"
+        if minusculo == 'false':
+            return "Não"
+    return None
+
+
+def _formatador_padrao(valor, job):
+    if _e_vazio(valor):
+        return None
+    booleano = _formatar_booleano_texto(valor)
+    return booleano if booleano is not None else str(valor)
+
+
+def _formatador_descricao(valor, job):
+    if _e_vazio(valor) or valor == NAO_DISPONIVEL:
+        return None
+    return f"{str(valor)[:400]}..." # Só um trecho, para não sobrecarregar
+
+
+def _formatador_link(valor, job):
+    if _e_vazio(valor):
+        return None
+    if not valor: # Ex: um zero do NumPy, que não é vazio mas também não é link
+        return _formatador_padrao(valor, job)
+    return f"Link: {valor}"
+
+
+_cache_datas = {}
+
+
+def _formatador_data(valor, job):
+    if _e_vazio(valor):
+        return None
+    booleano = _formatar_booleano_texto(valor)
+    if booleano is not None:
+        return booleano
+    # As datas se repetem muito entre vagas: converte cada uma só uma vez
+    texto = _cache_datas.get(valor) if isinstance(valor, str) else None
+    if texto is None:
+        try:
+            texto = datetime.fromisoformat(valor).strftime("%d/%m/%Y")
+        except (TypeError, ValueError):
+            texto = str(valor)
+        if isinstance(valor, str) and len(_cache_datas) < 10000:
+            _cache_datas[valor] = texto
+    return texto
+
+
+def formatar_moeda_br(numero: float) -> str:
+    """
+    Formata no padrão brasileiro: 1234.5 -> '1.234,50'.
+    """
+    return f"{numero:,.2f}".translate(_MOEDA_BR)
+
+
+_cache_moedas = {}
+
+
+def _moeda(job: dict) -> str:
+    # Moeda pelo campo 'currency' ou pela localização (salarios.py); a padrão (EUR) quando a vaga não indica.
+    # As localizações se repetem muito entre vagas: resolve cada combinação uma vez só.
+    chave = tuple(valor if isinstance(valor, str) else None for valor in (job.get('currency'), job.get('location')))
+    moeda = _cache_moedas.get(chave)
+    if moeda is None:
+        import salarios # Import local: só carregado quando há salário para exibir
+        moeda = salarios.tabela_padrao().moeda_da_vaga({'currency': chave[0], 'location': chave[1]})
+        if len(_cache_moedas) < 10000:
+            _cache_moedas[chave] = moeda
+    return moeda
+
+
+def _criar_formatador_salario(campo: str) -> Callable:
+    # Pré-calcula, para este campo, o sufixo de cada unidade salarial
+    sufixos = {unidade: sufixo for unidade, (sufixo, campos) in _SUFIXOS_SALARIO.items() if campos is None or campo in campos}
+
+    def formatar(valor, job):
+        if _e_vazio(valor):
+            return None
+        try:
+            numero = float(valor)
+        except (TypeError, ValueError):
+            return str(valor) # Se não for número (ex: 'monthly' em salary_unit), mostra como texto
+        unidade = job.get('salary_unit') or ''
+        return f"{_moeda(job)} {formatar_moeda_br(numero)}{sufixos.get(unidade.lower(), '') if isinstance(unidade, str) else ''}"
+
+    return formatar
+
+
+def _escolher_formatador(campo: str) -> Callable:
+    if campo == 'description':
+        return _formatador_descricao
+    if campo in CAMPOS_LINK:
+        return _formatador_link
+    if campo.startswith('salary_'):
+        return _criar_formatador_salario(campo)
+    if campo == 'date_posted':
+        return _formatador_data
+    return _formatador_padrao
+
+
+# Tabela pré-compilada: (campo, rótulo, formatador, sempre exibido)
+TABELA_CAMPOS: List[Tuple[str, str, Callable, bool]] = [
+    (campo, rotulo, _escolher_formatador(campo), campo in CAMPOS_SEMPRE_EXIBIDOS)
+    for campo, rotulo in JOB_FIELD_TRANSLATIONS.items()
+]
+
+
+# Mesma tabela com o prefixo da linha de texto já montado
+_TABELA_TXT = [(campo, f"  > {rotulo}: ", formatador, sempre) for campo, rotulo, formatador, sempre in TABELA_CAMPOS]
+
+
+def formatar_campos(job: dict) -> List[Tuple[str, str, str]]:
+    """
+    Devolve [(campo, rótulo, texto)] na ordem do relatório, já sem os campos ocultos.
+    """
+    campos = []
+    for campo, rotulo, formatador, sempre in TABELA_CAMPOS:
+        valor = job.get(campo)
+        texto = None if valor is None else formatador(valor, job)
+        if texto is None or texto == NAO_DISPONIVEL:
+            if not sempre:
+                continue
+            texto = NAO_DISPONIVEL
+        campos.append((campo, rotulo, texto))
+    return campos
+
+
+# --- Renderização de uma vaga em cada formato ---
+def _titulo(numero: int, job: dict) -> str:
+    return f"Vaga #{numero}: {job.get('title', 'Título Desconhecido')} na {job.get('company', 'Empresa Desconhecida')}"
+
+
+def renderizar_txt(numero: int, job: dict) -> str:
+    partes = [f"\n--- {_titulo(numero, job)} ---\n"]
+    for campo, prefixo, formatador, sempre in _TABELA_TXT:
+        valor = job.get(campo)
+        texto = None if valor is None else formatador(valor, job)
+        if texto is None or texto == NAO_DISPONIVEL:
+            if not sempre:
+                continue
+            texto = NAO_DISPONIVEL
+        partes.append(prefixo + texto + "\n")
+    partes.append(_SEPARADOR_TXT)
+    return "".join(partes)
+
+
+def renderizar_md(numero: int, job: dict) -> str:
+    partes = [f"### {_titulo(numero, job)}\n\n"]
+    for campo, rotulo, texto in formatar_campos(job):
+        if campo in CAMPOS_LINK and texto != NAO_DISPONIVEL:
+            url = texto[len("Link: "):]
+            texto = f"[{url}]({url})"
+        # Recuo nas linhas seguintes para o texto continuar dentro do item da lista
+        partes.append(f"- **{rotulo}:** {texto.replace(chr(10), chr(10) + '  ')}\n")
+    partes.append("\n---\n\n")
+    return "".join(partes)
+
+
+def renderizar_html(numero: int, job: dict) -> str:
+    partes = [f'<article class="vaga">\n<h3>{html.escape(_titulo(numero, job))}</h3>\n<dl>\n']
+    for campo, rotulo, texto in formatar_campos(job):
+        if campo in CAMPOS_LINK and texto != NAO_DISPONIVEL:
+            url = html.escape(texto[len("Link: "):])
+            conteudo = f'<a href="{url}">{url}</a>'
+        else:
+            conteudo = html.escape(texto).replace("\n", "<br>\n")
+        partes.append(f"<dt>{html.escape(rotulo)}</dt><dd>{conteudo}</dd>\n")
+    partes.append("</dl>\n</article>\n")
+    return "".join(partes)
+
+
+RENDERIZADORES = {
+    "txt": renderizar_txt,
+    "md": renderizar_md,
+    "html": renderizar_html,
+}
+
+_CABECALHO_HTML = ('<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+                   '<title>{titulo}</title>\n</head>\n<body>\n<h1>{titulo}</h1>\n')
+_RODAPE_HTML = "</body>\n</html>\n"
+
+
+def renderizar_vaga(numero: int, job: dict, formato: str = "txt") -> str:
+    """
+    Renderiza uma única vaga no formato pedido.
+    """
+    return RENDERIZADORES[formato](numero, job)
+
+
+def escrever_vagas(jobs: Iterable[dict], saida: TextIO, formato: str = "txt", inicio: int = 1) -> int:
+    """
+    Renderiza as vagas em streaming para `saida`, escrevendo em blocos de VAGAS_POR_BLOCO.
+    Retorna quantas vagas foram escritas.
+    """
+    renderizar = RENDERIZADORES[formato]
+    bloco = []
+    total = 0
+    for numero, job in enumerate(jobs, start=inicio):
+        bloco.append(renderizar(numero, job))
+        total += 1
+        if len(bloco) >= VAGAS_POR_BLOCO:
+            saida.write("".join(bloco))
+            bloco = []
+    if bloco:
+        saida.write("".join(bloco))
+    return total
+
+
+def gerar_relatorio(jobs: Iterable[dict], caminho: str, formato: Optional[str] = None, titulo: str = "Relatório de Vagas") -> int:
+    """
+    Grava um relatório completo num arquivo. O formato é deduzido da extensão se não for informado.
+    """
+    if formato is None:
+        extensao = caminho.rsplit(".", 1)[-1].lower()
+        formato = {"md": "md", "markdown": "md", "html": "html", "htm": "html"}.get(extensao, "txt")
+    with open(caminho, "w", encoding="utf-8", buffering=1024 * 1024) as saida:
+        if formato == "html":
+            saida.write(_CABECALHO_HTML.format(titulo=html.escape(titulo)))
+        elif formato == "md":
+            saida.write(f"# {titulo}\n\n")
+        total = escrever_vagas(jobs, saida, formato)
+        if formato == "html":
+            saida.write(_RODAPE_HTML)
+    return total
+
+
+def ler_vagas_jsonl(caminho: str) -> Iterable[dict]:
+    """
+    Lê vagas de um JSONL: aceita uma vaga por linha (ex: saída do importador.py)
+    ou um resultado de busca por linha com a lista 'jobs' (ex: saída do lote.py).
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            if isinstance(registro.get("jobs"), list):
+                yield from registro["jobs"]
+            elif "error" not in registro:
+                yield registro
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um relatório de vagas a partir de um arquivo JSONL.")
+    parser.add_argument("entrada", help="JSONL com vagas (importador.py) ou resultados de busca (lote.py).")
+    parser.add_argument("--saida", required=True, help="Arquivo do relatório (.txt, .md ou .html).")
+    parser.add_argument("--formato", choices=FORMATOS, help="Formato do relatório (padrão: pela extensão).")
+    parser.add_argument("--titulo", default="Relatório de Vagas")
+    parser.add_argument("--salario-minimo", type=float, help="Só vagas com salário anual estimado a partir deste valor (ver salarios.py).")
+    parser.add_argument("--ordenar-salario", action="store_true", help="Ordena do maior para o menor salário anual estimado.")
+    parser.add_argument("--termo", help="Termo buscado, usado pela relevância (ver relevancia.py).")
+    parser.add_argument("--relevancia-minima", type=float, help="Só vagas com relevância para --termo a partir deste valor (0 a 1).")
+    parser.add_argument("--ordenar-relevancia", action="store_true", help="Ordena da mais para a menos relevante para --termo (a ordem por salário tem precedência).")
+    args = parser.parse_args()
+    usar_salario = args.salario_minimo is not None or args.ordenar_salario
+    usar_relevancia = args.relevancia_minima is not None or args.ordenar_relevancia
+    if usar_relevancia and not args.termo:
+        parser.error("--relevancia-minima e --ordenar-relevancia precisam de --termo.")
+
+    vagas = ler_vagas_jsonl(args.entrada)
+    if usar_salario or usar_relevancia:
+        import numpy as np # Imports locais: o NumPy só é carregado quando o filtro/ordenação é pedido
+        import registro
+        import salarios
+        vagas = registro.compactar(vagas) # Todas ficam em memória: em registros compactos
+        posicoes = np.arange(len(vagas))
+        if usar_salario:
+            indice = salarios.IndiceSalarios.das_vagas(vagas)
+            posicoes = indice.filtrar(args.salario_minimo) if args.salario_minimo is not None else indice.ordenadas()
+            if not args.ordenar_salario:
+                posicoes.sort() # Só o filtro: mantém a ordem do arquivo
+        if usar_relevancia:
+            import relevancia
+            relevantes = relevancia.IndiceRelevancia.das_vagas(vagas).filtrar(args.termo, args.relevancia_minima or 0.0)
+            posicoes = relevancia.combinar(posicoes, relevantes, args.ordenar_relevancia and not args.ordenar_salario)
+        vagas = salarios.selecionar(vagas, posicoes)
+    total = gerar_relatorio(vagas, args.saida, args.formato, args.titulo)
+    print(f"--- Relatório com {total} vaga(s) gravado em '{args.saida}' ---")
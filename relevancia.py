@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Relevância local das vagas para o termo buscado (BM25).
+#
+# A API devolve vagas pouco relacionadas ao termo (ver Freelance.txt: uma busca por "freelance"
+# traz vagas de logística). `IndiceRelevancia` pontua cada vaga pelo título, habilidades e
+# descrição contra o `search_term`, para ordenar as vagas ou esconder as pouco relevantes antes
+# de exibi-las. O índice é uma matriz esparsa termo x vaga em arrays do NumPy (formato CSC:
+# as vagas de cada termo ficam contíguas), então pontuar uma busca só percorre as vagas que
+# contêm os termos dela: dezenas de milhares de vagas em poucos milissegundos.
+#
+# Uso: python relevancia.py vagas.jsonl "Analista de Dados" [--minimo 0.2] [--limite 20]
+
+import argparse
+import re
+import unicodedata
+from array import array
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# --- Parâmetros do BM25 ---
+K1 = 1.2  # Saturação da frequência do termo na vaga
+B = 0.75  # Quanto o tamanho da vaga penaliza a pontuação
+PESOS_CAMPOS = {"title": 3, "skills": 2, "description": 1} # Um termo no título vale por 3 na descrição
+LIMIAR_PADRAO = 0.2 # Relevância mínima (fração da vaga mais relevante da busca) para a vaga ser exibida
+
+# Palavras comuns (já sem acento) que não ajudam a separar as vagas
+PALAVRAS_IGNORADAS = frozenset("""
+    de da do das dos em na no nas nos para por com sem um uma uns umas os as ao aos que se ou
+    sua seu suas seus mais como pelo pela the and or of to in for with on at an is are be by
+    from you we our your will this that it
+""".split())
+
+_TOKEN = re.compile(r"[^\W_]{2,}") # Letras e dígitos, pelo menos 2
+_ACENTOS = re.compile(r"[\u0300-\u036f]") # Marcas de acento separadas pela normalização NFKD
+
+
+# --- Tokenização ---
+def _palavras(texto) -> List[str]:
+    # Palavras do texto em minúsculas e sem acentos, ainda com as comuns e os plurais
+    if not texto:
+        return []
+    if isinstance(texto, (list, tuple)):
+        texto = " ".join(str(item) for item in texto)
+    texto = str(texto).lower()
+    if not texto.isascii():
+        texto = _ACENTOS.sub("", unicodedata.normalize("NFKD", texto))
+    return _TOKEN.findall(texto)
+
+
+def _termo(palavra: str) -> Optional[str]:
+    # Termo do índice para uma palavra: None para as comuns; sem o 's' do plural
+    if palavra in PALAVRAS_IGNORADAS:
+        return None
+    return palavra[:-1] if len(palavra) > 3 and palavra[-1] == "s" and palavra[-2] != "s" else palavra
+
+
+def tokenizar(texto) -> List[str]:
+    """
+    Quebra um texto em termos: minúsculas, sem acentos, sem palavras comuns e sem o 's' do plural
+    ('Analistas de Dados' -> ['analista', 'dado']). Listas (ex: skills) são unidas antes.
+    """
+    return [termo for termo in map(_termo, _palavras(texto)) if termo is not None]
+
+
+# --- Índice ---
+class IndiceRelevancia:
+    """
+    Índice BM25 de uma lista de vagas (mesmas posições da lista original).
+    Novas vagas entram com `adicionar` e são incorporadas à matriz na próxima consulta.
+    """
+
+    def __init__(self, jobs: Iterable[dict] = ()):
+        self._vocabulario = {}
+        self._codigos = {} # Palavra -> número do termo no vocabulário (-1 para as palavras comuns)
+        # Matriz consolidada, ordenada por termo e depois por vaga (CSC)
+        self._vagas = np.empty(0, dtype=np.int64)
+        self._frequencias = np.empty(0, dtype=np.float64) # Frequência ponderada pelo peso do campo
+        self._inicio = np.zeros(1, dtype=np.int64)        # Vagas do termo t: _inicio[t]:_inicio[t + 1]
+        self._normalizacao = np.empty(0, dtype=np.float64) # K1 * (1 - B + B * tamanho / tamanho médio)
+        self._consolidadas = 0
+        # Vagas ainda não consolidadas: termos em sequência, um trecho por campo
+        self._termos_pendentes = array("q")
+        self._trechos: List[tuple] = [] # (posição da vaga, peso do campo, quantidade de termos)
+        self._ultima_consulta = None
+        self.total = 0
+        for job in jobs:
+            self.adicionar(job)
+
+    @classmethod
+    def das_vagas(cls, jobs: Iterable[dict]) -> "IndiceRelevancia":
+        return cls(jobs)
+
+    def adicionar(self, job: dict) -> int:
+        """
+        Tokeniza os campos da próxima vaga da lista. Retorna a posição dela.
+        """
+        posicao = self.total
+        self.total += 1
+        for campo, peso in PESOS_CAMPOS.items():
+            palavras = _palavras(job.get(campo))
+            if not palavras:
+                continue
+            # A maioria das palavras já foi vista: a busca no dicionário roda em C (map + get)
+            codigos = list(map(self._codigos.get, palavras))
+            if None in codigos:
+                codigos = [self._codificar(palavra) if codigo is None else codigo for palavra, codigo in zip(palavras, codigos)]
+            self._termos_pendentes.extend(codigos)
+            self._trechos.append((posicao, peso, len(codigos)))
+        return posicao
+
+    def _codificar(self, palavra: str) -> int:
+        termo = _termo(palavra)
+        codigo = -1 if termo is None else self._vocabulario.setdefault(termo, len(self._vocabulario))
+        self._codigos[palavra] = codigo
+        return codigo
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _consolidar(self):
+        if self._consolidadas == self.total:
+            return
+        termos = np.frombuffer(self._termos_pendentes, dtype=np.int64) if self._trechos else np.empty(0, dtype=np.int64)
+        trechos = np.array(self._trechos, dtype=np.int64).reshape(-1, 3)
+        vagas = np.repeat(trechos[:, 0], trechos[:, 2])
+        pesos = np.repeat(trechos[:, 1], trechos[:, 2]).astype(np.float64)
+        self._termos_pendentes = array("q")
+        self._trechos = []
+        uteis = termos >= 0 # Descarta as palavras comuns
+        termos, vagas, pesos = termos[uteis], vagas[uteis], pesos[uteis]
+
+        # Soma as ocorrências de cada par (termo, vaga): a chave já sai ordenada por termo e vaga
+        chaves, inversos = np.unique(termos * self.total + vagas, return_inverse=True)
+        frequencias = np.bincount(inversos, weights=pesos, minlength=len(chaves))
+        novos_termos, novas_vagas = np.divmod(chaves, self.total)
+
+        # As vagas novas vêm depois das antigas: a ordenação estável por termo mantém a ordem por vaga
+        termos_antigos = np.repeat(np.arange(len(self._inicio) - 1), np.diff(self._inicio))
+        todos_termos = np.concatenate([termos_antigos, novos_termos])
+        ordem = np.argsort(todos_termos, kind="stable")
+        self._vagas = np.concatenate([self._vagas, novas_vagas])[ordem]
+        self._frequencias = np.concatenate([self._frequencias, frequencias])[ordem]
+        contagens = np.bincount(todos_termos, minlength=len(self._vocabulario))
+        self._inicio = np.concatenate([[0], np.cumsum(contagens)])
+
+        tamanhos = np.bincount(self._vagas, weights=self._frequencias, minlength=self.total)
+        media = tamanhos.mean() or 1.0
+        self._normalizacao = K1 * (1 - B + B * tamanhos / media)
+        self._consolidadas = self.total
+        self._ultima_consulta = None
+
+    def pontuar(self, consulta: str) -> np.ndarray:
+        """
+        Pontuação BM25 de cada vaga para a consulta (0 = nenhum termo da consulta aparece na vaga).
+        """
+        self._consolidar()
+        if self._ultima_consulta is not None and self._ultima_consulta[0] == consulta:
+            return self._ultima_consulta[1].copy()
+        pontos = np.zeros(self.total, dtype=np.float64)
+        for termo in {self._vocabulario.get(termo) for termo in tokenizar(consulta)} - {None}:
+            inicio, fim = self._inicio[termo], self._inicio[termo + 1]
+            vagas = self._vagas[inicio:fim]
+            frequencias = self._frequencias[inicio:fim]
+            idf = np.log(1 + (self.total - (fim - inicio) + 0.5) / ((fim - inicio) + 0.5))
+            pontos[vagas] += idf * frequencias * (K1 + 1) / (frequencias + self._normalizacao[vagas])
+        self._ultima_consulta = (consulta, pontos)
+        return pontos.copy()
+
+    def relevancia(self, consulta: str) -> np.ndarray:
+        """
+        Pontuação relativa à vaga mais relevante (0 a 1). Se a consulta não tiver nenhum termo útil
+        (ex: só palavras comuns), todas as vagas valem 1.
+        """
+        if not tokenizar(consulta):
+            return np.ones(self.total, dtype=np.float64)
+        pontos = self.pontuar(consulta)
+        maximo = pontos.max() if len(pontos) else 0.0
+        return pontos / maximo if maximo > 0 else pontos
+
+    def ordenadas(self, consulta: str) -> np.ndarray:
+        """
+        Posições das vagas da mais para a menos relevante (empates na ordem original).
+        """
+        return np.argsort(-self.pontuar(consulta), kind="stable")
+
+    def filtrar(self, consulta: str, minimo: float = LIMIAR_PADRAO) -> np.ndarray:
+        """
+        Posições das vagas com relevância >= minimo, da mais para a menos relevante.
+        """
+        relevancia = self.relevancia(consulta)
+        ordem = np.argsort(-relevancia, kind="stable")
+        return ordem[relevancia[ordem] >= minimo]
+
+
+def combinar(posicoes: np.ndarray, relevantes: np.ndarray, ordenar_por_relevancia: bool) -> np.ndarray:
+    """
+    Restringe `posicoes` (ex: o filtro de salário) às `relevantes` (resultado de `filtrar`).
+    A ordem é a de `relevantes` se `ordenar_por_relevancia`, senão a de `posicoes`.
+    """
+    if ordenar_por_relevancia:
+        return relevantes[np.isin(relevantes, posicoes)]
+    return posicoes[np.isin(posicoes, relevantes)]
+
+
+def selecionar_relevantes(jobs: list, consulta: str, minimo: Optional[float] = None, ordenar: bool = True) -> list:
+    """
+    Devolve as vagas com relevância >= minimo (todas, se None), da mais para a menos relevante
+    ou, com `ordenar=False`, na ordem original.
+    """
+    posicoes = IndiceRelevancia(jobs).filtrar(consulta, minimo or 0.0)
+    if not ordenar:
+        posicoes.sort()
+    return [jobs[posicao] for posicao in posicoes]
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    from relatorio import ler_vagas_jsonl
+
+    parser = argparse.ArgumentParser(description="Ordena vagas pela relevância para um termo de busca (BM25).")
+    parser.add_argument("entrada", help="JSONL com vagas (importador.py) ou resultados de busca (lote.py).")
+    parser.add_argument("termo", help="Termo buscado (ex: 'Analista de Dados').")
+    parser.add_argument("--minimo", type=float, default=0.0, help="Relevância mínima, de 0 a 1 (fração da vaga mais relevante).")
+    parser.add_argument("--limite", type=int, default=20, help="Quantas vagas mostrar (0 = todas).")
+    args = parser.parse_args()
+
+    vagas = list(ler_vagas_jsonl(args.entrada))
+    indice = IndiceRelevancia.das_vagas(vagas)
+    relevancia = indice.relevancia(args.termo)
+    posicoes = indice.filtrar(args.termo, args.minimo)
+    print(f"--- {len(posicoes)} de {len(vagas)} vaga(s) com relevância >= {args.minimo:.2f} para '{args.termo}' ---")
+    for numero, posicao in enumerate(posicoes[:args.limite or None], start=1):
+        job = vagas[posicao]
+        print(f"{numero:>4}. {relevancia[posicao]:5.2f} | {job.get('title') or 'N/A'} — "
+              f"{job.get('company') or 'N/A'} ({job.get('location') or 'N/A'})")
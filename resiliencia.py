@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Camada de resiliência das chamadas à API, usada pelo cliente_api.py em todos os endpoints.
+#
+# - Repetição com espera exponencial e "jitter" (aleatória entre 0 e o teto) em respostas 5xx
+#   e falhas de conexão; timeouts de leitura só são repetidos em chamadas idempotentes
+#   (uma busca), nunca num turno de chat que o servidor pode já ter processado.
+# - Duplicação de chamadas lentas (hedging): numa chamada idempotente que passa do p95 das
+#   latências recentes do endpoint, uma segunda cópia é enviada e vale a que responder
+#   primeiro. A cópia só sai se houver uma ficha livre no limitador (conta na cota, mas
+#   nunca atrasa as requisições normais).
+# - Disjuntor (circuit breaker) por host: depois de várias falhas seguidas as chamadas
+#   falham na hora, sem prender threads esperando timeouts, até um teste dar certo.
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+import metricas
+
+# --- Repetição ---
+MAXIMO_TENTATIVAS = 3       # Tentativas por chamada (a 1ª + 2 repetições)
+ESPERA_BASE = 0.5           # Teto da espera antes da 1ª repetição (dobra a cada tentativa)
+ESPERA_MAXIMA = 8.0
+PRAZO_TOTAL = 90.0          # Não começa uma nova tentativa depois disso (segundos desde a 1ª)
+STATUS_REPETIR = frozenset((500, 502, 503, 504))
+
+# --- Duplicação de chamadas lentas ---
+DUPLICAR_LENTAS = os.environ.get("VAGAS_DUPLICAR_LENTAS", "1") != "0"
+PERCENTIL_DUPLICACAO = 0.95
+AMOSTRAS_LATENCIA = 200     # Latências guardadas por endpoint
+AMOSTRAS_MINIMAS = 10       # Com menos amostras que isso, usa ATRASO_DUPLICACAO_INICIAL
+ATRASO_DUPLICACAO_INICIAL = 3.0
+ATRASO_DUPLICACAO_MINIMO = 0.05
+
+# --- Disjuntor ---
+FALHAS_PARA_ABRIR = 5       # Falhas seguidas que abrem o circuito
+TEMPO_ABERTO = 30.0         # Segundos falhando na hora antes de deixar passar um teste
+
+
+class CircuitoAberto(requests.exceptions.ConnectionError):
+    """
+    A API falhou várias vezes seguidas: a chamada foi recusada sem ir à rede.
+    Subclasse de ConnectionError, então os tratamentos de "erro de conexão" já a cobrem.
+    """
+
+
+def espera_repeticao(tentativa: int, retry_after: Optional[float] = None) -> float:
+    """
+    Espera antes da repetição número `tentativa` (0 = a primeira): aleatória entre 0 e
+    ESPERA_BASE * 2^tentativa (limitada a ESPERA_MAXIMA), ou o Retry-After do servidor, se maior.
+    """
+    espera = random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** tentativa))
+    return max(espera, min(retry_after, ESPERA_MAXIMA)) if retry_after else espera
+
+
+def pode_repetir_erro(erro: Exception, idempotente: bool) -> bool:
+    """
+    Falha na conexão (a requisição não chegou ao servidor): sempre pode repetir.
+    Timeout esperando a resposta: só se repetir a chamada não tiver efeito colateral.
+    """
+    if isinstance(erro, CircuitoAberto):
+        return False
+    if isinstance(erro, (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout)):
+        return True
+    return idempotente and isinstance(erro, requests.exceptions.Timeout)
+
+
+def chave_endpoint(metodo: str, url: str) -> str:
+    partes = urlsplit(url)
+    return f"{metodo.upper()} {partes.netloc}{partes.path.rstrip('/')}"
+
+
+def origem(url: str) -> str:
+    partes = urlsplit(url)
+    return f"{partes.scheme}://{partes.netloc}"
+
+
+# --- Latências ---
+class HistoricoLatencias:
+    """
+    Últimas latências (até os cabeçalhos da resposta) de cada endpoint, para o p95 da duplicação.
+    """
+
+    def __init__(self, tamanho: int = AMOSTRAS_LATENCIA):
+        self.tamanho = tamanho
+        self._amostras = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, chave: str, segundos: float):
+        with self._trava:
+            amostras = self._amostras.get(chave)
+            if amostras is None:
+                amostras = self._amostras[chave] = deque(maxlen=self.tamanho)
+            amostras.append(segundos)
+
+    def percentil(self, chave: str, fracao: float = PERCENTIL_DUPLICACAO) -> Optional[float]:
+        with self._trava:
+            amostras = sorted(self._amostras.get(chave, ()))
+        if len(amostras) < AMOSTRAS_MINIMAS:
+            return None
+        return amostras[min(len(amostras) - 1, int(fracao * len(amostras)))]
+
+    def atraso_duplicacao(self, chave: str) -> float:
+        p95 = self.percentil(chave)
+        return ATRASO_DUPLICACAO_INICIAL if p95 is None else max(ATRASO_DUPLICACAO_MINIMO, p95)
+
+    def limpar(self):
+        with self._trava:
+            self._amostras.clear()
+
+
+# --- Disjuntor ---
+class Disjuntor:
+    """
+    Circuit breaker de um host: 'fechado' (normal), 'aberto' (recusa na hora por TEMPO_ABERTO s)
+    e 'meio_aberto' (deixa passar uma única chamada de teste; se der certo, fecha de novo).
+    """
+
+    def __init__(self, falhas_para_abrir: Optional[int] = None, tempo_aberto: Optional[float] = None):
+        self.falhas_para_abrir = falhas_para_abrir or FALHAS_PARA_ABRIR
+        self.tempo_aberto = tempo_aberto or TEMPO_ABERTO
+        self.estado = "fechado"
+        self.falhas_seguidas = 0
+        self.recusadas = 0
+        self._reabre_em = 0.0
+        self._teste_em_andamento = False
+        self._trava = threading.Lock()
+
+    def verificar(self) -> bool:
+        """
+        Levanta CircuitoAberto se a chamada não deve sair agora. Retorna True quando a chamada é o
+        teste do estado meio aberto: quem a faz precisa terminar com `registrar_sucesso`,
+        `registrar_falha` ou `liberar_teste`, senão o disjuntor recusa todas as chamadas seguintes.
+        """
+        with self._trava:
+            if self.estado == "fechado":
+                return False
+            agora = time.monotonic()
+            if self.estado == "aberto" and agora >= self._reabre_em:
+                self.estado = "meio_aberto"
+            if self.estado == "meio_aberto" and not self._teste_em_andamento:
+                self._teste_em_andamento = True # Esta chamada é o teste
+                return True
+            self.recusadas += 1
+            restante = max(0.0, self._reabre_em - agora)
+        raise CircuitoAberto(f"A API parece fora do ar ({self.falhas_seguidas} falhas seguidas). "
+                             f"Nova tentativa liberada em ~{restante:.0f}s.")
+
+    def liberar_teste(self):
+        # A chamada de teste falhou antes de chegar à rede (ex: URL inválida, erro no limitador): não conta nada
+        with self._trava:
+            self._teste_em_andamento = False
+
+    def registrar_sucesso(self):
+        with self._trava:
+            self.estado = "fechado"
+            self.falhas_seguidas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self):
+        with self._trava:
+            self.falhas_seguidas += 1
+            self._teste_em_andamento = False
+            if self.estado == "meio_aberto" or self.falhas_seguidas >= self.falhas_para_abrir:
+                self.estado = "aberto"
+                self._reabre_em = time.monotonic() + self.tempo_aberto
+
+
+# --- Estado compartilhado do processo ---
+latencias = HistoricoLatencias()
+_disjuntores = {}
+_trava_disjuntores = threading.Lock()
+_contadores = {"repeticoes": 0, "duplicatas": 0, "duplicatas_vencedoras": 0}
+_trava_contadores = threading.Lock()
+
+
+def disjuntor_para(url: str) -> Disjuntor:
+    """
+    Retorna o disjuntor do host da URL (um por host, compartilhado por todas as threads).
+    """
+    chave = origem(url)
+    with _trava_disjuntores:
+        disjuntor = _disjuntores.get(chave)
+        if disjuntor is None:
+            disjuntor = _disjuntores[chave] = Disjuntor()
+        return disjuntor
+
+
+def contar(nome: str, quantidade: int = 1):
+    with _trava_contadores:
+        _contadores[nome] += quantidade
+    metricas.incrementar(f"vagas_{nome}_total", quantidade)
+
+
+def estatisticas() -> dict:
+    """
+    Repetições, duplicatas enviadas/vencedoras e estado dos disjuntores por host.
+    """
+    with _trava_contadores:
+        resultado = dict(_contadores)
+    with _trava_disjuntores:
+        resultado["disjuntores"] = {
+            host: {"estado": d.estado, "falhas_seguidas": d.falhas_seguidas, "recusadas": d.recusadas}
+            for host, d in _disjuntores.items()
+        }
+    return resultado
+
+
+def reiniciar():
+    """
+    Fecha todos os disjuntores e esquece latências e contadores (útil em testes e benchmarks).
+    """
+    latencias.limpar()
+    with _trava_disjuntores:
+        _disjuntores.clear()
+    with _trava_contadores:
+        for nome in _contadores:
+            _contadores[nome] = 0
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Normalização dos salários das vagas para um valor anual comparável.
+#
+# A API devolve o salário em campos e unidades diferentes (salary_hourly, salary_yearly,
+# salary_from/to/avg com salary_unit = hourly/daily/weekly/monthly/yearly) e sem moeda.
+# `salario_anual` converte tudo para um valor por ano na moeda de referência, usando uma
+# tabela de câmbio offline (configurável por arquivo JSON). `IndiceSalarios` mantém os
+# valores ordenados em arrays do NumPy: ordenar por salário e filtrar "salário >= X"
+# viram uma busca binária, em vez de percorrer e reordenar as vagas a cada consulta.
+#
+# Uso: python salarios.py vagas.jsonl --minimo 40000 [--limite 20] [--pais portugal] [--tabela moedas.json]
+
+import argparse
+import json
+import os
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# --- Unidades salariais ---
+# Quantas vezes cada unidade é paga por ano (40 h/semana, 5 dias/semana, 52 semanas)
+UNIDADES_POR_ANO = {
+    "hourly": 2080,
+    "daily": 260,
+    "weekly": 52,
+    "monthly": 12,
+    "yearly": 1,
+}
+UNIDADE_PADRAO = "yearly" # Usada quando a vaga tem valor mas não informa a unidade
+
+# --- Tabela de câmbio offline ---
+# Valores aproximados: quanto vale 1 unidade de cada moeda na moeda de referência.
+# Para atualizar sem mexer no código, aponte VAGAS_TABELA_MOEDAS para um JSON no formato
+# {"referencia": "EUR", "padrao": "EUR", "taxas": {"USD": 0.92, ...}, "paises": {"usa": "USD", ...}}
+MOEDA_REFERENCIA = "EUR"
+TAXAS_PADRAO = {
+    "EUR": 1.0,
+    "USD": 0.92,
+    "GBP": 1.17,
+    "BRL": 0.17,
+    "CHF": 1.05,
+    "CAD": 0.67,
+    "AUD": 0.60,
+    "MXN": 0.050,
+    "INR": 0.011,
+    "PLN": 0.23,
+}
+# País da busca (nomes aceitos pela API) ou código no fim da localização -> moeda
+PAISES_PADRAO = {
+    "portugal": "EUR", "pt": "EUR",
+    "spain": "EUR", "es": "EUR",
+    "france": "EUR", "fr": "EUR",
+    "germany": "EUR", "de": "EUR",
+    "italy": "EUR", "it": "EUR",
+    "netherlands": "EUR", "nl": "EUR",
+    "ireland": "EUR", "ie": "EUR",
+    "brazil": "BRL", "br": "BRL",
+    "usa": "USD", "us": "USD",
+    "uk": "GBP", "gb": "GBP",
+    "switzerland": "CHF", "ch": "CHF",
+    "canada": "CAD",
+    "australia": "AUD", "au": "AUD",
+    "mexico": "MXN", "mx": "MXN",
+    "india": "INR", "in": "INR",
+    "poland": "PLN", "pl": "PLN",
+}
+
+
+class TabelaMoedas:
+    """
+    Taxas de câmbio para a moeda de referência e a moeda usada em cada país.
+    """
+
+    def __init__(self, referencia: str = MOEDA_REFERENCIA, taxas: Optional[dict] = None,
+                 paises: Optional[dict] = None, padrao: Optional[str] = None):
+        self.referencia = referencia.upper()
+        self.taxas = {moeda.upper(): float(taxa) for moeda, taxa in (taxas or TAXAS_PADRAO).items()}
+        self.taxas.setdefault(self.referencia, 1.0)
+        self.paises = {pais.lower(): moeda.upper() for pais, moeda in (paises or PAISES_PADRAO).items()}
+        self.padrao = (padrao or self.referencia).upper()
+
+    def moeda_do_pais(self, pais) -> Optional[str]:
+        return self.paises.get(pais.strip().lower()) if isinstance(pais, str) else None
+
+    def moeda_da_vaga(self, job: dict, pais: Optional[str] = None) -> str:
+        """
+        Moeda do salário da vaga: campo 'currency' (se a API mandar), país no fim da
+        localização ("Lisboa, 11, PT"), país da busca e, por último, a moeda padrão.
+        """
+        moeda = job.get("currency")
+        if isinstance(moeda, str) and moeda.strip():
+            return moeda.strip().upper()
+        return (self.moeda_do_pais(pais_da_localizacao(job.get("location")))
+                or self.moeda_do_pais(pais) or self.padrao)
+
+    def taxa(self, moeda: str) -> Optional[float]:
+        return self.taxas.get(moeda)
+
+
+def pais_da_localizacao(localizacao) -> Optional[str]:
+    # Só confia no último trecho com "Cidade, Estado, País": em "San Francisco, CA" o CA é o estado
+    if not isinstance(localizacao, str):
+        return None
+    partes = [parte.strip() for parte in localizacao.split(",")]
+    if len(partes) >= 3 or (len(partes) == 2 and len(partes[-1]) > 2):
+        return partes[-1]
+    return None
+
+
+def carregar_tabela(caminho: str) -> TabelaMoedas:
+    """
+    Lê uma tabela de câmbio em JSON (campos opcionais: referencia, padrao, taxas, paises).
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    return TabelaMoedas(dados.get("referencia", MOEDA_REFERENCIA), dados.get("taxas"), dados.get("paises"), dados.get("padrao"))
+
+
+_tabela_padrao: Optional[TabelaMoedas] = None
+
+
+def tabela_padrao() -> TabelaMoedas:
+    """
+    Retorna a tabela compartilhada: a do arquivo em VAGAS_TABELA_MOEDAS, se existir, ou a embutida.
+    """
+    global _tabela_padrao
+    if _tabela_padrao is None:
+        caminho = os.environ.get("VAGAS_TABELA_MOEDAS")
+        _tabela_padrao = carregar_tabela(caminho) if caminho else TabelaMoedas()
+    return _tabela_padrao
+
+
+# --- Salário anual de uma vaga ---
+def _numero(valor) -> Optional[float]:
+    # Mesmo critério dos relatórios: zero, NaN e textos não numéricos contam como ausentes
+    if valor is None:
+        return None
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return numero if numero == numero and numero != 0 else None
+
+
+def _fator_unidade(unidade) -> Optional[int]:
+    if not isinstance(unidade, str) or not unidade.strip():
+        return UNIDADES_POR_ANO[UNIDADE_PADRAO]
+    return UNIDADES_POR_ANO.get(unidade.strip().lower())
+
+
+def salario_anual(job: dict, tabela: Optional[TabelaMoedas] = None, pais: Optional[str] = None) -> Optional[float]:
+    """
+    Salário anual estimado da vaga na moeda de referência, ou None se não houver salário
+    (ou se a unidade/moeda for desconhecida). Ordem: salary_yearly, salary_avg, média de
+    salary_from/salary_to (ou o que existir dos dois) na salary_unit, e salary_hourly.
+    """
+    tabela = tabela or tabela_padrao()
+    anual = _numero(job.get("salary_yearly"))
+    if anual is None:
+        base = _numero(job.get("salary_avg"))
+        if base is None:
+            minimo, maximo = _numero(job.get("salary_from")), _numero(job.get("salary_to"))
+            base = (minimo + maximo) / 2 if minimo is not None and maximo is not None else (minimo if minimo is not None else maximo)
+        fator = _fator_unidade(job.get("salary_unit"))
+        if base is not None and fator is not None:
+            anual = base * fator
+        else:
+            por_hora = _numero(job.get("salary_hourly"))
+            anual = por_hora * UNIDADES_POR_ANO["hourly"] if por_hora is not None else None
+    if anual is None:
+        return None
+    taxa = tabela.taxa(tabela.moeda_da_vaga(job, pais))
+    return anual * taxa if taxa is not None else None
+
+
+def serie_salario_anual(df, tabela: Optional[TabelaMoedas] = None, pais: Optional[str] = None):
+    """
+    Versão vetorizada de `salario_anual` para um DataFrame com as colunas da API.
+    Devolve uma Series float (NaN onde não há salário).
+    """
+    import pandas as pd # Import local: só quem transforma em lote paga o import do pandas
+
+    tabela = tabela or tabela_padrao()
+
+    def numero(coluna):
+        if coluna not in df:
+            return pd.Series(np.nan, index=df.index)
+        valores = pd.to_numeric(df[coluna], errors="coerce").astype("float64")
+        return valores.where(valores != 0)
+
+    minimo, maximo = numero("salary_from"), numero("salary_to")
+    base = numero("salary_avg").fillna(((minimo + maximo) / 2).fillna(minimo).fillna(maximo))
+    unidades = df["salary_unit"] if "salary_unit" in df else pd.Series(None, index=df.index, dtype=object)
+    fator = unidades.map(_fator_unidade).astype("float64")
+    por_hora = numero("salary_hourly") * UNIDADES_POR_ANO["hourly"]
+    anual = numero("salary_yearly").fillna((base * fator).where(base.notna() & fator.notna(), por_hora))
+
+    # A moeda é resolvida uma vez por combinação distinta de (currency, localização)
+    def textos(coluna):
+        if coluna not in df:
+            return [None] * len(df)
+        return [valor if isinstance(valor, str) else None for valor in df[coluna]]
+
+    taxas = {}
+    taxa = []
+    for chave in zip(textos("currency"), textos("location")):
+        if chave not in taxas:
+            taxas[chave] = tabela.taxa(tabela.moeda_da_vaga({"currency": chave[0], "location": chave[1]}, pais))
+        taxa.append(taxas[chave])
+    return anual * pd.Series(taxa, index=df.index, dtype="float64")
+
+
+# --- Índice ordenado ---
+class IndiceSalarios:
+    """
+    Índice dos salários anuais de uma lista de vagas, ordenado do maior para o menor.
+    Guarda só as posições das vagas na lista original; as vagas sem salário ficam à parte.
+    Novas vagas entram com `adicionar` e são intercaladas no array na próxima consulta.
+    """
+
+    def __init__(self, salarios: Iterable[Optional[float]] = ()):
+        self._negativos = np.empty(0, dtype=np.float64) # -salário, em ordem crescente (maior salário primeiro)
+        self._posicoes = np.empty(0, dtype=np.int64)
+        self._sem_salario: List[int] = []
+        self._pendentes: List[tuple] = []
+        self._salarios: List[Optional[float]] = [] # Salário de cada posição, para consulta direta
+        self.total = 0
+        for salario in salarios:
+            self.adicionar(salario)
+
+    @classmethod
+    def das_vagas(cls, jobs: Iterable[dict], tabela: Optional[TabelaMoedas] = None, pais: Optional[str] = None) -> "IndiceSalarios":
+        tabela = tabela or tabela_padrao()
+        return cls(salario_anual(job, tabela, pais) for job in jobs)
+
+    def adicionar(self, salario: Optional[float]) -> int:
+        """
+        Registra o salário anual da próxima vaga da lista (None se não houver). Retorna a posição dela.
+        """
+        posicao = self.total
+        self.total += 1
+        if salario is None or salario != salario:
+            self._sem_salario.append(posicao)
+            self._salarios.append(None)
+        else:
+            self._pendentes.append((-float(salario), posicao))
+            self._salarios.append(float(salario))
+        return posicao
+
+    def _consolidar(self):
+        if not self._pendentes:
+            return
+        novos = np.array([valor for valor, _ in self._pendentes], dtype=np.float64)
+        posicoes = np.array([posicao for _, posicao in self._pendentes], dtype=np.int64)
+        self._pendentes = []
+        ordem = np.argsort(novos, kind="stable")
+        novos, posicoes = novos[ordem], posicoes[ordem]
+        # side="right": em caso de empate a vaga mais antiga continua na frente
+        destino = np.searchsorted(self._negativos, novos, side="right")
+        self._negativos = np.insert(self._negativos, destino, novos)
+        self._posicoes = np.insert(self._posicoes, destino, posicoes)
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def com_salario(self) -> int:
+        self._consolidar()
+        return len(self._posicoes)
+
+    def ordenadas(self, incluir_sem_salario: bool = True) -> np.ndarray:
+        """
+        Posições das vagas do maior para o menor salário (as sem salário no fim, na ordem original).
+        """
+        self._consolidar()
+        if not incluir_sem_salario or not self._sem_salario:
+            return self._posicoes.copy()
+        return np.concatenate([self._posicoes, np.array(self._sem_salario, dtype=np.int64)])
+
+    def filtrar(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> np.ndarray:
+        """
+        Posições das vagas com minimo <= salário anual <= maximo, do maior para o menor salário.
+        """
+        self._consolidar()
+        inicio = 0 if maximo is None else np.searchsorted(self._negativos, -maximo, side="left")
+        fim = len(self._negativos) if minimo is None else np.searchsorted(self._negativos, -minimo, side="right")
+        return self._posicoes[inicio:max(inicio, fim)].copy()
+
+    def salario(self, posicao: int) -> Optional[float]:
+        return self._salarios[posicao]
+
+
+def selecionar(jobs: list, posicoes: Iterable[int]) -> list:
+    """
+    Devolve as vagas nas posições indicadas (ex: resultado de `ordenadas` ou `filtrar`).
+    """
+    return [jobs[posicao] for posicao in posicoes]
+
+
+def formatar_salario_anual(valor: Optional[float], tabela: Optional[TabelaMoedas] = None) -> str:
+    if valor is None or valor != valor:
+        return "Não disponível"
+    import relatorio # Import local: relatorio.py importa vagas.py (e o requests)
+    return f"{(tabela or tabela_padrao()).referencia} {relatorio.formatar_moeda_br(valor)} por Ano"
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    from relatorio import ler_vagas_jsonl
+
+    parser = argparse.ArgumentParser(description="Ordena e filtra vagas pelo salário anual estimado.")
+    parser.add_argument("entrada", help="JSONL com vagas (importador.py) ou resultados de busca (lote.py).")
+    parser.add_argument("--minimo", type=float, help="Salário anual mínimo (na moeda de referência).")
+    parser.add_argument("--maximo", type=float, help="Salário anual máximo (na moeda de referência).")
+    parser.add_argument("--limite", type=int, default=20, help="Quantas vagas mostrar (0 = todas).")
+    parser.add_argument("--pais", help="País da busca, usado quando a vaga não indica a moeda (ex: portugal).")
+    parser.add_argument("--tabela", help="Tabela de câmbio em JSON (padrão: VAGAS_TABELA_MOEDAS ou a embutida).")
+    args = parser.parse_args()
+
+    tabela = carregar_tabela(args.tabela) if args.tabela else tabela_padrao()
+    vagas = list(ler_vagas_jsonl(args.entrada))
+    indice = IndiceSalarios.das_vagas(vagas, tabela, args.pais)
+    if args.minimo is None and args.maximo is None:
+        posicoes = indice.ordenadas(incluir_sem_salario=False)
+    else:
+        posicoes = indice.filtrar(args.minimo, args.maximo)
+    print(f"--- {len(posicoes)} de {len(vagas)} vaga(s) ({indice.com_salario} com salário informado) ---")
+    for numero, posicao in enumerate(posicoes[:args.limite or None], start=1):
+        job = vagas[posicao]
+        print(f"{numero:>4}. {formatar_salario_anual(indice.salario(posicao), tabela):>26} | "
+              f"{job.get('title') or 'N/A'} — {job.get('company') or 'N/A'} ({job.get('location') or 'N/A'})")
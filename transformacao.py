@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# Acima: Declara a codificação do arquivo como UTF-8 para garantir compatibilidade.
+
+# Transformação das vagas da API para a interface e exportação em formato colunar.
+#
+# Há duas versões da mesma regra (texto do salário, "é remota?", valores padrão):
+#   - `transformar_vaga`: uma vaga por vez, para o painel exibir cada vaga assim que ela chega
+#     (num registro compacto VagaPainel, ver registro.py);
+#   - `transformar_dataframe`: coluna a coluna com pandas, para lotes grandes e exportação.
+# `exportar_vagas` grava os campos da API já tipados + as colunas derivadas em
+# Parquet, CSV ou JSONL, prontos para análise (pandas, DuckDB, planilhas...).
+#
+# Uso: python transformacao.py resultados.jsonl --saida vagas.parquet
+
+import argparse
+import os
+from typing import Iterable, Optional
+
+import registro
+import salarios
+from importador import CAMPOS_DECIMAIS, CAMPOS_INTEIROS
+from vagas import JOB_FIELD_TRANSLATIONS
+
+SALARIO_NAO_DISPONIVEL = "Não disponível"
+
+# Valor exibido no painel quando a API não manda o campo (ou manda null).
+PADROES_UI = {
+    "title": "N/A",
+    "company": "N/A",
+    "location": "N/A",
+    "date_posted": "N/A",
+    "description": "Descrição não disponível.",
+    "job_type": "N/A",
+}
+COLUNAS_UI = ("title", "company", "location", "is_remote", "date_posted", "description", "job_type", "salary", "annual_salary", "job_url", "skills", "id", "description_truncated")
+CAMPOS_SALARIO = ("salary_from", "salary_to", "salary_avg", "salary_unit")
+
+# Textos da vaga no painel que se repetem muito entre vagas (ver registro.py)
+COLUNAS_UI_INTERNADAS = frozenset({"company", "location", "date_posted", "job_type", "salary"})
+
+# Colunas da exportação: campos da API na ordem dos relatórios + colunas derivadas
+COLUNAS_EXPORTACAO = tuple(JOB_FIELD_TRANSLATIONS) + ("is_remote", "salario_texto", "salario_anual", "remota")
+FORMATOS_EXPORTACAO = ("parquet", "csv", "jsonl")
+
+
+# --- Uma vaga por vez ---
+class VagaPainel(registro.RegistroCompacto):
+    """
+    Uma vaga no formato do painel (COLUNAS_UI), com __slots__, textos repetidos internados
+    e a descrição em UTF-8 (ver registro.py).
+    """
+
+    CAMPOS = COLUNAS_UI
+    INTERNADOS = COLUNAS_UI_INTERNADAS
+    __slots__ = registro.slots_dos_campos(COLUNAS_UI)
+
+
+def texto_salario(job: dict) -> str:
+    """
+    Resume salary_from/salary_to/salary_avg/salary_unit num texto curto (ex: '1500 - 2500 (monthly)').
+    """
+    salary_from = job.get("salary_from")
+    salary_to = job.get("salary_to")
+    salary_avg = job.get("salary_avg")
+    salary_unit = job.get("salary_unit")
+
+    if salary_avg:
+        texto = f"~ {salary_avg}"
+    elif salary_from and salary_to:
+        texto = f"{salary_from} - {salary_to}"
+    elif salary_from:
+        texto = f"A partir de {salary_from}"
+    else:
+        return SALARIO_NAO_DISPONIVEL
+    if salary_unit:
+        texto += f" ({salary_unit})"
+    return texto
+
+
+def vaga_remota(job: dict) -> bool:
+    return bool(job.get("is_remote")) or job.get("work_from_home_type") == "Remoto"
+
+
+def transformar_vaga(job: dict, pais: Optional[str] = None) -> VagaPainel:
+    """
+    Converte uma vaga da API para o registro que o painel exibe.
+    `pais` é o país da busca, usado para saber a moeda do salário quando a vaga não indica.
+    """
+    transformada = {campo: (job.get(campo) if job.get(campo) is not None else padrao) for campo, padrao in PADROES_UI.items()}
+    transformada["is_remote"] = vaga_remota(job)
+    transformada["salary"] = texto_salario(job)
+    transformada["annual_salary"] = salarios.salario_anual(job, pais=pais)
+    transformada["job_url"] = job.get("job_url")
+    transformada["skills"] = job.get("skills") # Usado pela relevância (relevancia.py)
+    transformada["id"] = job.get("id")
+    transformada["description_truncated"] = bool(job.get("description_truncated")) # Só a prévia veio (projecao.py)
+    return VagaPainel(transformada)
+
+
+# --- Coluna a coluna (pandas) ---
+def vagas_para_dataframe(jobs: Iterable[dict], colunas: Iterable[str] = None):
+    """
+    Monta um DataFrame com uma coluna por campo da API (dtype object, valores exatamente como vieram;
+    campos ausentes viram NaN/None). Uma lista de dicionários é convertida em C pelo pandas; um
+    gerador (ex: um JSONL grande) é lido em registros compactos e os registros, coluna a coluna.
+    """
+    import pandas as pd # Import local: só quem transforma em lote paga o import do pandas
+
+    jobs = jobs if isinstance(jobs, list) else registro.compactar(jobs)
+    colunas = list(colunas or (tuple(JOB_FIELD_TRANSLATIONS) + ("is_remote", "currency")))
+    if jobs and isinstance(jobs[0], registro.RegistroCompacto):
+        return pd.DataFrame(registro.colunas(registro.compactar(jobs), colunas), columns=colunas, dtype=object)
+    return pd.DataFrame(jobs, columns=colunas, dtype=object)
+
+
+def _verdadeiro(serie):
+    # Mesmo critério do `if valor:` do Python (None/NaN, 0, "" e False são falsos)
+    return serie.notna() & serie.astype(bool)
+
+
+def serie_texto_salario(df):
+    """
+    Versão vetorizada de `texto_salario` para um DataFrame com as colunas de salário.
+    """
+    import pandas as pd
+
+    tem_media = _verdadeiro(df["salary_avg"])
+    tem_minimo = _verdadeiro(df["salary_from"])
+    tem_maximo = _verdadeiro(df["salary_to"])
+    minimo = df["salary_from"].astype(str)
+
+    texto = pd.Series(SALARIO_NAO_DISPONIVEL, index=df.index, dtype=object)
+    texto = texto.mask(tem_minimo, "A partir de " + minimo)
+    texto = texto.mask(tem_minimo & tem_maximo, minimo + " - " + df["salary_to"].astype(str))
+    texto = texto.mask(tem_media, "~ " + df["salary_avg"].astype(str))
+    com_unidade = (tem_media | tem_minimo) & _verdadeiro(df["salary_unit"])
+    return texto.mask(com_unidade, texto + " (" + df["salary_unit"].astype(str) + ")")
+
+
+def serie_remota(df):
+    return _verdadeiro(df["is_remote"]) | (df["work_from_home_type"] == "Remoto")
+
+
+def transformar_dataframe(df, pais: Optional[str] = None):
+    """
+    Versão vetorizada de `transformar_vaga`: devolve um DataFrame com as colunas do painel.
+    """
+    import pandas as pd
+
+    saida = pd.DataFrame(index=df.index)
+    for coluna in COLUNAS_UI:
+        if coluna == "is_remote":
+            saida[coluna] = serie_remota(df)
+        elif coluna == "salary":
+            saida[coluna] = serie_texto_salario(df)
+        elif coluna == "annual_salary":
+            anual = salarios.serie_salario_anual(df, pais=pais)
+            saida[coluna] = anual.astype(object).where(anual.notna(), None)
+        elif coluna == "description_truncated":
+            saida[coluna] = _verdadeiro(df[coluna]) if coluna in df else False
+        elif coluna in PADROES_UI:
+            saida[coluna] = df[coluna].where(df[coluna].notna(), PADROES_UI[coluna])
+        else:
+            saida[coluna] = df[coluna].where(df[coluna].notna(), None)
+    return saida
+
+
+# --- Exportação ---
+def preparar_exportacao(df, converter_textos: bool = True, pais: Optional[str] = None):
+    """
+    Acrescenta as colunas derivadas e converte os campos numéricos para tipos de verdade
+    (float/Int64), para que Parquet e pandas não tratem tudo como texto.
+    Com `converter_textos=False` as demais colunas ficam como vieram (o JSONL não precisa da conversão).
+    """
+    import pandas as pd
+
+    saida = df.copy()
+    saida["salario_texto"] = serie_texto_salario(df)
+    saida["salario_anual"] = salarios.serie_salario_anual(df, pais=pais)
+    saida["remota"] = serie_remota(df)
+    for coluna in CAMPOS_DECIMAIS:
+        if coluna in saida:
+            saida[coluna] = pd.to_numeric(saida[coluna], errors="coerce").astype("float64")
+    for coluna in CAMPOS_INTEIROS:
+        if coluna in saida:
+            saida[coluna] = pd.to_numeric(saida[coluna], errors="coerce").round().astype("Int64")
+    remota_api = saida["is_remote"]
+    saida["is_remote"] = remota_api.where(remota_api.isna(), remota_api.astype(bool)).astype("boolean")
+    # Demais colunas: texto. Listas/dicionários (ex: skills) viram texto para caber em colunas simples
+    for coluna in saida.columns if converter_textos else ():
+        if saida[coluna].dtype == object:
+            serie = saida[coluna]
+            if pd.api.types.infer_dtype(serie, skipna=True) not in ("string", "empty"):
+                serie = serie.map(lambda valor: valor if valor is None or isinstance(valor, str) or valor != valor else str(valor))
+            saida[coluna] = serie.astype("string")
+    return saida[[coluna for coluna in COLUNAS_EXPORTACAO if coluna in saida]]
+
+
+def formato_pela_extensao(caminho: str) -> str:
+    extensao = os.path.splitext(caminho)[1].lower().lstrip(".")
+    return "jsonl" if extensao in ("json", "ndjson") else extensao
+
+
+def exportar_vagas(jobs: Iterable[dict], caminho: str, formato: Optional[str] = None, pais: Optional[str] = None) -> int:
+    """
+    Grava as vagas em Parquet, CSV ou JSONL (padrão: pela extensão do arquivo). Retorna quantas foram gravadas.
+    A coluna 'salario_anual' traz o salário anual estimado na moeda de referência (ver salarios.py).
+    Parquet requer o pacote opcional pyarrow (pip install pyarrow).
+    """
+    formato = formato or formato_pela_extensao(caminho)
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}'. Use: {', '.join(FORMATOS_EXPORTACAO)}.")
+
+    tabela = preparar_exportacao(vagas_para_dataframe(jobs), converter_textos=formato != "jsonl", pais=pais)
+    try:
+        import pyarrow # Opcional: necessário para Parquet; no CSV é bem mais rápido que o escritor do pandas
+        import pyarrow.csv
+    except ImportError:
+        pyarrow = None
+    if formato == "parquet":
+        if pyarrow is None:
+            raise RuntimeError("Para exportar em Parquet instale o pyarrow: pip install pyarrow")
+        tabela.to_parquet(caminho, index=False)
+    elif formato == "csv" and pyarrow is not None:
+        pyarrow.csv.write_csv(pyarrow.Table.from_pandas(tabela, preserve_index=False), caminho)
+    elif formato == "csv":
+        tabela.to_csv(caminho, index=False, encoding="utf-8")
+    else:
+        tabela.to_json(caminho, orient="records", lines=True, force_ascii=False, date_format="iso")
+    return len(tabela)
+
+
+# --- Execução pela linha de comando ---
+if __name__ == "__main__":
+    from relatorio import ler_vagas_jsonl
+
+    parser = argparse.ArgumentParser(description="Exporta vagas (JSONL do importador.py ou do lote.py) em formato colunar.")
+    parser.add_argument("entrada", help="JSONL com vagas (importador.py) ou resultados de busca (lote.py).")
+    parser.add_argument("--saida", required=True, help="Arquivo de saída (.parquet, .csv ou .jsonl).")
+    parser.add_argument("--formato", choices=FORMATOS_EXPORTACAO, help="Formato (padrão: pela extensão).")
+    parser.add_argument("--pais", help="País da busca, usado na moeda do salário anual quando a vaga não indica.")
+    args = parser.parse_args()
+
+    total = exportar_vagas(ler_vagas_jsonl(args.entrada), args.saida, args.formato, args.pais)
+    print(f"--- {total} vaga(s) exportada(s) para '{args.saida}' ---")
@@ -3,9 +3,16 @@
 
 import requests
 import json
+import sys
 import time
-from datetime import datetime # Para formatação de datas
-from typing import Optional # <--- Adicionado: Importa o tipo Optional
+from typing import Optional, Tuple # <--- Adicionado: Importa o tipo Optional
+
+import cliente_api # Pool de conexões compartilhado com chat_AI.py e painel.py
+import cache_buscas # Cache em disco das buscas, compartilhado com painel.py
+import arquivo_vagas # Arquivo local de todas as vagas recebidas, para a busca offline
+import deduplicacao # Remove vagas repetidas (mesmo id/link ou quase idênticas)
+import json_incremental # Lê o array "jobs" conforme a resposta chega
+import metricas # Tempos das chamadas, gravados em VAGAS_METRICAS
 
 # URL base da sua API
 BASE_URL = "https://minha-api.riberto2006.workers.dev/"
@@ -47,48 +54,117 @@ JOB_FIELD_TRANSLATIONS = {
 }
 
 # --- Função para fazer requisições à API ---
+def relatar_erro_requisicao(erro: Exception):
+    """
+    Explica ao usuário um erro de requisição (HTTP, conexão, timeout ou resposta inválida).
+    """
+    if isinstance(erro, requests.exceptions.HTTPError):
+        response = erro.response
+        print(f"\nOops! Algo deu errado na requisição: {erro}")
+        try:
+            error_detail = response.json().get('detail', 'Detalhe não disponível.')
+            print(f"Detalhes do erro da API: {error_detail}")
+            if "Muitas requisições" in error_detail:
+                print("Parece que o limite de requisições foi atingido. Tente novamente em breve!")
+            elif "inválida" in error_detail or "expirada" in error_detail:
+                print("Sua chave de API está inválida ou expirada. Verifique-a e tente novamente!")
+        except json.JSONDecodeError:
+            print(f"Resposta da API (erro - não JSON): {response.text}")
+    elif isinstance(erro, requests.exceptions.ConnectionError):
+        print(f"\nErro de Conexão: Parece que o servidor está offline ou sua internet está com problemas. Detalhe: {erro}")
+    elif isinstance(erro, requests.exceptions.Timeout):
+        print(f"\nErro de Timeout: A requisição demorou demais para responder. Detalhe: {erro}")
+    elif isinstance(erro, requests.exceptions.RequestException):
+        print(f"\nOcorreu um erro inesperado na requisição: {erro}")
+    else:
+        print(f"\nA API devolveu uma resposta inválida: {erro}")
+
 def fazer_requisicao(endpoint: str, payload: dict, api_key: str, method: str = "POST"):
     """
     Função genérica para fazer uma requisição POST ou GET à API.
     """
-    headers = {
-        "X-API-Key": api_key,
-        "Content-Type": "application/json"
-    }
     url = f"{BASE_URL}/{endpoint}"
 
     try:
         if method.upper() == "POST":
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
+            # Uma busca pode ser repetida/duplicada sem efeito colateral; outros POSTs não
+            response = cliente_api.post_json(url, payload, api_key, idempotente=endpoint == "search_jobs")
         elif method.upper() == "GET":
-            response = requests.get(url, headers=headers)
+            response = cliente_api.get(url, api_key)
         else:
             print("Método HTTP não suportado por esta função.")
             return None
 
         response.raise_for_status() # Levanta um erro para códigos de status HTTP 4xx/5xx
-        return response.json()
-    except requests.exceptions.HTTPError as http_err:
-        print(f"\nOops! Algo deu errado na requisição: {http_err}")
-        try:
-            error_detail = response.json().get('detail', 'Detalhe não disponível.')
-            print(f"Detalhes do erro da API: {error_detail}")
-            if "Muitas requisições" in error_detail:
-                print("Parece que o limite de requisições foi atingido. Tente novamente em breve!")
-            elif "inválida" in error_detail or "expirada" in error_detail:
-                print("Sua chave de API está inválida ou expirada. Verifique-a e tente novamente!")
-        except json.JSONDecodeError:
-            print(f"Resposta da API (erro - não JSON): {response.text}")
-    except requests.exceptions.ConnectionError as conn_err:
-        print(f"\nErro de Conexão: Parece que o servidor está offline ou sua internet está com problemas. Detalhe: {conn_err}")
-    except requests.exceptions.Timeout as timeout_err:
-        print(f"\nErro de Timeout: A requisição demorou demais para responder. Detalhe: {timeout_err}")
+        with metricas.cronometro("vagas_json_segundos", endpoint=endpoint):
+            return response.json()
     except requests.exceptions.RequestException as req_err:
-        print(f"\nOcorreu um erro inesperado na requisição: {req_err}")
+        relatar_erro_requisicao(req_err)
     return None
 
+# --- Exibição de uma vaga no formato dos relatórios ---
+def exibir_vaga(numero: int, job: dict):
+    """
+    Imprime uma vaga no formato '  > Rótulo: valor' usado nos relatórios 'Vagas *.txt'.
+    A formatação de cada campo fica em relatorio.py.
+    """
+    import relatorio # Import local: relatorio.py importa JOB_FIELD_TRANSLATIONS deste módulo
+    sys.stdout.write(relatorio.renderizar_txt(numero, job))
+
 # --- Testando o endpoint /search_jobs ---
-def buscar_e_exibir_vagas(api_key: str, termo_busca: str, localidade: str, pais: str, is_remota: Optional[str] = None, hours_old: Optional[int] = None):
+def _exibir_resumo(count: int, duplicadas: int):
+    print(f"\n--- Boas notícias! Encontramos {count} oportunidades incríveis para você! ---")
+    if duplicadas:
+        print(f"({duplicadas} vaga(s) repetida(s) foram ocultadas.)")
+
+def _transmitir_e_exibir_vagas(api_key: str, url_busca: str, job_payload: dict, deduplicador: deduplicacao.Deduplicador) -> Tuple[Optional[dict], list]:
+    """
+    Baixa a busca em streaming e imprime cada vaga assim que ela chega, sem esperar o resto da resposta.
+    Retorna a resposta completa (para o cache, ou None se a requisição falhou) e as vagas exibidas
+    (em registros compactos, ver registro.py).
+    """
+    import registro # Import local: registro.py importa JOB_FIELD_TRANSLATIONS deste módulo
+    leitor = json_incremental.LeitorVagasIncremental()
+    recebidas = []
+    vagas_exibidas = []
+    exibidas = 0
+    resumo_exibido = False
+    try:
+        for job in json_incremental.transmitir_busca(url_busca, job_payload, api_key, leitor):
+            recebidas.append(job)
+            if not deduplicador.e_nova(job):
+                continue
+            if exibidas == 0:
+                if 'count' in leitor.campos: # A API costuma mandar o total antes das vagas
+                    _exibir_resumo(leitor.campos['count'], 0)
+                    resumo_exibido = True
+                print("\nConfira os detalhes de cada vaga:")
+            exibidas += 1
+            vagas_exibidas.append(registro.Vaga(job))
+            exibir_vaga(exibidas, job)
+            sys.stdout.flush()
+    except (requests.exceptions.RequestException, ValueError) as erro:
+        relatar_erro_requisicao(erro)
+        if exibidas:
+            print(f"A resposta foi interrompida depois de {exibidas} vaga(s); as exibidas acima continuam válidas.")
+        return None, vagas_exibidas
+
+    duplicadas = len(recebidas) - exibidas
+    if not resumo_exibido:
+        _exibir_resumo(max(0, leitor.campos.get('count', len(recebidas)) - duplicadas), duplicadas)
+    elif duplicadas:
+        print(f"({duplicadas} vaga(s) repetida(s) foram ocultadas.)")
+    if exibidas == 0:
+        print("Puxa! :( Não encontramos nenhuma vaga com os critérios que você nos deu. Que tal tentar outros termos?")
+    return dict(leitor.campos, jobs=recebidas), vagas_exibidas
+
+def buscar_e_exibir_vagas(api_key: str, termo_busca: str, localidade: str, pais: str, is_remota: Optional[str] = None, hours_old: Optional[int] = None, usar_cache: bool = True,
+                          deduplicador: Optional[deduplicacao.Deduplicador] = None, relevancia_minima: Optional[float] = None,
+                          ordenar_relevancia: bool = False) -> list:
+    # Passe o mesmo `deduplicador` em várias chamadas para não repetir vagas entre buscas.
+    # Com `relevancia_minima` (0 a 1) e/ou `ordenar_relevancia`, as vagas pouco relacionadas ao termo
+    # são ocultadas e/ou as mais relevantes vêm primeiro (ver relevancia.py).
+    # Retorna as vagas exibidas (sem as repetidas) em registros compactos (registro.Vaga), ex: para exportar com transformacao.py.
     print(f"\n##### Buscando vagas de '{termo_busca}' em '{localidade}, {pais}' #####")
     job_payload = {
         "search_term": termo_busca,
@@ -97,91 +173,167 @@ def buscar_e_exibir_vagas(api_key: str, termo_busca: str, localidade: str, pais:
         "is_remote": is_remota,
         "hours_old": hours_old
     }
-    resposta_jobs = fazer_requisicao("search_jobs", job_payload, api_key)
-
-    if resposta_jobs:
-        count = resposta_jobs.get('count', 0)
-        print(f"\n--- Boas notícias! Encontramos {count} oportunidades incríveis para você! ---")
-        if count > 0:
-            print("\nConfira os detalhes de cada vaga:")
-            for i, job in enumerate(resposta_jobs['jobs']): # Itera sobre todas as vagas
-                print(f"\n--- Vaga #{i+1}: {job.get('title', 'Título Desconhecido')} na {job.get('company', 'Empresa Desconhecida')} ---")
-                for key in JOB_FIELD_TRANSLATIONS:
-                    value = job.get(key)
-                    display_key = JOB_FIELD_TRANSLATIONS[key]
-
-                    # Tratamento para "Não disponível"
-                    if value is None or (isinstance(value, str) and value.strip().lower() in ['none', 'nan', 'null', '']):
-                        display_value = "Não disponível :("
-                    elif isinstance(value, (int, float)) and (value == 0 or (hasattr(value, '__array_ufunc__') and (isinstance(value, float) and (value != value or value == float('inf') or value == float('-inf'))))):
-                        # Captura floats/ints que podem ser 0 ou valores problemáticos (NaN, Inf)
-                        display_value = "Não disponível :("
-                    elif key == 'description':
-                        # Para a descrição, exibimos apenas um trecho para não sobrecarregar
-                        display_value = f"{str(value)[:400]}..." if value != "Não disponível :(" else "Não disponível :("
-                    elif key in ['job_url', 'job_url_direct', 'company_website'] and value:
-                        display_value = f"Link: {value}"
-                    elif key.startswith('salary_') and value != "Não disponível :(":
-                        # Formata valores de salário como moeda, se for um número
-                        try:
-                            numeric_value = float(value)
-                            # Formato BR para moeda (ex: 1.234,56)
-                            formatted_value = f"{numeric_value:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
-
-                            salary_unit = job.get('salary_unit', '').lower()
-                            if salary_unit == 'yearly' and key == 'salary_yearly':
-                                display_value = f"EUR {formatted_value} por Ano"
-                            elif salary_unit == 'hourly' and key == 'salary_hourly':
-                                display_value = f"EUR {formatted_value} por Hora"
-                            elif salary_unit == 'monthly' and key in ['salary_from', 'salary_to', 'salary_avg']:
-                                display_value = f"EUR {formatted_value} por Mês"
-                            elif salary_unit == 'daily':
-                                display_value = f"EUR {formatted_value} por Dia"
-                            elif salary_unit == 'weekly':
-                                display_value = f"EUR {formatted_value} por Semana"
-                            else: # Se a unidade não for clara, apenas mostra o valor com EUR
-                                display_value = f"EUR {formatted_value}"
-                        except ValueError:
-                            display_value = str(value) # Se não for número, mostra como string
-                    elif isinstance(value, str) and (value.lower() == 'true' or value.lower() == 'false'):
-                        display_value = "Sim" if value.lower() == 'true' else "Não"
-                    elif key == 'date_posted' and value != "Não disponível :(":
-                        try:
-                            # Tenta formatar a data se for uma string ISO
-                            dt_object = datetime.fromisoformat(value)
-                            display_value = dt_object.strftime("%d/%m/%Y") # Formato dd/mm/yyyy
-                        except ValueError:
-                            display_value = str(value) # Fallback para string original
-                    else:
-                        display_value = value
-
-                    # Exibe o campo, a menos que seja um campo de salário secundário com valor "Não disponível"
-                    if (display_value != "Não disponível :(" or
-                        key in ['title', 'company', 'location', 'job_url', 'date_posted']):
-                        print(f"  > {display_key}: {display_value}")
-                print("\n" + "="*60 + "\n") # Separador visual mais robusto para cada vaga
+    url_busca = f"{BASE_URL}/search_jobs"
+    usar_relevancia = relevancia_minima is not None or ordenar_relevancia
+    resposta_jobs = cache_buscas.cache_padrao().obter(url_busca, job_payload) if usar_cache else None
+    if resposta_jobs is None and not usar_relevancia:
+        # Sem cache: as vagas são exibidas enquanto a resposta ainda está chegando
+        resposta_jobs, exibidas = _transmitir_e_exibir_vagas(api_key, url_busca, job_payload, deduplicador or deduplicacao.Deduplicador())
+        if resposta_jobs is None:
+            print("\nParece que não foi possível buscar as vagas no momento. Por favor, tente novamente mais tarde.")
+            arquivo_vagas.arquivar(exibidas, pais) # As vagas recebidas antes da falha também ficam no arquivo
+        else:
+            arquivo_vagas.arquivar(resposta_jobs['jobs'], pais)
+            if usar_cache:
+                cache_buscas.cache_padrao().guardar(url_busca, job_payload, resposta_jobs)
+        return exibidas
+
+    if resposta_jobs is None:
+        # A relevância compara as vagas entre si: todas precisam chegar antes da primeira ser exibida
+        resposta_jobs = fazer_requisicao("search_jobs", job_payload, api_key)
+        if resposta_jobs is None or 'jobs' not in resposta_jobs:
+            print("\nParece que não foi possível buscar as vagas no momento. Por favor, tente novamente mais tarde.")
+            return []
+        arquivo_vagas.arquivar(resposta_jobs['jobs'], pais)
+        if usar_cache:
+            cache_buscas.cache_padrao().guardar(url_busca, job_payload, resposta_jobs)
+    else:
+        print("(Resultado recuperado do cache local, sem gastar uma requisição da sua cota.)")
+    import registro # Import local: registro.py importa JOB_FIELD_TRANSLATIONS deste módulo
+    jobs, duplicadas = deduplicacao.remover_duplicadas(resposta_jobs.get('jobs', []), deduplicador)
+    jobs = registro.compactar(jobs)
+    count = max(0, resposta_jobs.get('count', 0) - duplicadas)
+    _exibir_resumo(count, duplicadas)
+    if usar_relevancia and jobs:
+        import relevancia # Import local: carrega o NumPy só quando a relevância é pedida
+        relevantes = relevancia.selecionar_relevantes(jobs, termo_busca, relevancia_minima, ordenar_relevancia)
+        if len(relevantes) < len(jobs):
+            print(f"({len(jobs) - len(relevantes)} vaga(s) pouco relacionada(s) a '{termo_busca}' foram ocultadas.)")
+        jobs = relevantes
+        count = len(jobs)
+    if count > 0:
+        print("\nConfira os detalhes de cada vaga:")
+        import relatorio # Import local: relatorio.py importa JOB_FIELD_TRANSLATIONS deste módulo
+        relatorio.escrever_vagas(jobs, sys.stdout) # Renderiza todas as vagas em blocos
+    else:
+        print("Puxa! :( Não encontramos nenhuma vaga com os critérios que você nos deu. Que tal tentar outros termos?")
+    return jobs
+
+def buscar_e_exibir_vagas_em_paises(api_key: str, termo_busca: str, paises, localidade: Optional[str] = None,
+                                    is_remota: Optional[str] = None, hours_old: Optional[int] = None, usar_cache: bool = True,
+                                    deduplicador: Optional[deduplicacao.Deduplicador] = None, concorrencia: Optional[int] = None) -> list:
+    # Busca o mesmo termo em vários países ao mesmo tempo ('portugal, spain' ou 'todos'), imprimindo cada vaga
+    # assim que o país dela responde. Retorna os pares (país, vaga) exibidos, sem as repetidas entre países
+    # (cada vaga num registro compacto, ver registro.py).
+    import busca_paises # Import local: só quem busca em vários países carrega o fan-out
+    import limitador
+    import registro
+
+    paises = busca_paises.resolver_paises(paises)
+    print(f"\n##### Buscando vagas de '{termo_busca}' em {len(paises)} país(es) ao mesmo tempo #####")
+    por_minuto = limitador.LIMITES_POR_PLANO[limitador.obter_plano(api_key)]
+    if limitador.ATIVO and len(paises) > por_minuto:
+        print(f"(Com o limite de {por_minuto} requisições/minuto a busca completa leva ~{len(paises) / por_minuto:.0f} min; "
+              "as vagas aparecem conforme cada país responde.)")
+
+    exibidas = []
+    concluidos = 0
+    eventos = busca_paises.buscar_em_paises(f"{BASE_URL}/search_jobs", api_key, termo_busca, paises, localidade, is_remota,
+                                            hours_old, concorrencia=concorrencia or busca_paises.CONCORRENCIA_PADRAO,
+                                            usar_cache=usar_cache, deduplicador=deduplicador)
+    for evento in eventos:
+        if evento.tipo == "vaga":
+            exibidas.append((evento.pais, registro.Vaga(evento.dados)))
+            sys.stdout.write(f"\n🌍 {evento.pais}")
+            exibir_vaga(len(exibidas), evento.dados)
         else:
-            print("Puxa! :( Não encontramos nenhuma vaga com os critérios que você nos deu. Que tal tentar outros termos?")
+            concluidos += 1
+            if evento.tipo == "erro":
+                print(f"\n[{concluidos}/{len(paises)}] {evento.pais}: {evento.dados}")
+            else:
+                origem = " (cache local)" if evento.dados["cache"] else ""
+                print(f"\n[{concluidos}/{len(paises)}] {evento.pais}: {evento.dados['vagas']} vaga(s) recebida(s){origem}")
+        sys.stdout.flush()
+
+    if exibidas:
+        print(f"\n--- Boas notícias! Encontramos {len(exibidas)} oportunidades em {len({pais for pais, _ in exibidas})} país(es)! ---")
+    else:
+        print("Puxa! :( Não encontramos nenhuma vaga com os critérios que você nos deu. Que tal tentar outros termos?")
+    return exibidas
+
+def buscar_e_exibir_vagas_offline(termo_busca: str, localidade: Optional[str] = None, pais: Optional[str] = None,
+                                   is_remota: Optional[str] = None, hours_old: Optional[int] = None, plataforma: Optional[str] = None,
+                                   limite: int = arquivo_vagas.LIMITE_PADRAO, deduplicador: Optional[deduplicacao.Deduplicador] = None) -> list:
+    # Mesma busca, mas no arquivo local (arquivo_vagas.py), com as vagas já recebidas em buscas anteriores:
+    # responde em milissegundos e não gasta a cota da API. As vagas vêm das mais relevantes para o termo.
+    # Retorna as vagas exibidas (sem as repetidas) em registros compactos (registro.Vaga).
+    print(f"\n##### Buscando vagas de '{termo_busca}' em '{localidade or ''}, {pais or 'todos os países'}' no arquivo local #####")
+    inicio = time.perf_counter()
+    encontradas = arquivo_vagas.pesquisar(termo_busca, pais, localidade, is_remota, hours_old, plataforma=plataforma, limite=limite)
+    duracao = time.perf_counter() - inicio
+    import registro # Import local: registro.py importa JOB_FIELD_TRANSLATIONS deste módulo
+    jobs, duplicadas = deduplicacao.remover_duplicadas((job for _, job in encontradas), deduplicador)
+    jobs = registro.compactar(jobs)
+    _exibir_resumo(len(jobs), duplicadas)
+    print(f"(Resultado do arquivo local em {duracao * 1000:.1f} ms, sem usar a API.)")
+    if jobs:
+        print("\nConfira os detalhes de cada vaga:")
+        import relatorio # Import local: relatorio.py importa JOB_FIELD_TRANSLATIONS deste módulo
+        relatorio.escrever_vagas(jobs, sys.stdout)
     else:
-        print("\nParece que não foi possível buscar as vagas no momento. Por favor, tente novamente mais tarde.")
+        print("Puxa! :( Nenhuma vaga do arquivo local atende a esses critérios. Faça a busca online para trazer vagas novas.")
+    return jobs
 
 # --- Execução dos Testes ---
 if __name__ == "__main__":
-    # Teste de busca de vagas com chave PRO válida
-    buscar_e_exibir_vagas(VALID_PRO_KEY,
-                          termo_busca="Analista de Dados",
-                          localidade="Lisboa",
-                          pais="portugal",
-                          is_remota="Ambos",
-                          hours_old=72)
-
-    # Exemplo de busca para "Backend Developer" no Brasil (remoto)
-    # time.sleep(5) # Pequena pausa entre as chamadas para não sobrecarregar
-    # buscar_e_exibir_vagas(VALID_PRO_KEY,
-    #                       termo_busca="Backend Developer",
-    #                       localidade="São Paulo",
-    #                       pais="brazil",
-    #                       is_remota="Remoto",
-    #                       hours_old=48)
+    import argparse
+    import limitador
+
+    parser = argparse.ArgumentParser(description="Busca de vagas pela linha de comando.")
+    parser.add_argument("--chave", default=VALID_FREE_KEY, help="Chave de API (X-API-Key).")
+    parser.add_argument("--plano", choices=list(limitador.LIMITES_POR_PLANO), default=limitador.PLANO_PADRAO,
+                        help="Plano da chave, define o limite de requisições por minuto.")
+    parser.add_argument("--monitorar", metavar="BUSCAS_JSONL",
+                        help="Repete as buscas salvas no arquivo (um payload por linha) e mostra só as vagas novas.")
+    parser.add_argument("--intervalo", type=float, default=600, help="Segundos entre as rodadas do modo --monitorar.")
+    parser.add_argument("--exportar", metavar="ARQUIVO",
+                        help="Salva as vagas encontradas em Parquet, CSV ou JSONL (pela extensão) para análise.")
+    parser.add_argument("--relevancia-minima", type=float,
+                        help="Oculta as vagas com relevância para o termo buscado abaixo deste valor (0 a 1, ex: 0.2).")
+    parser.add_argument("--ordenar-relevancia", action="store_true", help="Exibe as vagas da mais para a menos relevante.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Busca no arquivo local das vagas já recebidas (arquivo_vagas.py), sem usar a API.")
+    args = parser.parse_args()
+    limitador.definir_plano(args.chave, args.plano)
+
+    if args.monitorar:
+        import monitor
+        monitor.monitorar(args.monitorar, args.chave, intervalo=args.intervalo)
+    else:
+        if args.offline:
+            # Teste da busca offline: mesmos critérios, respondidos pelo arquivo local
+            vagas_encontradas = buscar_e_exibir_vagas_offline("Analista de Dados", "Lisboa", "portugal", "Ambos", 72)
+        else:
+            # Teste de busca de vagas
+            vagas_encontradas = buscar_e_exibir_vagas(args.chave,
+                                  termo_busca="Analista de Dados",
+                                  localidade="Lisboa",
+                                  pais="portugal",
+                                  is_remota="Ambos",
+                                  hours_old=72,
+                                  relevancia_minima=args.relevancia_minima,
+                                  ordenar_relevancia=args.ordenar_relevancia)
+        if args.exportar:
+            import transformacao # Import local: carrega o pandas só quando a exportação é pedida
+            total = transformacao.exportar_vagas(vagas_encontradas, args.exportar, pais="portugal")
+            print(f"\n--- {total} vaga(s) exportada(s) para '{args.exportar}' ---")
+
+        # Exemplo de busca para "Backend Developer" no Brasil (remoto)
+        # buscar_e_exibir_vagas(args.chave,
+        #                       termo_busca="Backend Developer",
+        #                       localidade="São Paulo",
+        #                       pais="brazil",
+        #                       is_remota="Remoto",
+        #                       hours_old=48)
 
     print("\n--- Processo de Busca de Vagas Concluído! :) ---")